@@ -0,0 +1,155 @@
+"""Async load generator that drives weighted scenario mixes against the API."""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.seed import SeededHospital, LAST_NAMES, note_text
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    latency: float
+
+
+@dataclass
+class Recorder:
+    samples: list[Sample] = field(default_factory=list)
+
+    async def timed(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples.append(Sample(route=route, status=0, latency=time.perf_counter() - started))
+            return None
+        self.samples.append(Sample(route=route, status=response.status_code, latency=time.perf_counter() - started))
+        return response
+
+
+@dataclass
+class VirtualUser:
+    client: httpx.AsyncClient
+    hospital: SeededHospital
+    recorder: Recorder
+    rng: random.Random
+    username: str
+    password: str
+    token: str | None = None
+
+    @property
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+
+async def login(user: VirtualUser) -> None:
+    response = await user.recorder.timed(
+        user.client, "POST /auth/login", "POST", "/auth/login",
+        data={"username": user.username, "password": user.password},
+    )
+    if response is not None and response.status_code == 200:
+        user.token = response.json()["access_token"]
+
+
+async def patient_search(user: VirtualUser) -> None:
+    prefix = user.rng.choice(LAST_NAMES)[:user.rng.randint(1, 3)]
+    await user.recorder.timed(
+        user.client, "GET /patient/", "GET", "/patient/",
+        params={"last_name": prefix, "limit": 50}, headers=user.headers,
+    )
+
+
+async def admit_discharge(user: VirtualUser) -> None:
+    if not user.hospital.patient_ids or not user.hospital.room_ids:
+        return
+    response = await user.recorder.timed(
+        user.client, "POST /admission/", "POST", "/admission/",
+        json={"patient_id": user.rng.choice(user.hospital.patient_ids), "room_id": user.rng.choice(user.hospital.room_ids)},
+        headers=user.headers,
+    )
+    if response is not None and response.status_code == 200:
+        await user.recorder.timed(
+            user.client, "DELETE /admission/{id}/", "DELETE", f"/admission/{response.json()['id']}/",
+            headers=user.headers,
+        )
+
+
+async def note_write(user: VirtualUser) -> None:
+    if not user.hospital.admission_ids:
+        return
+    await user.recorder.timed(
+        user.client, "POST /note/", "POST", "/note/",
+        json={"text": note_text(user.rng), "admission_id": user.rng.choice(user.hospital.admission_ids)},
+        headers=user.headers,
+    )
+
+
+async def log_browse(user: VirtualUser) -> None:
+    await user.recorder.timed(
+        user.client, "GET /log/", "GET", "/log/",
+        params={"offset": user.rng.randint(0, 200), "limit": 50}, headers=user.headers,
+    )
+
+
+async def room_list(user: VirtualUser) -> None:
+    await user.recorder.timed(
+        user.client, "GET /room/", "GET", "/room/",
+        params={"limit": 100}, headers=user.headers,
+    )
+
+
+SCENARIOS: dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "login": login,
+    "patient_search": patient_search,
+    "admit_discharge": admit_discharge,
+    "note_write": note_write,
+    "log_browse": log_browse,
+    "room_list": room_list,
+}
+
+MIXES: dict[str, dict[str, int]] = {
+    "default": {"login": 5, "patient_search": 30, "admit_discharge": 10, "note_write": 20, "log_browse": 15, "room_list": 20},
+    "shift_change": {"login": 40, "room_list": 30, "patient_search": 20, "note_write": 10},
+    "rounds": {"patient_search": 25, "note_write": 50, "admit_discharge": 10, "room_list": 15},
+    "reporting": {"log_browse": 60, "patient_search": 20, "room_list": 20},
+}
+
+
+async def run_user(user: VirtualUser, mix: dict[str, int], deadline: float) -> None:
+    await login(user)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    while time.perf_counter() < deadline:
+        await SCENARIOS[user.rng.choices(names, weights)[0]](user)
+
+
+async def run_load(
+        client: httpx.AsyncClient,
+        hospital: SeededHospital,
+        *,
+        mix: str = "default",
+        users: int = 20,
+        duration: float = 30.0,
+        seed: int = 0,
+    ) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+    virtual_users = []
+    for index in range(users):
+        username, password = hospital.credentials[index % len(hospital.credentials)]
+        virtual_users.append(VirtualUser(
+            client=client,
+            hospital=hospital,
+            recorder=recorder,
+            rng=random.Random(seed * 1_000_003 + index),
+            username=username,
+            password=password,
+        ))
+    await asyncio.gather(*(run_user(user, MIXES[mix], deadline) for user in virtual_users))
+    return recorder, time.perf_counter() - started
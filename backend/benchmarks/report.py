@@ -0,0 +1,87 @@
+"""Latency/throughput summaries and JSON baselines that can be diffed across commits."""
+import json
+import math
+import subprocess
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from benchmarks.load import Sample
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict[str, dict]:
+    by_route: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+
+    summary = {}
+    for route, route_samples in sorted(by_route.items()):
+        latencies = sorted(sample.latency * 1000 for sample in route_samples)
+        summary[route] = {
+            "count": len(route_samples),
+            "errors": sum(1 for sample in route_samples if not 200 <= sample.status < 300),
+            "rps": round(len(route_samples) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    return summary
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_baseline(path: str, summary: dict[str, dict], **meta) -> dict:
+    baseline = {
+        "revision": git_revision(),
+        "recorded_datetime": datetime.now(timezone.utc).isoformat(),
+        "meta": meta,
+        "routes": summary,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+    return baseline
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(old: dict, new: dict, *, tolerance: float = 0.10) -> list[str]:
+    """Return one line per route metric that regressed by more than ``tolerance``."""
+    regressions = []
+    for route, new_stats in new["routes"].items():
+        old_stats = old["routes"].get(route)
+        if old_stats is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if old_stats[metric] and new_stats[metric] > old_stats[metric] * (1 + tolerance):
+                regressions.append(f"{route} {metric}: {old_stats[metric]} -> {new_stats[metric]}")
+        if old_stats["rps"] and new_stats["rps"] < old_stats["rps"] * (1 - tolerance):
+            regressions.append(f"{route} rps: {old_stats['rps']} -> {new_stats['rps']}")
+    return regressions
+
+
+def format_table(summary: dict[str, dict]) -> str:
+    header = f"{'route':<28}{'count':>8}{'errors':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}"
+    lines = [header, "-" * len(header)]
+    for route, stats in summary.items():
+        lines.append(
+            f"{route:<28}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>10}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,91 @@
+"""Load-test harness.
+
+Start the API (``python serve.py``), then from the ``backend`` directory::
+
+    python -m benchmarks.run run --mix default --users 20 --duration 30 --out baseline.json
+    python -m benchmarks.run compare baseline.json candidate.json
+
+``--bulk`` seeds through ``benchmarks.synthetic`` instead of the API; run it
+from the server's working directory so both use the same database.
+"""
+import argparse
+import asyncio
+import random
+
+import httpx
+
+from benchmarks.load import MIXES, run_load
+from benchmarks.report import summarize, write_baseline, load_baseline, compare, format_table
+from benchmarks.seed import HospitalSize, seed_hospital
+from benchmarks.synthetic import SyntheticSize, generate
+from modules.database.engine import engine
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = HospitalSize()
+    for name in ("staff", "rooms", "patients", "admissions", "notes", "logs"):
+        parser.add_argument(f"--{name}", type=int, default=getattr(defaults, name))
+
+
+async def run(args: argparse.Namespace) -> None:
+    size = HospitalSize(
+        staff=args.staff, rooms=args.rooms, patients=args.patients,
+        admissions=args.admissions, notes=args.notes, logs=args.logs,
+    )
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        if args.bulk:
+            hospital = generate(engine, SyntheticSize(
+                staff=args.staff, rooms=args.rooms, patients=args.patients,
+                admissions=args.admissions, notes=args.notes, logs=args.logs,
+            ), seed=args.seed)
+        else:
+            hospital = await seed_hospital(client, size, random.Random(args.seed))
+        recorder, elapsed = await run_load(
+            client, hospital, mix=args.mix, users=args.users, duration=args.duration, seed=args.seed,
+        )
+
+    summary = summarize(recorder.samples, elapsed)
+    print(format_table(summary))
+    if args.out:
+        write_baseline(
+            args.out, summary,
+            base_url=args.base_url, bulk=args.bulk, mix=args.mix, users=args.users,
+            duration=round(elapsed, 2), seed=args.seed, size=vars(size),
+        )
+        print(f"Baseline written to {args.out}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="seed the API and drive a load mix against it")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--mix", choices=sorted(MIXES), default="default")
+    run_parser.add_argument("--users", type=int, default=20)
+    run_parser.add_argument("--duration", type=float, default=30.0)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--out", default=None, help="write a JSON baseline to this path")
+    run_parser.add_argument("--bulk", action="store_true", help="seed with the bulk synthetic generator")
+    add_size_arguments(run_parser)
+
+    compare_parser = subparsers.add_parser("compare", help="diff two JSON baselines")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--tolerance", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        asyncio.run(run(args))
+    elif args.command == "compare":
+        regressions = compare(load_baseline(args.old), load_baseline(args.new), tolerance=args.tolerance)
+        for line in regressions:
+            print(line)
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Seed a running API with a small synthetic hospital through its HTTP routes."""
+import asyncio
+import random
+from dataclasses import dataclass, field
+
+import httpx
+
+
+FIRST_NAMES = ["Ada", "Ben", "Cem", "Deniz", "Elif", "Faruk", "Gul", "Hana", "Ilker", "Jale", "Kaan", "Lale", "Mert", "Nil", "Oya", "Pelin"]
+LAST_NAMES = ["Aydin", "Bulut", "Cakir", "Demir", "Erdem", "Firat", "Gunes", "Hatip", "Isik", "Kaya", "Ozturk", "Polat", "Sahin", "Tekin", "Yilmaz"]
+NOTE_PHRASES = [
+    "Vitals stable.", "Patient reports mild pain.", "Medication administered as prescribed.",
+    "Awaiting lab results.", "Family visited.", "Dressing changed.", "Ambulating with assistance.",
+    "No acute distress overnight.", "Fluids encouraged.", "Physician rounds completed.",
+]
+
+
+@dataclass
+class HospitalSize:
+    staff: int = 5
+    rooms: int = 20
+    patients: int = 200
+    admissions: int = 100
+    notes: int = 300
+    logs: int = 200
+
+
+@dataclass
+class SeededHospital:
+    credentials: list[tuple[str, str]] = field(default_factory=list)
+    room_ids: list[int] = field(default_factory=list)
+    patient_ids: list[int] = field(default_factory=list)
+    admission_ids: list[int] = field(default_factory=list)
+
+
+def note_text(rng: random.Random) -> str:
+    return " ".join(rng.choices(NOTE_PHRASES, k=rng.randint(2, 8)))
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post("/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def gather_limited(coroutines, concurrency: int = 16) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+
+async def seed_hospital(client: httpx.AsyncClient, size: HospitalSize, rng: random.Random) -> SeededHospital:
+    hospital = SeededHospital()
+    run_tag = rng.getrandbits(32)
+
+    for index in range(size.staff):
+        username = f"bench-{run_tag}-{index}"
+        password = f"bench-password-{index}"
+        response = await client.post("/auth/register", json={
+            "username": username,
+            "email": f"{username}@bench.local",
+            "password": password,
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+        })
+        response.raise_for_status()
+        hospital.credentials.append((username, password))
+
+    token = await login(client, *hospital.credentials[0])
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def post(path: str, payload: dict) -> dict | None:
+        response = await client.post(path, json=payload, headers=headers)
+        return response.json() if response.status_code == 200 else None
+
+    rooms = await gather_limited(
+        post("/room/", {"name": f"Room {run_tag}-{index}", "maximum_capacity": rng.randint(1, 6)})
+        for index in range(size.rooms)
+    )
+    hospital.room_ids = [room["id"] for room in rooms if room]
+
+    patients = await gather_limited(
+        post("/patient/", {
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "gender": rng.choice(["F", "M"]),
+            "email": f"patient-{run_tag}-{index}@bench.local",
+        })
+        for index in range(size.patients)
+    )
+    hospital.patient_ids = [patient["id"] for patient in patients if patient]
+
+    # Admissions go one at a time: room capacity checks depend on earlier admissions.
+    candidates = rng.sample(hospital.patient_ids, min(size.admissions, len(hospital.patient_ids)))
+    for patient_id in candidates:
+        admission = await post("/admission/", {"patient_id": patient_id, "room_id": rng.choice(hospital.room_ids)})
+        if admission:
+            hospital.admission_ids.append(admission["id"])
+
+    if hospital.admission_ids:
+        await gather_limited(
+            post("/note/", {"text": note_text(rng), "admission_id": rng.choice(hospital.admission_ids)})
+            for _ in range(size.notes)
+        )
+
+    await gather_limited(post("/log/", {"text": note_text(rng)}) for _ in range(size.logs))
+
+    return hospital
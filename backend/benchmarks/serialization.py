@@ -0,0 +1,123 @@
+"""Compare FastAPI's ``response_model`` serialization with ``json_response``.
+
+Rows are built in memory from the table models, so no server or database is
+needed. From the ``backend`` directory::
+
+    python -m benchmarks.serialization --rows 500 --repeat 50
+
+For each list endpoint, prints the time to turn one page of rows into response
+bytes on both paths. Also checks that both paths produce identical bytes.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from benchmarks.seed import FIRST_NAMES, LAST_NAMES, note_text
+from modules.auth.models.log import Log, LogPublic
+from modules.auth.models.staff import Staff, StaffPublic
+from modules.core.responses import json_response
+from modules.impatient.models.admission import Admission, AdmissionPublic
+from modules.impatient.models.note import Note, NotePublic
+from modules.impatient.models.room import Room, RoomPublic
+from modules.patient.models.patient import Patient, PatientPublic, PatientStatus
+
+
+def timestamps(rng: random.Random) -> dict:
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(10_000_000))
+    return {"created_datetime": created, "updated_datetime": created + timedelta(seconds=rng.randrange(100_000))}
+
+
+def build_rows(rng: random.Random, count: int) -> dict[str, tuple[type, list]]:
+    def name() -> tuple[str, str]:
+        return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    patients = []
+    for index in range(count):
+        first_name, last_name = name()
+        patients.append(Patient(
+            id=index + 1, first_name=first_name, last_name=last_name, gender=rng.choice("MF"),
+            email=f"{first_name}.{last_name}{index}@example.com".lower(), phone=f"555{index:07d}",
+            status=rng.choice(list(PatientStatus)), **timestamps(rng),
+        ))
+    staff = []
+    for index in range(count):
+        first_name, last_name = name()
+        staff.append(Staff(
+            id=index + 1, first_name=first_name, last_name=last_name, email=f"staff{index}@example.com",
+            username=f"staff{index}", phone=None, hashed_password="x" * 80, **timestamps(rng),
+        ))
+    return {
+        "GET /patient/": (PatientPublic, patients),
+        "GET /auth/": (StaffPublic, staff),
+        "GET /room/": (RoomPublic, [
+            Room(id=index + 1, name=f"Room {index}", maximum_capacity=rng.randint(1, 6), **timestamps(rng))
+            for index in range(count)
+        ]),
+        "GET /admission/": (AdmissionPublic, [
+            Admission(id=index + 1, patient_id=rng.randint(1, count), room_id=rng.randint(1, 50),
+                      staff_id=rng.randint(1, 20), **timestamps(rng))
+            for index in range(count)
+        ]),
+        "GET /note/": (NotePublic, [
+            Note(id=index + 1, text=note_text(rng), admission_id=rng.randint(1, count),
+                 staff_id=rng.randint(1, 20), **timestamps(rng))
+            for index in range(count)
+        ]),
+        "GET /log/": (LogPublic, [
+            Log(id=index + 1, text=note_text(rng) * 4, staff_id=rng.randint(1, 20), **timestamps(rng))
+            for index in range(count)
+        ]),
+    }
+
+
+def fastapi_path(model: type, rows: list) -> Callable[[], bytes]:
+    field = create_model_field(name="Response", type_=list[model], mode="serialization")
+
+    def render() -> bytes:
+        content = asyncio.run(serialize_response(field=field, response_content=rows))
+        return JSONResponse(content).body
+
+    return render
+
+
+def fast_path(model: type, rows: list) -> Callable[[], bytes]:
+    def render() -> bytes:
+        return json_response(model, rows).body
+
+    return render
+
+
+def best_of(render: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'endpoint':<18} {'rows':>6} {'fastapi ms':>11} {'fast ms':>9} {'speedup':>8}")
+    for endpoint, (model, rows) in build_rows(random.Random(args.seed), args.rows).items():
+        slow, fast = fastapi_path(model, rows), fast_path(model, rows)
+        if slow() != fast():
+            raise SystemExit(f"{endpoint}: serialized bodies differ")
+        slow_time, fast_time = best_of(slow, args.repeat), best_of(fast, args.repeat)
+        print(f"{endpoint:<18} {len(rows):>6} {slow_time * 1000:>11.2f} {fast_time * 1000:>9.2f} {slow_time / fast_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
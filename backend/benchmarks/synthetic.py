@@ -0,0 +1,280 @@
+"""Deterministic bulk generator for large synthetic datasets.
+
+Rows are written straight through Core ``insert`` batches (``COPY`` on
+PostgreSQL with psycopg) on one connection, bypassing the API and the ORM, so
+millions of rows load in minutes. The same ``--seed`` always produces the same
+data. From the ``backend`` directory::
+
+    python -m benchmarks.synthetic --patients 1000000 --notes 2000000 --logs 2000000
+
+Active admissions never exceed a room's ``maximum_capacity``, every admission
+starts after its patient was registered and every note is written after its
+admission started.
+
+Timestamps fall in the ``days`` before ``--end`` (``DEFAULT_END`` unless given),
+never relative to the clock. Ids continue after the rows already in each table,
+so a seed reproduces the same dataset when loaded into an empty database.
+"""
+import argparse
+import random
+import time
+from array import array
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator
+
+from passlib.hash import pbkdf2_sha256
+from sqlalchemy import Connection, Engine, Table, func, select
+
+from benchmarks.seed import FIRST_NAMES, LAST_NAMES, SeededHospital, note_text
+from modules.auth.models.log import Log
+from modules.auth.models.staff import Staff
+from modules.database.dialect import bulk_insert, sync_sequence
+from modules.database.engine import engine
+from modules.database.migrations import check_schema_version
+from modules.impatient.models.admission import Admission
+from modules.impatient.models.note import Note
+from modules.impatient.models.room import Room
+from modules.patient.models.patient import Patient, PatientStatus
+
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+DEFAULT_END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class SyntheticSize:
+    staff: int = 50
+    rooms: int = 2_000
+    patients: int = 100_000
+    admissions: int = 5_000
+    notes: int = 200_000
+    logs: int = 200_000
+    days: int = 365
+
+
+def next_id(connection: Connection, table: Table) -> int:
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def write_batches(
+        connection: Connection,
+        table: Table,
+        rows: Iterator[dict],
+        batch_size: int,
+        progress: Callable[[str], None],
+    ) -> int:
+    written = 0
+    batch = []
+    started = time.perf_counter()
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            bulk_insert(connection, table, batch)
+            connection.commit()
+            written += len(batch)
+            batch = []
+    if batch:
+        bulk_insert(connection, table, batch)
+        connection.commit()
+        written += len(batch)
+    sync_sequence(connection, table)
+    connection.commit()
+    progress(f"{table.name}: {written} rows in {time.perf_counter() - started:.1f}s")
+    return written
+
+
+def generate(
+        bind: Engine = engine,
+        size: SyntheticSize | None = None,
+        *,
+        seed: int = 0,
+        end: datetime = DEFAULT_END,
+        batch_size: int = 10_000,
+        progress: Callable[[str], None] = print,
+    ) -> SeededHospital:
+    size = size or SyntheticSize()
+    if size.staff < 1 and (size.admissions or size.notes or size.logs):
+        raise ValueError("admissions, notes and logs need at least one staff member")
+    rng = random.Random(seed)
+    start = end - timedelta(days=size.days)
+    span = (end - start).total_seconds()
+    # A seeded salt keeps the stored hash identical between runs.
+    hashed_password = pbkdf2_sha256.using(salt=rng.randbytes(16)).hash(SYNTHETIC_PASSWORD)
+    hospital = SeededHospital()
+
+    def moment(after: float = 0.0) -> float:
+        return after + rng.random() * (span - after)
+
+    def stamp(offset: float) -> datetime:
+        return start + timedelta(seconds=offset)
+
+    with bind.connect() as connection:
+        if bind.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+            connection.exec_driver_sql("PRAGMA journal_mode = WAL")
+            connection.commit()
+
+        staff_table = Staff.__table__
+        room_table = Room.__table__
+        patient_table = Patient.__table__
+        admission_table = Admission.__table__
+        note_table = Note.__table__
+        log_table = Log.__table__
+
+        first_staff = next_id(connection, staff_table)
+        first_room = next_id(connection, room_table)
+        first_patient = next_id(connection, patient_table)
+        first_admission = next_id(connection, admission_table)
+
+        def staff_rows():
+            for index in range(size.staff):
+                username = f"synthetic-{seed}-{first_staff + index}"
+                created = stamp(moment())
+                hospital.credentials.append((username, SYNTHETIC_PASSWORD))
+                yield {
+                    "id": first_staff + index,
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "email": f"{username}@synthetic.local",
+                    "username": username,
+                    "phone": None,
+                    "hashed_password": hashed_password,
+                    "created_datetime": created,
+                    "updated_datetime": created,
+                }
+
+        write_batches(connection, staff_table, staff_rows(), batch_size, progress)
+        staff_ids = range(first_staff, first_staff + size.staff)
+
+        capacities = [rng.randint(1, 8) for _ in range(size.rooms)]
+
+        def room_rows():
+            for index, capacity in enumerate(capacities):
+                created = stamp(moment() * 0.1)
+                yield {
+                    "id": first_room + index,
+                    "name": f"Ward {seed}-{first_room + index}",
+                    "maximum_capacity": capacity,
+                    "created_datetime": created,
+                    "updated_datetime": created,
+                }
+
+        write_batches(connection, room_table, room_rows(), batch_size, progress)
+        hospital.room_ids = list(range(first_room, first_room + size.rooms))
+
+        # One slot per bed; an admission takes a slot, so occupancy never exceeds capacity.
+        slots = [first_room + index for index, capacity in enumerate(capacities) for _ in range(capacity)]
+        rng.shuffle(slots)
+        admission_count = min(size.admissions, len(slots), size.patients)
+        if admission_count < size.admissions:
+            progress(f"admissions clamped to {admission_count} by patient count and total bed capacity")
+
+        admitted_patients = array("q")
+        admitted_since = array("d")
+
+        def patient_rows():
+            remaining_admissions = admission_count
+            for index in range(size.patients):
+                created = moment()
+                # Selection sampling: admits exactly admission_count patients in one pass.
+                if rng.random() * (size.patients - index) < remaining_admissions:
+                    remaining_admissions -= 1
+                    status = PatientStatus.Admitted
+                    admitted_patients.append(first_patient + index)
+                    admitted_since.append(moment(created))
+                else:
+                    status = PatientStatus.Discharged if rng.random() < 0.7 else PatientStatus.Registered
+                discharged = stamp(moment(created)) if status is PatientStatus.Discharged else None
+                yield {
+                    "id": first_patient + index,
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "last_name": rng.choice(LAST_NAMES),
+                    "gender": rng.choice(("F", "M")),
+                    "email": f"patient-{seed}-{first_patient + index}@synthetic.local",
+                    "phone": f"+90{rng.randrange(10**9, 10**10)}",
+                    "status": status,
+                    "created_datetime": stamp(created),
+                    "updated_datetime": discharged or stamp(created),
+                    "discharged_datetime": discharged,
+                }
+
+        write_batches(connection, patient_table, patient_rows(), batch_size, progress)
+        hospital.patient_ids = list(range(first_patient, first_patient + size.patients))
+
+        def admission_rows():
+            for index, patient_id in enumerate(admitted_patients):
+                created = stamp(admitted_since[index])
+                yield {
+                    "id": first_admission + index,
+                    "patient_id": patient_id,
+                    "room_id": slots[index],
+                    "staff_id": rng.choice(staff_ids),
+                    "created_datetime": created,
+                    "updated_datetime": created,
+                }
+
+        write_batches(connection, admission_table, admission_rows(), batch_size, progress)
+        hospital.admission_ids = list(range(first_admission, first_admission + admission_count))
+
+        def note_rows():
+            if not admission_count:
+                return
+            for _ in range(size.notes):
+                index = rng.randrange(admission_count)
+                created = stamp(moment(admitted_since[index]))
+                yield {
+                    "text": note_text(rng),
+                    "admission_id": first_admission + index,
+                    "staff_id": rng.choice(staff_ids),
+                    "created_datetime": created,
+                    "updated_datetime": created,
+                }
+
+        write_batches(connection, note_table, note_rows(), batch_size, progress)
+
+        def log_rows():
+            for _ in range(size.logs):
+                staff_id = rng.choice(staff_ids)
+                created = stamp(moment())
+                yield {
+                    "text": f"Staff ID: {staff_id}\nLog Type: {rng.choice(('Get', 'Post', 'Put', 'Delete'))}\nPath: synthetic\n{note_text(rng)}",
+                    "staff_id": staff_id,
+                    "created_datetime": created,
+                    "updated_datetime": created,
+                }
+
+        write_batches(connection, log_table, log_rows(), batch_size, progress)
+
+    return hospital
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic")
+    defaults = SyntheticSize()
+    for name, default in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=DEFAULT_END,
+        help=f"latest timestamp to generate, ISO 8601 (default {DEFAULT_END.date()})",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    if args.staff < 1 and (args.admissions or args.notes or args.logs):
+        parser.error("--staff must be at least 1 when admissions, notes or logs are generated")
+    end = args.end if args.end.tzinfo is not None else args.end.replace(tzinfo=timezone.utc)
+
+    check_schema_version(engine)
+    size = SyntheticSize(**{name: getattr(args, name) for name in asdict(defaults)})
+    started = time.perf_counter()
+    hospital = generate(engine, size, seed=args.seed, end=end, batch_size=args.batch_size)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    if hospital.credentials:
+        print(f"Log in as {hospital.credentials[0][0]!r} / {SYNTHETIC_PASSWORD!r}")
+
+
+if __name__ == "__main__":
+    main()
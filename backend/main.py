@@ -1,21 +1,80 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from modules.database.engine import create_db_and_tables
+from modules.database.engine import all_engines, warm_up_engine
+from modules.database.migrations import check_schema_version
+from modules.database.session import LastWriteMiddleware
 from modules.auth.routes.staff import router as auth_router
 from modules.patient.routes.patient import router as patient_router
 from modules.impatient.routes.room import router as room_router
 from modules.impatient.routes.admission import router as admission_router
 from modules.impatient.routes.note import router as note_router
 from modules.auth.routes.log import router as log_router
+from modules.auth.routes.rate_limit import router as rate_limit_router
+from modules.batch.routes.batch import router as batch_router
+from modules.sync.routes.change import router as change_router
+from modules.core.compression import CompressionMiddleware
+from modules.monitoring.middleware import MetricsMiddleware, ProfilerMiddleware, instrument_engine
+from modules.monitoring.routes.metrics import router as metrics_router
+from modules.monitoring.routes.slow_query import router as slow_query_router
+from modules.monitoring.routes.profiler import router as profiler_router
+from modules.monitoring.controllers.slow_query import install_slow_query_log
+from modules.monitoring.controllers.profiler import sampler
+from modules.auth.controllers.password import warm_up_executor, shutdown_executor
+from modules.auth.controllers.log_archive import log_archiver
+from modules.patient.controllers.archive import patient_archiver
+from modules.core.purge import purge_worker
+from modules import settings
 
 
-create_db_and_tables()
+check_schema_version()
+for bind in all_engines():
+    instrument_engine(bind)
+    install_slow_query_log(bind)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for bind in all_engines():
+        warm_up_engine(bind)
+    warm_up_executor()
+    app.openapi()
+    if settings.PROFILER_SAMPLER_AUTOSTART:
+        sampler.start()
+    if settings.LOG_ARCHIVE_ENABLED:
+        log_archiver.start()
+    if settings.PATIENT_ARCHIVE_ENABLED:
+        patient_archiver.start()
+    if settings.PURGE_ENABLED:
+        purge_worker.start()
+    yield
+    purge_worker.stop()
+    patient_archiver.stop()
+    log_archiver.stop()
+    sampler.stop()
+    shutdown_executor()
+    for bind in all_engines():
+        bind.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+if settings.DATABASE_READ_URLS:
+    app.add_middleware(LastWriteMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
 
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(patient_router, prefix="/patient", tags=["Patients"])
 app.include_router(room_router, prefix="/room", tags=["Rooms"])
 app.include_router(admission_router, prefix="/admission", tags=["Admissions"])
 app.include_router(note_router, prefix="/note", tags=["Notes"])
-app.include_router(log_router, prefix="/log", tags=["Logs"])
\ No newline at end of file
+app.include_router(log_router, prefix="/log", tags=["Logs"])
+app.include_router(batch_router, prefix="/batch", tags=["Batch"])
+app.include_router(change_router, prefix="/changes", tags=["Sync"])
+app.include_router(metrics_router, tags=["Monitoring"])
+app.include_router(slow_query_router, prefix="/admin/slow-queries", tags=["Monitoring"])
+app.include_router(profiler_router, prefix="/admin/profiler", tags=["Monitoring"])
+app.include_router(rate_limit_router, prefix="/admin/rate-limits", tags=["Authentication"])
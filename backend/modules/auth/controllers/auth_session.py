@@ -0,0 +1,236 @@
+"""Server-side login sessions.
+
+Tokens are opaque random strings and only their SHA-256 digest is stored in
+``auth_session``. Each worker keeps a bounded LRU cache of live sessions, so a
+valid token costs one dict lookup. A revocation set is refreshed incrementally
+from ``revoked_datetime`` at most every
+``AUTH_SESSION_REVOCATION_REFRESH_SECONDS``. Revocations made in this worker take
+effect immediately, and other workers see them on their next refresh.
+
+Expiry slides: every use pushes it ``AUTH_SESSION_IDLE_SECONDS`` ahead, capped
+at ``AUTH_SESSION_MAX_AGE_SECONDS`` after login. The new expiry is written back
+at most every ``AUTH_SESSION_TOUCH_SECONDS``, on its own connection so that it
+never joins the request's transaction.
+"""
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import Engine, delete, update
+from sqlmodel import Session, select
+
+from modules import settings
+from modules.auth.models.auth_session import AuthSession
+from modules.database.dialect import skip_locked
+from modules.database.engine import engine
+from modules.monitoring.metrics import record_cache
+
+
+# Re-read revocations slightly before the watermark, because a revocation may
+# commit a little after the timestamp it records.
+REVOCATION_OVERLAP_SECONDS = 5.0
+PURGE_INTERVAL_SECONDS = 60 * 60
+PURGE_BATCH_SIZE = 1000
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def to_timestamp(value: datetime) -> float:
+    # SQLite returns naive datetimes; everything is stored in UTC.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def from_timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+@dataclass
+class CachedSession:
+    staff_id: int
+    created: float
+    expires: float
+    touched: float
+
+
+class SessionStore:
+    def __init__(self, bind: Engine = engine, cache_size: int = settings.AUTH_SESSION_CACHE_SIZE):
+        self.bind = bind
+        self.cache_size = cache_size
+        self.sessions: OrderedDict[str, CachedSession] = OrderedDict()
+        # Maps a token hash to the session's expiry. An entry is dropped once the
+        # session would have expired anyway, which keeps the set small.
+        self.revoked: dict[str, float] = {}
+        self.revoked_watermark = time.time()
+        self.refreshed = 0.0
+        self.purged = time.time()
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def expiry(self, created: float, now: float) -> float:
+        return min(now + settings.AUTH_SESSION_IDLE_SECONDS, created + settings.AUTH_SESSION_MAX_AGE_SECONDS)
+
+    def create(self, *, session: Session, staff_id: int) -> str:
+        token = secrets.token_urlsafe(32)
+        token_hash = hash_token(token)
+        now = time.time()
+        expires = self.expiry(now, now)
+        session.add(AuthSession(
+            token_hash=token_hash,
+            staff_id=staff_id,
+            created_datetime=from_timestamp(now),
+            expires_datetime=from_timestamp(expires),
+        ))
+        session.commit()
+        self._cache(token_hash, CachedSession(staff_id=staff_id, created=now, expires=expires, touched=now))
+        return token
+
+    def validate(self, token: str) -> int | None:
+        """Return the staff id behind ``token``, or None if it is unknown, expired or revoked."""
+        token_hash = hash_token(token)
+        now = time.time()
+        if now - self.refreshed >= settings.AUTH_SESSION_REVOCATION_REFRESH_SECONDS:
+            self.refresh_revocations(now)
+
+        with self._lock:
+            if token_hash in self.revoked:
+                return None
+            cached = self.sessions.get(token_hash)
+            if cached is not None:
+                self.sessions.move_to_end(token_hash)
+        hit = cached is not None and cached.expires > now
+        record_cache("auth_session", hit)
+
+        if not hit:
+            # Either a miss, or another worker may have extended the session since we cached it.
+            cached = self._load(token_hash)
+            if cached is None or cached.expires <= now:
+                with self._lock:
+                    self.sessions.pop(token_hash, None)
+                return None
+            self._cache(token_hash, cached)
+
+        if now - cached.touched >= settings.AUTH_SESSION_TOUCH_SECONDS:
+            self._touch(token_hash, cached, now)
+        return cached.staff_id
+
+    def revoke(self, *, session: Session, token: str) -> None:
+        token_hash = hash_token(token)
+        now = time.time()
+        session.execute(
+            update(AuthSession)
+            .where(AuthSession.token_hash == token_hash, AuthSession.revoked_datetime.is_(None))
+            .values(revoked_datetime=from_timestamp(now))
+        )
+        session.commit()
+        with self._lock:
+            cached = self.sessions.pop(token_hash, None)
+            self.revoked[token_hash] = cached.expires if cached is not None else now + settings.AUTH_SESSION_MAX_AGE_SECONDS
+
+    def revoke_staff(self, *, session: Session, staff_id: int) -> int:
+        now = time.time()
+        rows = session.exec(
+            select(AuthSession.token_hash, AuthSession.expires_datetime)
+            .where(AuthSession.staff_id == staff_id, AuthSession.revoked_datetime.is_(None))
+        ).all()
+        session.execute(
+            update(AuthSession)
+            .where(AuthSession.staff_id == staff_id, AuthSession.revoked_datetime.is_(None))
+            .values(revoked_datetime=from_timestamp(now))
+        )
+        session.commit()
+        with self._lock:
+            for token_hash, expires in rows:
+                self.sessions.pop(token_hash, None)
+                self.revoked[token_hash] = to_timestamp(expires)
+        return len(rows)
+
+    def refresh_revocations(self, now: float | None = None) -> None:
+        # Only one thread per worker refreshes at a time; the others keep using the current set.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            now = now or time.time()
+            since = from_timestamp(self.revoked_watermark - REVOCATION_OVERLAP_SECONDS)
+            with Session(self.bind) as session:
+                rows = session.exec(
+                    select(AuthSession.token_hash, AuthSession.revoked_datetime, AuthSession.expires_datetime)
+                    .where(AuthSession.revoked_datetime > since)
+                ).all()
+            with self._lock:
+                for token_hash, revoked, expires in rows:
+                    self.sessions.pop(token_hash, None)
+                    self.revoked[token_hash] = to_timestamp(expires)
+                    self.revoked_watermark = max(self.revoked_watermark, to_timestamp(revoked))
+                self.refreshed = now
+            if now - self.purged >= PURGE_INTERVAL_SECONDS:
+                self.purge(now)
+        finally:
+            self._refresh_lock.release()
+
+    def purge(self, now: float | None = None) -> int:
+        """Forget expired revocations and delete expired sessions from the table."""
+        now = now or time.time()
+        with self._lock:
+            self.revoked = {token_hash: expires for token_hash, expires in self.revoked.items() if expires > now}
+            self.purged = now
+        # Batches claimed with SKIP LOCKED, so workers purging at once split the work.
+        purged = 0
+        while True:
+            with self.bind.begin() as connection:
+                ids = connection.execute(skip_locked(
+                    select(AuthSession.id)
+                    .where(AuthSession.expires_datetime < from_timestamp(now))
+                    .limit(PURGE_BATCH_SIZE)
+                )).scalars().all()
+                if ids:
+                    connection.execute(delete(AuthSession).where(AuthSession.id.in_(ids)))
+            purged += len(ids)
+            if len(ids) < PURGE_BATCH_SIZE:
+                return purged
+
+    def _load(self, token_hash: str) -> CachedSession | None:
+        with Session(self.bind) as session:
+            row = session.exec(select(AuthSession).where(AuthSession.token_hash == token_hash)).first()
+        if row is None:
+            return None
+        expires = to_timestamp(row.expires_datetime)
+        if row.revoked_datetime is not None:
+            with self._lock:
+                self.revoked[token_hash] = expires
+            return None
+        return CachedSession(
+            staff_id=row.staff_id,
+            created=to_timestamp(row.created_datetime),
+            expires=expires,
+            touched=expires - settings.AUTH_SESSION_IDLE_SECONDS,
+        )
+
+    def _touch(self, token_hash: str, cached: CachedSession, now: float) -> None:
+        expires = self.expiry(cached.created, now)
+        with self._lock:
+            cached.touched = now
+            cached.expires = expires
+        with self.bind.begin() as connection:
+            connection.execute(
+                update(AuthSession)
+                .where(AuthSession.token_hash == token_hash, AuthSession.revoked_datetime.is_(None))
+                .values(expires_datetime=from_timestamp(expires))
+            )
+
+    def _cache(self, token_hash: str, cached: CachedSession) -> None:
+        with self._lock:
+            self.sessions[token_hash] = cached
+            self.sessions.move_to_end(token_hash)
+            while len(self.sessions) > self.cache_size:
+                self.sessions.popitem(last=False)
+
+
+auth_sessions = SessionStore()
@@ -0,0 +1,12 @@
+class PasswordHasherBusy(Exception):
+    ...
+
+
+class LoginRateLimited(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class LoginRecentlyFailed(Exception):
+    ...
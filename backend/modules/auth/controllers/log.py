@@ -1,9 +1,15 @@
+from sqlalchemy import delete, union_all
 from sqlmodel import SQLModel, select
 from datetime import datetime
 from enum import Enum
 
+from modules.auth.controllers.log_archive import log_sources
 from modules.auth.models.log import Log, LogCreate
 from modules.database.session import SessionDep
+from modules.core.fields import load_only_fields
+
+
+LOG_COLUMNS = ("id", "text", "staff_id", "created_datetime", "updated_datetime")
 
 
 def get_log_all(
@@ -23,33 +29,65 @@ def get_log_all(
         updated_datetime__lt: datetime | None = None,
         updated_datetime__gte: datetime | None = None,
         updated_datetime__lte: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        include_archived: bool = False,
     ) -> list[Log]:
-    query = select(Log).offset(offset).limit(limit)
-    filters = [
-        Log.staff_id == staff_id if staff_id is not None else None,
-        Log.text.ilike(f"%{text}%") if text is not None else None,
-        Log.created_datetime == created_datetime if created_datetime is not None else None,
-        Log.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
-        Log.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
-        Log.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
-        Log.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
-        Log.updated_datetime == updated_datetime if updated_datetime is not None else None,
-        Log.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
-        Log.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
-        Log.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
-        Log.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
+    def filters(columns) -> list:
+        return [
+            columns.staff_id == staff_id if staff_id is not None else None,
+            columns.text.ilike(f"%{text}%") if text is not None else None,
+            columns.created_datetime == created_datetime if created_datetime is not None else None,
+            columns.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
+            columns.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
+            columns.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
+            columns.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
+            columns.updated_datetime == updated_datetime if updated_datetime is not None else None,
+            columns.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
+            columns.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
+            columns.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
+            columns.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
+        ]
+
+    lowers = [value for value in (created_datetime, created_datetime__gt, created_datetime__gte) if value is not None]
+    uppers = [value for value in (created_datetime, created_datetime__lt, created_datetime__lte) if value is not None]
+    # Archived months are read only when asked for, explicitly or by a date range
+    # reaching back into them; otherwise the listing stays on the hot table.
+    archives = log_sources(
+        session.get_bind(),
+        lower=max(lowers) if lowers else None,
+        upper=min(uppers) if uppers else None,
+    ) if include_archived or lowers or uppers else []
+
+    if not archives:
+        query = select(Log).options(*load_only_fields(Log, fields)).offset(offset).limit(limit)
+        hot_filters = [filter for filter in filters(Log) if filter is not None]
+        if hot_filters:
+            query = query.where(*hot_filters)
+        return session.exec(query).all()
+
+    # Hot and archived rows in one ordered page; archived ids are unique across tables.
+    parts = [
+        select(*(table.c[name] for name in LOG_COLUMNS)).where(
+            *[filter for filter in filters(table.c) if filter is not None]
+        )
+        for table in (Log.__table__, *archives)
     ]
-    
-    filters = [filter for filter in filters if filter is not None]
-    
-    if filters:
-        query = query.where(*filters)
-    
-    return session.exec(query).all()
+    combined = union_all(*parts).subquery()
+    query = select(combined).order_by(combined.c.id).offset(offset).limit(limit)
+    return [Log(**row) for row in session.execute(query).mappings()]
 
 
-def get_log_by_id(*, session: SessionDep, id: int) -> Log | None:
-    return session.get(Log, id)
+def get_log_by_id(*, session: SessionDep, id: int, fields: tuple[str, ...] | None = None) -> Log | None:
+    db_log = session.get(Log, id, options=load_only_fields(Log, fields))
+    if db_log is not None:
+        return db_log
+    for table in log_sources(session.get_bind()):
+        row = session.execute(
+            select(*(table.c[name] for name in LOG_COLUMNS)).where(table.c.id == id)
+        ).mappings().first()
+        if row is not None:
+            return Log(**row)
+    return None
 
 
 def create_log( *, staff_id: int, log: LogCreate, session: SessionDep) -> Log | None:
@@ -63,6 +101,10 @@ def create_log( *, staff_id: int, log: LogCreate, session: SessionDep) -> Log |
 def delete_log(*, id: int, session: SessionDep) -> bool:
     db_log = session.get(Log, id)
     if db_log is None:
+        for table in log_sources(session.get_bind()):
+            if session.execute(delete(table).where(table.c.id == id)).rowcount:
+                session.commit()
+                return True
         return False
     session.delete(db_log)
     session.commit()
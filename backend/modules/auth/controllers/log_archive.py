@@ -0,0 +1,192 @@
+"""Monthly archival of the audit log.
+
+Rows of ``log`` older than ``LOG_RETENTION_DAYS`` move into one table per
+month of ``created_datetime``: ``log_archive_YYYYMM``. These are archive tiers
+like the patient archive (``modules.core.tiers``): they keep the original ids
+and have no foreign key to ``staff``, so archived entries outlive the staff
+member who made them. Each batch is copied and deleted in one short
+transaction, claimed with ``SKIP LOCKED`` where the database supports it, so
+several workers can archive at once and the API keeps writing in between. A
+month's table is created under an advisory lock, so two workers reaching a new
+month do not both try to create it.
+
+``log_sources`` picks the archive tables a ``/log/`` query can reach from its
+``created_datetime`` bounds. The log controller asks for them only when the query
+has such bounds or passes ``include_archived``, and then reads hot and archived
+rows through one ``UNION ALL``.
+
+SQLite does not shrink its file after deletes. Once migration 4 has switched the
+database to incremental auto-vacuum, each archiver pass also returns up to
+``LOG_VACUUM_PAGES`` free pages to the filesystem.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Engine, Table, inspect, select
+
+from modules import settings
+from modules.auth.models.log import Log
+from modules.core.tiers import archive_table, move_rows
+from modules.core.worker import PeriodicWorker
+from modules.database.dialect import advisory_lock, skip_locked
+from modules.database.engine import engine
+from modules.monitoring.metrics import registry
+
+
+ARCHIVE_PREFIX = "log_archive_"
+ARCHIVE_INDEXES = ("staff_id", "created_datetime")
+LOG_ARCHIVE_LOCK = 0x484C4F47
+# Other workers may create a month's table; the list of tables is re-read this often.
+ARCHIVE_LIST_TTL_SECONDS = 5.0
+
+LOGS_ARCHIVED = registry.counter(
+    "hims_log_archived_rows_total",
+    "Audit log rows moved into monthly archive tables.",
+)
+
+log_table: Table = Log.__table__
+_archive_tables: dict[str, Table] = {}
+_archive_tables_lock = threading.Lock()
+_known_months: tuple[float, list[str]] = (0.0, [])
+
+
+def month_key(moment: datetime) -> str:
+    return f"{moment.year:04d}{moment.month:02d}"
+
+
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    year, number = int(month[:4]), int(month[4:])
+    start = datetime(year, number, 1)
+    end = datetime(year + number // 12, number % 12 + 1, 1)
+    return start, end
+
+
+def month_table(month: str) -> Table:
+    with _archive_tables_lock:
+        table = _archive_tables.get(month)
+        if table is None:
+            table = _archive_tables[month] = archive_table(
+                log_table, f"{ARCHIVE_PREFIX}{month}", indexes=ARCHIVE_INDEXES,
+            )
+    return table
+
+
+def create_month_table(connection, table: Table) -> None:
+    if inspect(connection).has_table(table.name):
+        return
+    # Held until commit; whoever waited finds the table on the second check.
+    advisory_lock(connection, LOG_ARCHIVE_LOCK)
+    table.create(connection, checkfirst=True)
+
+
+def archived_months(bind: Engine = engine) -> list[str]:
+    global _known_months
+    read_at, months = _known_months
+    if time.monotonic() - read_at < ARCHIVE_LIST_TTL_SECONDS:
+        return months
+    months = sorted(
+        name[len(ARCHIVE_PREFIX):]
+        for name in inspect(bind).get_table_names()
+        if name.startswith(ARCHIVE_PREFIX)
+    )
+    _known_months = (time.monotonic(), months)
+    return months
+
+
+def naive_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def log_sources(
+        bind: Engine = engine,
+        *,
+        lower: datetime | None = None,
+        upper: datetime | None = None,
+    ) -> list[Table]:
+    """Archive tables whose month overlaps ``[lower, upper]``."""
+    lower = naive_utc(lower) if lower is not None else None
+    upper = naive_utc(upper) if upper is not None else None
+    tables = []
+    for month in archived_months(bind):
+        start, end = month_bounds(month)
+        if (lower is None or lower < end) and (upper is None or upper >= start):
+            tables.append(month_table(month))
+    return tables
+
+
+def archive_logs(
+        bind: Engine = engine,
+        *,
+        older_than: datetime,
+        batch_size: int = settings.LOG_ARCHIVE_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+    global _known_months
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with bind.begin() as connection:
+            rows = connection.execute(skip_locked(
+                select(log_table.c.id, log_table.c.created_datetime)
+                .where(log_table.c.created_datetime < older_than)
+                .order_by(log_table.c.id)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                break
+            by_month: defaultdict[str, list[int]] = defaultdict(list)
+            for row in rows:
+                by_month[month_key(row.created_datetime)].append(row.id)
+            moved_at = datetime.now(timezone.utc)
+            for month, ids in by_month.items():
+                table = month_table(month)
+                create_month_table(connection, table)
+                move_rows(connection, log_table, table, log_table.c.id.in_(ids), archived=moved_at)
+        _known_months = (0.0, [])
+        archived += len(rows)
+        batches += 1
+        LOGS_ARCHIVED.inc(len(rows))
+        if len(rows) < batch_size:
+            break
+    return archived
+
+
+def compact(bind: Engine = engine, *, pages: int = settings.LOG_VACUUM_PAGES) -> None:
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as connection:
+        # 2 = INCREMENTAL; with NONE or FULL there is nothing to do step by step.
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            return
+        free = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        # pysqlite steps the pragma only once, and each step frees one page.
+        for _ in range(min(free, pages)):
+            connection.exec_driver_sql("PRAGMA incremental_vacuum(1)")
+        connection.commit()
+
+
+class LogArchiver(PeriodicWorker):
+    """Background thread that archives old logs and compacts the database."""
+
+    name = "hims-log-archiver"
+
+    def __init__(self, bind: Engine = engine):
+        super().__init__()
+        self.bind = bind
+
+    @property
+    def interval(self) -> float:
+        return settings.LOG_ARCHIVE_INTERVAL_SECONDS
+
+    def run_once(self) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.LOG_RETENTION_DAYS)
+        archived = archive_logs(self.bind, older_than=cutoff, max_batches=settings.LOG_ARCHIVE_MAX_BATCHES)
+        compact(self.bind)
+        return archived
+
+
+log_archiver = LogArchiver()
@@ -0,0 +1,113 @@
+"""Password hashing on a bounded process pool.
+
+pbkdf2 holds the GIL for its whole run, so hashing inline stalls every other
+request on the worker. Hashes are computed in ``PASSWORD_HASH_WORKERS`` child
+processes instead; at most ``PASSWORD_HASH_MAX_PENDING`` calls may be queued or
+running, beyond which callers get ``PasswordHasherBusy`` rather than piling up.
+Set ``PASSWORD_HASH_WORKERS`` to 0 to hash inline.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from passlib.context import CryptContext
+
+from modules import settings
+from modules.auth.controllers.exceptions import PasswordHasherBusy
+from modules.monitoring.metrics import registry
+
+
+# Hashes with fewer rounds than configured are flagged by verify_and_update,
+# so logins transparently upgrade them.
+password_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+executor: ProcessPoolExecutor | None = None
+executor_lock = threading.Lock()
+pending = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+pending_lock = threading.Lock()
+pending_count = 0
+
+PASSWORD_HASH_PENDING = registry.gauge(
+    "hims_password_hash_pending",
+    "Password hash or verify calls queued or running in the hashing pool.",
+)
+PASSWORD_HASH_PENDING.set_function(lambda: pending_count)
+PASSWORD_HASH_REJECTED = registry.counter(
+    "hims_password_hash_rejected_total",
+    "Password hash or verify calls rejected because the hashing pool was full.",
+)
+
+
+def _hash(password: str) -> str:
+    return password_context.hash(password)
+
+
+def _verify_and_update(password: str, hash: str) -> tuple[bool, str | None]:
+    return password_context.verify_and_update(password, hash)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        return executor
+
+
+def warm_up_executor() -> None:
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return
+    pool = get_executor()
+    futures = [pool.submit(_hash, "warm-up") for _ in range(settings.PASSWORD_HASH_WORKERS)]
+    for future in futures:
+        future.result()
+
+
+def shutdown_executor() -> None:
+    global executor
+    with executor_lock:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            executor = None
+
+
+def release_pending(_future=None) -> None:
+    global pending_count
+    with pending_lock:
+        pending_count -= 1
+    pending.release()
+
+
+def run_bounded(function, *args):
+    global pending_count
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return function(*args)
+    if not pending.acquire(blocking=False):
+        PASSWORD_HASH_REJECTED.inc()
+        raise PasswordHasherBusy
+    with pending_lock:
+        pending_count += 1
+    try:
+        future = get_executor().submit(function, *args)
+    except BaseException:
+        release_pending()
+        raise
+    # The slot is freed when the pool finishes the call, not when this caller
+    # stops waiting, so a timed-out hash still counts while it runs.
+    future.add_done_callback(release_pending)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+    except TimeoutError:
+        raise PasswordHasherBusy
+
+
+def hash_password(password: str) -> str:
+    return run_bounded(_hash, password)
+
+
+def verify_password(password: str, hash: str) -> tuple[bool, str | None]:
+    """Return whether ``password`` matches and, if the hash is outdated, its replacement."""
+    return run_bounded(_verify_and_update, password, hash)
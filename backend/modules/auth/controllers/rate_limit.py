@@ -0,0 +1,223 @@
+"""Login throttling that runs before any password hashing.
+
+Every attempt takes a token from three buckets: a strict one keyed by username
+and client IP, a looser one keyed by username alone, and one keyed by client
+IP. Hammering a username from one address therefore does not lock its owner
+out elsewhere, while a spread-out attack on one account still hits the
+per-username limit. Credentials that failed within
+``LOGIN_FAILURE_CACHE_SECONDS`` are rejected straight from a negative cache;
+only an HMAC of them under ``HIMS_LOGIN_FAILURE_KEY`` is kept.
+
+``HIMS_LOGIN_RATE_LIMIT_STORE`` picks where the state lives: ``memory`` (per
+process, the default) or ``database``, which shares it between workers and
+hosts through the ``rate_limit_bucket`` and ``rate_limit_failure`` tables.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from sqlalchemy import Engine, delete, func, select
+
+from modules import settings
+from modules.auth.controllers.exceptions import LoginRateLimited, LoginRecentlyFailed
+from modules.auth.models.rate_limit import RateLimitBucket, RateLimitFailure, RateLimitStats
+from modules.database.dialect import upsert
+from modules.database.engine import engine
+from modules.monitoring.metrics import registry
+
+
+LOGIN_ATTEMPTS = registry.counter(
+    "hims_login_attempts_total",
+    "Login attempts by rate limiter decision.",
+    ("result",),
+)
+
+
+def refill(tokens: float, updated: float, now: float, capacity: int, refill_per_second: float) -> tuple[float, float]:
+    """Return the bucket's new token count and the seconds to wait (0 when a token was taken)."""
+    tokens = min(float(capacity), tokens + (now - updated) * refill_per_second)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / refill_per_second
+
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token from ``key``'s bucket; return 0 or the seconds until one is available."""
+
+    @abstractmethod
+    def has_failure(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def add_failure(self, key: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    def __init__(self, max_keys: int = settings.LOGIN_RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self.failures: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self.buckets.pop(key, (float(capacity), now))
+            tokens, wait = refill(tokens, updated, now, capacity, refill_per_second)
+            self.buckets[key] = (tokens, now)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def has_failure(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires = self.failures.get(key)
+            if expires is None:
+                return False
+            if expires <= now:
+                del self.failures[key]
+                return False
+            return True
+
+    def add_failure(self, key: str, ttl: float) -> None:
+        with self._lock:
+            self.failures.pop(key, None)
+            self.failures[key] = time.monotonic() + ttl
+            while len(self.failures) > self.max_keys:
+                self.failures.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self.buckets) + len(self.failures)
+
+
+class DatabaseRateLimitStore(RateLimitStore):
+    """Buckets and failures in the database, shared by every worker.
+
+    Each call is one short transaction on the writer. On PostgreSQL the bucket
+    row is locked while it is refilled; SQLite serialises the writes itself.
+    """
+
+    def __init__(self, bind: Engine = engine, prune_every: int = 1000):
+        self.bind = bind
+        self.prune_every = prune_every
+        self._calls = 0
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.time()
+        table = RateLimitBucket.__table__
+        with self.bind.begin() as connection:
+            row = connection.execute(
+                select(table.c.tokens, table.c.updated).where(table.c.key == key).with_for_update()
+            ).first()
+            tokens, updated = row if row is not None else (float(capacity), now)
+            tokens, wait = refill(tokens, updated, now, capacity, refill_per_second)
+            upsert(connection, table, {"key": key, "tokens": tokens, "updated": now})
+        self._maybe_prune(now)
+        return wait
+
+    def has_failure(self, key: str) -> bool:
+        table = RateLimitFailure.__table__
+        with self.bind.connect() as connection:
+            expires = connection.execute(select(table.c.expires).where(table.c.key == key)).scalar()
+        return expires is not None and expires > time.time()
+
+    def add_failure(self, key: str, ttl: float) -> None:
+        with self.bind.begin() as connection:
+            upsert(connection, RateLimitFailure.__table__, {"key": key, "expires": time.time() + ttl})
+
+    def size(self) -> int:
+        with self.bind.connect() as connection:
+            buckets = connection.execute(select(func.count()).select_from(RateLimitBucket.__table__)).scalar()
+            failures = connection.execute(select(func.count()).select_from(RateLimitFailure.__table__)).scalar()
+        return buckets + failures
+
+    def _maybe_prune(self, now: float) -> None:
+        self._calls += 1
+        if self._calls % self.prune_every:
+            return
+        buckets = RateLimitBucket.__table__
+        failures = RateLimitFailure.__table__
+        with self.bind.begin() as connection:
+            # Untouched for an hour, any bucket has refilled completely.
+            connection.execute(delete(buckets).where(buckets.c.updated < now - 3600))
+            connection.execute(delete(failures).where(failures.c.expires < now))
+
+
+STORES = {
+    "memory": InMemoryRateLimitStore,
+    "database": DatabaseRateLimitStore,
+}
+
+
+def load_store(name: str) -> RateLimitStore:
+    try:
+        return STORES[name or "memory"]()
+    except KeyError:
+        raise ValueError(f"HIMS_LOGIN_RATE_LIMIT_STORE must be one of {', '.join(STORES)}, not {name!r}")
+
+
+class LoginRateLimiter:
+    def __init__(self, store: RateLimitStore):
+        self.store = store
+        if settings.LOGIN_FAILURE_KEY:
+            self._failure_key = settings.LOGIN_FAILURE_KEY.encode()
+        elif isinstance(store, InMemoryRateLimitStore):
+            # Nothing outside this process reads the digests.
+            self._failure_key = secrets.token_bytes(32)
+        else:
+            raise ValueError("HIMS_LOGIN_FAILURE_KEY must be set when the rate limit store is shared")
+
+    def fingerprint(self, username: str, password: str) -> str:
+        message = username.encode() + b"\0" + password.encode()
+        return "failure:" + hmac.new(self._failure_key, message, hashlib.sha256).hexdigest()
+
+    def check(self, *, username: str, password: str, client_ip: str | None) -> None:
+        if self.store.has_failure(self.fingerprint(username, password)):
+            LOGIN_ATTEMPTS.inc(labels=("recent_failure",))
+            raise LoginRecentlyFailed
+
+        username = username.lower()
+        buckets = [
+            (f"user-ip:{username}:{client_ip}", settings.LOGIN_USERNAME_BURST, settings.LOGIN_USERNAME_PER_MINUTE, "limited_username"),
+            (f"user:{username}", settings.LOGIN_USERNAME_TOTAL_BURST, settings.LOGIN_USERNAME_TOTAL_PER_MINUTE, "limited_username_total"),
+        ]
+        if client_ip is not None:
+            buckets.append((f"ip:{client_ip}", settings.LOGIN_IP_BURST, settings.LOGIN_IP_PER_MINUTE, "limited_ip"))
+        for key, burst, per_minute, result in buckets:
+            wait = self.store.take(key, burst, per_minute / 60)
+            if wait:
+                LOGIN_ATTEMPTS.inc(labels=(result,))
+                raise LoginRateLimited(wait)
+
+        LOGIN_ATTEMPTS.inc(labels=("allowed",))
+
+    def record_failure(self, *, username: str, password: str) -> None:
+        LOGIN_ATTEMPTS.inc(labels=("failed",))
+        self.store.add_failure(self.fingerprint(username, password), settings.LOGIN_FAILURE_CACHE_SECONDS)
+
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            store=type(self.store).__name__,
+            tracked_keys=self.store.size(),
+            allowed=int(LOGIN_ATTEMPTS.value(("allowed",))),
+            failed=int(LOGIN_ATTEMPTS.value(("failed",))),
+            limited_username=int(LOGIN_ATTEMPTS.value(("limited_username",))),
+            limited_username_total=int(LOGIN_ATTEMPTS.value(("limited_username_total",))),
+            limited_ip=int(LOGIN_ATTEMPTS.value(("limited_ip",))),
+            recent_failure=int(LOGIN_ATTEMPTS.value(("recent_failure",))),
+        )
+
+
+login_rate_limiter = LoginRateLimiter(load_store(settings.LOGIN_RATE_LIMIT_STORE))
@@ -1,19 +1,28 @@
+from contextvars import ContextVar
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from sqlmodel import select
 from datetime import datetime
 
+from modules import settings
 from modules.auth.models.staff import Staff, StaffCreate, StaffUpdate, StaffLogin
 from modules.database.session import SessionDep
+from modules.core.soft_delete import soft_delete
+from modules.core.fields import load_only_fields
 from modules.auth.models.log import Log
+from modules.auth.controllers.log import get_log_all
 from modules.impatient.models.admission import Admission
 from modules.impatient.models.note import Note
 
-from passlib.hash import pbkdf2_sha256
+from modules.auth.controllers.password import hash_password, verify_password
+from modules.auth.controllers.auth_session import auth_sessions
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# (token, staff id) set by the batch route, so its sub-requests skip re-validating the same token.
+authenticated_staff: ContextVar[tuple[str, int] | None] = ContextVar("authenticated_staff", default=None)
+
 
 def get_staff_all(
         *,
@@ -35,8 +44,9 @@ def get_staff_all(
         updated_datetime__lt: datetime | None = None,
         updated_datetime__gte: datetime | None = None,
         updated_datetime__lte: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
     ) -> list[Staff]:
-    query = select(Staff).offset(offset).limit(limit)
+    query = select(Staff).options(*load_only_fields(Staff, fields)).offset(offset).limit(limit)
     filters = [
         Staff.first_name.ilike(f"%{first_name}%") if first_name is not None else None,
         Staff.last_name.ilike(f"%{last_name}%") if last_name is not None else None,
@@ -63,27 +73,27 @@ def get_staff_all(
     return session.exec(query).all()
 
 
-def get_staff_by_id( *, session: SessionDep, id: int) -> Staff | None:
-    return session.get(Staff, id)
-
-
-def __hash_password( password: str) -> str:
-    return pbkdf2_sha256.hash(password)
-
-
-def __verify_password( password: str, hash: str) -> bool:
-    return pbkdf2_sha256.verify(password, hash)
+def get_staff_by_id( *, session: SessionDep, id: int, fields: tuple[str, ...] | None = None) -> Staff | None:
+    return session.get(Staff, id, options=load_only_fields(Staff, fields))
 
 
 def login_staff( *, staff: StaffLogin, session: SessionDep) -> Staff | None:
     db_staff = session.exec(select(Staff).where(Staff.username == staff.username)).first()
-    if db_staff is None or not __verify_password(staff.passowrd, db_staff.hashed_password):
+    if db_staff is None:
         return None
+    verified, new_hash = verify_password(staff.passowrd, db_staff.hashed_password)
+    if not verified:
+        return None
+    if new_hash is not None:
+        db_staff.hashed_password = new_hash
+        session.add(db_staff)
+        session.commit()
+        session.refresh(db_staff)
     return db_staff
 
 
 def register_staff( *, staff: StaffCreate, session: SessionDep) -> Staff | None:
-    hashed_passowrd = __hash_password(staff.password)
+    hashed_passowrd = hash_password(staff.password)
     db_staff = Staff.model_validate(staff, update={"hashed_password": hashed_passowrd})
     session.add(db_staff)
     session.commit()
@@ -95,26 +105,27 @@ def get_staff_logs(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Log] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None,
+        include_archived: bool = False) -> list[Log] | None:
     
     db_staff = session.get(Staff, id)
     if not db_staff:
         return None
-    query = select(Log).where(Log.staff_id == db_staff.id).offset(offset).limit(limit)
-
-    return session.exec(query).all()
+    return get_log_all(session=session, staff_id=db_staff.id, offset=offset, limit=limit, fields=fields, include_archived=include_archived)
 
 
 def get_staff_admissions(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Admission] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None) -> list[Admission] | None:
     
     db_staff = session.get(Staff, id)
     if not db_staff:
         return None
-    query = select(Admission).where(Admission.staff_id == db_staff.id).offset(offset).limit(limit)
+    query = select(Admission).options(*load_only_fields(Admission, fields)).where(Admission.staff_id == db_staff.id).offset(offset).limit(limit)
 
     return session.exec(query).all()
 
@@ -123,12 +134,13 @@ def get_staff_notes(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Admission] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None) -> list[Admission] | None:
     
     db_staff = session.get(Note, id)
     if not db_staff:
         return None
-    query = select(Note).where(Note.staff_id == db_staff.id).offset(offset).limit(limit)
+    query = select(Note).options(*load_only_fields(Note, fields)).where(Note.staff_id == db_staff.id).offset(offset).limit(limit)
 
     return session.exec(query).all()
 
@@ -141,7 +153,7 @@ def update_staff(*, id: int, staff: StaffUpdate, session: SessionDep) -> Staff |
     extra_data = {}
     if "password" in staff_data:
         password = staff_data["password"]
-        hashed_password = __hash_password(password)
+        hashed_password = hash_password(password)
         extra_data["hashed_password"] = hashed_password
     db_staff.sqlmodel_update(staff_data, update=extra_data)
     session.add(db_staff)
@@ -154,16 +166,42 @@ def delete_staff(*, id: int, session: SessionDep) -> bool:
     db_staff = session.get(Staff, id)
     if db_staff is None:
         return False
-    session.delete(db_staff)
+    auth_sessions.revoke_staff(session=session, staff_id=id)
+    soft_delete(session, db_staff)
     session.commit()
     return True
 
 
+def get_staff_by_token(*, session: SessionDep, token: str) -> Staff | None:
+    staff_id = auth_sessions.validate(token)
+    if staff_id is None:
+        return None
+    return session.get(Staff, staff_id)
+
+
+def is_admin_staff(staff: Staff) -> bool:
+    # No configured admins means no admins: the admin routes expose SQL and profiles.
+    return staff.username in settings.ADMIN_USERNAMES
+
+
 def get_current_staff(session: SessionDep, token: Annotated[str, Depends(oauth2_scheme)]) -> Staff:
-    staff = session.exec(select(Staff).where(Staff.id == int(token))).first()
+    authenticated = authenticated_staff.get()
+    if authenticated is not None and authenticated[0] == token:
+        staff = session.get(Staff, authenticated[1])
+    else:
+        staff = get_staff_by_token(session=session, token=token)
     if staff is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
-    return staff
\ No newline at end of file
+    return staff
+
+
+def get_admin_staff(current_staff: Annotated[Staff, Depends(get_current_staff)]) -> Staff:
+    if not is_admin_staff(current_staff):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_staff
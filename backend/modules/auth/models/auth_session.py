@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
+
+
+class AuthSession(SQLModel, table=True):
+    __tablename__ = "auth_session"
+
+    id: int | None = Field(default=None, primary_key=True)
+    token_hash: str = Field(index=True, unique=True)
+    staff_id: int = Field(foreign_key="staff.id", index=True)
+    created_datetime: datetime = Field(sa_column=Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+    ),
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    expires_datetime: datetime = Field(sa_column=Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        index=True,
+    ))
+    revoked_datetime: datetime | None = Field(default=None, sa_column=Column(
+        TIMESTAMP(timezone=True),
+        nullable=True,
+        index=True,
+    ))
@@ -8,7 +8,7 @@ class LogBase(SQLModel):
 
 class Log(LogBase, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    staff_id: int = Field(foreign_key="staff.id")
+    staff_id: int = Field(foreign_key="staff.id", index=True)
     created_datetime: datetime = Field(sa_column=Column(
         TIMESTAMP(timezone=True),
         nullable=False,
@@ -21,6 +21,7 @@ class Log(LogBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
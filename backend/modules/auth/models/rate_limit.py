@@ -0,0 +1,28 @@
+from sqlmodel import Field, SQLModel
+
+
+class RateLimitBucket(SQLModel, table=True):
+    __tablename__ = "rate_limit_bucket"
+
+    key: str = Field(primary_key=True)
+    tokens: float = Field()
+    # Wall-clock seconds, so every worker and host agrees on them.
+    updated: float = Field(index=True)
+
+
+class RateLimitFailure(SQLModel, table=True):
+    __tablename__ = "rate_limit_failure"
+
+    key: str = Field(primary_key=True)
+    expires: float = Field(index=True)
+
+
+class RateLimitStats(SQLModel):
+    store: str
+    tracked_keys: int
+    allowed: int
+    failed: int
+    limited_username: int
+    limited_username_total: int
+    limited_ip: int
+    recent_failure: int
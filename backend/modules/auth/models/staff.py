@@ -1,16 +1,18 @@
 from datetime import datetime, timezone
 from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
+from modules.core.soft_delete import SoftDeleteMixin
 
 
 class StaffBase(SQLModel):
     first_name: str | None = Field(default=None)
     last_name: str | None = Field(default=None)
-    email: str = Field(index=True, unique=True)
-    username: str = Field(index=True, unique=True)
+    # Unique among live staff only; migration 6 adds the partial unique indexes.
+    email: str = Field(index=True)
+    username: str = Field(index=True)
     phone: str | None = Field(default=None, index=True)
 
 
-class Staff(StaffBase, table=True):
+class Staff(StaffBase, SoftDeleteMixin, table=True):
     id: int | None = Field(default=None, primary_key=True)
     hashed_password: str = Field()
     created_datetime: datetime = Field(sa_column=Column(
@@ -25,6 +27,7 @@ class Staff(StaffBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
@@ -6,8 +6,11 @@ from modules.auth.models.staff import Staff
 from modules.auth.controllers.log import get_log_all, get_log_by_id, create_log, delete_log
 from modules.auth.models.log import LogCreate, LogPublic
 from modules.database.session import SessionDep
+from modules.core.fields import field_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
 
 @router.get("/", response_model=list[LogPublic])
 def list_logs(
@@ -26,9 +29,11 @@ def list_logs(
     updated_datetime__lte: datetime | None = None,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(LogPublic)),
+    include_archived: bool = False,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_log_all(
+    return json_response(LogPublic, get_log_all(
         session=session,
         text=text,
         staff_id=staff_id,
@@ -44,19 +49,22 @@ def list_logs(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+        include_archived=include_archived,
+    ), fields=fields)
 
 
 @router.get("/{id}/", response_model=LogPublic)
 def retrieve_log(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(LogPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    log = get_log_by_id(session=session, id=id)
+    log = get_log_by_id(session=session, id=id, fields=fields)
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
-    return log
+    return json_response(LogPublic, log, fields=fields)
 
 
 @router.post("/", response_model=LogPublic)
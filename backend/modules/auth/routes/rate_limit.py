@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from modules.auth.controllers.staff import get_admin_staff
+from modules.auth.controllers.rate_limit import login_rate_limiter
+from modules.auth.models.staff import Staff
+from modules.auth.models.rate_limit import RateLimitStats
+
+router = APIRouter()
+
+
+@router.get("/", response_model=RateLimitStats)
+def retrieve_rate_limit_stats(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    return login_rate_limiter.stats()
@@ -1,21 +1,35 @@
+import math
 from typing import Annotated
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.exc import IntegrityError
 from fastapi.responses import JSONResponse
 
 
-from modules.auth.controllers.staff import get_staff_all, get_staff_by_id, register_staff, login_staff, update_staff, delete_staff, get_current_staff, get_staff_admissions, get_staff_logs, get_staff_notes
+from modules.auth.controllers.staff import get_staff_all, get_staff_by_id, register_staff, login_staff, update_staff, delete_staff, get_current_staff, get_staff_admissions, get_staff_logs, get_staff_notes, oauth2_scheme
 from modules.auth.models.staff import Staff, StaffCreate, StaffUpdate, StaffLogin, StaffPublic
 from modules.database.session import SessionDep
 from modules.impatient.models.admission import AdmissionPublic
 from modules.impatient.models.note import NotePublic
 from modules.auth.models.log import LogPublic
 from modules.auth.controllers.log import log, LogType
+from modules.auth.controllers.exceptions import PasswordHasherBusy, LoginRateLimited, LoginRecentlyFailed
+from modules.auth.controllers.rate_limit import login_rate_limiter
+from modules.auth.controllers.auth_session import auth_sessions
+from modules import settings
+from modules.core.fields import field_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute, per_caller
 
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
+
+PASSWORD_HASHER_BUSY = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent password operations, please retry",
+    headers={"Retry-After": "1"},
+)
 
 @router.get("/", response_model=list[StaffPublic])
 def list_staff(
@@ -37,9 +51,10 @@ def list_staff(
     updated_datetime__lt: datetime | None = None,
     updated_datetime__gte: datetime | None = None,
     updated_datetime__lte: datetime | None = None,
+    fields: tuple[str, ...] | None = Depends(field_selection(StaffPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_staff_all(
+    return json_response(StaffPublic, get_staff_all(
         session=session,
         first_name=first_name,
         last_name=last_name,
@@ -58,7 +73,8 @@ def list_staff(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+    ), fields=fields)
 
 
 @router.get("/{id}/admissions/", response_model=list[AdmissionPublic])
@@ -67,14 +83,16 @@ def list_staff_admissions(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(AdmissionPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_staff_admissions(
+    return json_response(AdmissionPublic, get_staff_admissions(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+    ), fields=fields)
 
 
 @router.get("/{id}/notes/", response_model=list[NotePublic])
@@ -83,14 +101,16 @@ def list_staff_notes(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(NotePublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_staff_notes(
+    return json_response(NotePublic, get_staff_notes(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+    ), fields=fields)
 
 
 @router.get("/{id}/logs/", response_model=list[LogPublic])
@@ -99,50 +119,91 @@ def list_staff_logs(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(LogPublic)),
+    include_archived: bool = False,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_staff_logs(
+    return json_response(LogPublic, get_staff_logs(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+        include_archived=include_archived,
+    ), fields=fields)
+
+
+@router.get("/me/", response_model=StaffPublic)
+@per_caller
+def retrieve_me(
+    session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(StaffPublic)),
+    current_staff: Staff = Depends(get_current_staff),
+):
+    return json_response(StaffPublic, current_staff, fields=fields)
 
 
 @router.get("/{id}/", response_model=StaffPublic)
 def retrieve_staff(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(StaffPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    staff = get_staff_by_id(session=session, id=id)
+    staff = get_staff_by_id(session=session, id=id, fields=fields)
     if not staff:
         raise HTTPException(status_code=404, detail="Staff not found")
-    return staff
-
+    return json_response(StaffPublic, staff, fields=fields)
 
-@router.get("/me/", response_model=StaffPublic)
-def retrieve_me(
-    session: SessionDep,
-    current_staff: Staff = Depends(get_current_staff),
-):
-    return current_staff
 
 @router.post("/login")
 def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     session: SessionDep,
 ):
-    staff = login_staff(staff=StaffLogin(username=form_data.username, passowrd=form_data.password), session=session)
-    if not staff:
+    invalid_credentials = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid username or password",
+    )
+    try:
+        login_rate_limiter.check(
+            username=form_data.username,
+            password=form_data.password,
+            client_ip=request.client.host if request.client else None,
+        )
+        staff = login_staff(staff=StaffLogin(username=form_data.username, passowrd=form_data.password), session=session)
+    except LoginRateLimited as e:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please retry later",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
         )
+    except LoginRecentlyFailed:
+        raise invalid_credentials
+    except PasswordHasherBusy:
+        raise PASSWORD_HASHER_BUSY
+    if not staff:
+        login_rate_limiter.record_failure(username=form_data.username, password=form_data.password)
+        raise invalid_credentials
     log(staff_id=staff.id, model=staff, path="login", session=session)
     
-    response = JSONResponse(content={"detail": "Login successful", "access_token": str(staff.id)})
-    response.set_cookie(key="access_token", value=staff.id, httponly=True)
+    token = auth_sessions.create(session=session, staff_id=staff.id)
+    response = JSONResponse(content={"detail": "Login successful", "access_token": token})
+    response.set_cookie(key="access_token", value=token, httponly=True, samesite="lax", max_age=settings.AUTH_SESSION_MAX_AGE_SECONDS)
+    return response
+
+
+@router.post("/logout")
+def logout(
+    session: SessionDep,
+    token: Annotated[str, Depends(oauth2_scheme)],
+    current_staff: Staff = Depends(get_current_staff),
+):
+    auth_sessions.revoke(session=session, token=token)
+    log(staff_id=current_staff.id, model=current_staff, path="logout", session=session)
+    response = JSONResponse(content={"detail": "Logout successful"})
+    response.delete_cookie(key="access_token")
     return response
 
 
@@ -160,6 +221,8 @@ def register(
         raise HTTPException(
             status_code=400, detail="A user with the provided details already exists"
         )
+    except PasswordHasherBusy:
+        raise PASSWORD_HASHER_BUSY
 
 
 @router.put("/", response_model=StaffPublic)
@@ -168,7 +231,10 @@ def update(
     session: SessionDep,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    staff = update_staff(staff=staff_update, id=current_staff.id, session=session)
+    try:
+        staff = update_staff(staff=staff_update, id=current_staff.id, session=session)
+    except PasswordHasherBusy:
+        raise PASSWORD_HASHER_BUSY
     if not staff:
         raise HTTPException(status_code=404, detail="Staff not found")
     log(staff_id=staff.id, model=staff, path="update staff", log_type=LogType.Put, session=session)
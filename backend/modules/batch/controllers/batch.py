@@ -0,0 +1,168 @@
+"""Run several API calls from one HTTP request.
+
+Sub-requests are dispatched in-process to the app's router, wrapped in the
+metrics and profiler middleware so each one is recorded like a request of its
+own. Compression is left to the batch response, which embeds their bodies. The
+batch authenticates once, and sub-requests carrying the same token reuse the
+staff it resolved. Consecutive GETs run concurrently, each on its own database
+session, since a session cannot be shared between concurrent callers. Any other
+method waits for everything listed before it and runs on the batch's shared
+session, so a read always sees the writes listed ahead of it.
+
+Writes are not atomic: each one commits as its route does, so a failed write
+leaves the ones before it in place. Send writes that must succeed or fail
+together as a single request instead.
+"""
+import asyncio
+import logging
+import time
+from urllib.parse import urlencode
+
+from pydantic_core import to_json
+from sqlmodel import Session
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from modules import settings
+from modules.auth.controllers.staff import authenticated_staff
+from modules.batch.controllers.exceptions import InvalidBatchRequest
+from modules.batch.models.batch import BatchRequestItem
+from modules.database.session import LAST_WRITE_HEADER, shared_session
+from modules.monitoring.middleware import MetricsMiddleware, ProfilerMiddleware
+
+
+logger = logging.getLogger(__name__)
+
+METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+FORWARDED_HEADERS = {b"authorization", b"cookie", b"user-agent", LAST_WRITE_HEADER.encode()}
+
+
+def validate_items(items: list[BatchRequestItem]) -> None:
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        raise InvalidBatchRequest(f"At most {settings.BATCH_MAX_REQUESTS} requests per batch")
+    for index, item in enumerate(items):
+        if item.method.upper() not in METHODS:
+            raise InvalidBatchRequest(f"Request {index}: unsupported method {item.method}")
+        if not item.path.startswith("/"):
+            raise InvalidBatchRequest(f"Request {index}: path must start with /")
+        if item.path.startswith("/batch"):
+            raise InvalidBatchRequest(f"Request {index}: batches cannot be nested")
+
+
+def sub_scope(parent: dict, item: BatchRequestItem, body: bytes, written: float | None = None) -> dict:
+    path, _, query = item.path.partition("?")
+    if item.params:
+        query = "&".join(part for part in (query, urlencode(item.params, doseq=True)) if part)
+    headers = [(name, value) for name, value in parent["headers"] if name in FORWARDED_HEADERS]
+    if written is not None:
+        # Reads after a write in this batch must not go to a lagging replica.
+        headers = [(name, value) for name, value in headers if name != LAST_WRITE_HEADER.encode()]
+        headers.append((LAST_WRITE_HEADER.encode(), f"{written:.3f}".encode()))
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": item.method.upper(),
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "app": parent["app"],
+        "state": {},
+    }
+    return scope
+
+
+def sub_request_app(app):
+    # Mirrors the app's own stack, minus compression: handled errors become
+    # responses before the metrics middleware reads their status.
+    handlers = {key: value for key, value in app.exception_handlers.items() if key not in (500, Exception)}
+    stack = MetricsMiddleware(ExceptionMiddleware(app.router, handlers=handlers))
+    if settings.PROFILER_ENABLED:
+        stack = ProfilerMiddleware(stack)
+    return stack
+
+
+def result(status: int, body: bytes) -> bytes:
+    return b'{"status":%d,"body":%s}' % (status, body or b"null")
+
+
+async def dispatch(scope: dict, body: bytes = b"") -> bytes:
+    status = 500
+    content_type = ""
+    chunks: list[bytes] = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Never report a disconnect; streaming responses would stop early.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await sub_request_app(scope["app"])(scope, receive, send)
+    except HTTPException as e:
+        return result(e.status_code, to_json({"detail": e.detail}))
+    except Exception:
+        logger.exception("Batch sub-request %s %s failed", scope["method"], scope["path"])
+        return result(500, b'{"detail":"Internal Server Error"}')
+
+    content = b"".join(chunks)
+    if content and not content_type.startswith("application/json"):
+        content = to_json(content.decode("utf-8", "replace"))
+    return result(status, content)
+
+
+async def run_batch(
+        *,
+        scope: dict,
+        items: list[BatchRequestItem],
+        session: Session,
+        token: str,
+        staff_id: int,
+    ) -> bytes:
+    validate_items(items)
+    results: list[bytes] = [b""] * len(items)
+    auth_token = authenticated_staff.set((token, staff_id))
+    written = None
+    try:
+        index = 0
+        while index < len(items):
+            if items[index].method.upper() == "GET":
+                group = []
+                while index < len(items) and items[index].method.upper() == "GET":
+                    group.append(index)
+                    index += 1
+                responses = await asyncio.gather(*(dispatch(sub_scope(scope, items[i], b"", written)) for i in group))
+                for i, response in zip(group, responses):
+                    results[i] = response
+            else:
+                item = items[index]
+                body = to_json(item.body) if item.body is not None else b""
+                session_token = shared_session.set(session)
+                try:
+                    results[index] = await dispatch(sub_scope(scope, item, body, written), body)
+                finally:
+                    shared_session.reset(session_token)
+                written = time.time()
+                index += 1
+    finally:
+        authenticated_staff.reset(auth_token)
+    return b"[" + b",".join(results) + b"]"
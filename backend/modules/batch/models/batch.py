@@ -0,0 +1,18 @@
+from typing import Any
+from sqlmodel import SQLModel
+
+
+class BatchRequestItem(SQLModel):
+    method: str = "GET"
+    path: str
+    params: dict[str, Any] | None = None
+    body: Any | None = None
+
+
+class BatchRequest(SQLModel):
+    requests: list[BatchRequestItem]
+
+
+class BatchResponseItem(SQLModel):
+    status: int
+    body: Any | None = None
@@ -0,0 +1,33 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from modules.auth.controllers.staff import get_current_staff, oauth2_scheme
+from modules.auth.models.staff import Staff
+from modules.batch.controllers.batch import run_batch
+from modules.batch.controllers.exceptions import InvalidBatchRequest
+from modules.batch.models.batch import BatchRequest, BatchResponseItem
+from modules.database.session import SessionDep
+
+
+router = APIRouter()
+
+
+@router.post("/", response_model=list[BatchResponseItem])
+async def batch(
+    request: Request,
+    batch_request: BatchRequest,
+    session: SessionDep,
+    token: Annotated[str, Depends(oauth2_scheme)],
+    current_staff: Staff = Depends(get_current_staff),
+):
+    try:
+        content = await run_batch(
+            scope=request.scope,
+            items=batch_request.requests,
+            session=session,
+            token=token,
+            staff_id=current_staff.id,
+        )
+    except InvalidBatchRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content, media_type="application/json")
@@ -0,0 +1,204 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+GET endpoints of ``CoalescedRoute`` routers are keyed on the route and the
+arguments FastAPI resolved for them. Defaults are filled in and values parsed,
+so ``/room/`` and ``/room/?limit=10&offset=0`` share a key. The database
+session and the authenticated staff are left out of the key, so the same read
+from many terminals at shift start runs once. Authentication still runs per
+request, before the endpoint is called. Endpoints whose answer depends on who
+is asking (``/auth/me/``, anything gated on admin rights) are marked
+``per_caller`` and also keyed on the staff id. Async endpoints are not
+coalesced; their flights would have to be awaited rather than waited on.
+
+The first request for a key runs the endpoint. Requests that arrive while it is
+running wait for it and get a copy of its response instead of running the same
+SQL again. Nothing is cached once the flight lands. Every write through a
+``CoalescedRoute`` starts a new generation, and a read only joins flights of
+its own generation, so a read sent after a write never gets a result computed
+before it. The generation is per process: with several server workers, a write
+on one worker does not stop a read already in flight on another from being
+shared, so the guarantee holds within one worker only.
+"""
+import functools
+import inspect
+import threading
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from modules import settings
+from modules.monitoring.controllers.profiler import ProfiledRoute
+from modules.monitoring.metrics import registry
+
+
+# Arguments that do not change what a read returns.
+UNKEYED_ARGUMENTS = frozenset({"session", "current_staff", "request"})
+
+COALESCED_REQUESTS = registry.counter(
+    "hims_coalesced_requests_total",
+    "GET requests that ran the endpoint (leader) or shared an in-flight result (follower).",
+    ("route", "role"),
+)
+COALESCED_FOLLOWERS = registry.histogram(
+    "hims_coalesced_followers",
+    "Requests that shared each endpoint execution, excluding the one that ran it.",
+    ("route",),
+    buckets=(0, 1, 2, 5, 10, 25, 50),
+)
+
+
+class Flight:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, Flight] = {}
+
+    def do(self, key: tuple, function) -> tuple[object, Flight, bool]:
+        """Run ``function`` once per concurrent ``key``; returns (result, flight, leader)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+            else:
+                flight.followers += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, flight, False
+        try:
+            flight.result = function()
+            return flight.result, flight, True
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+flights = SingleFlight()
+
+# Bumped after every write endpoint returns; part of each read's key.
+write_generation = 0
+write_generation_lock = threading.Lock()
+
+
+def bump_generation() -> None:
+    global write_generation
+    with write_generation_lock:
+        write_generation += 1
+
+
+def freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+class SharedResponse:
+    """Immutable copy of a response that each follower turns into its own ``Response``."""
+
+    __slots__ = ("body", "status_code", "raw_headers")
+
+    def __init__(self, response: Response):
+        self.body = response.body
+        self.status_code = response.status_code
+        self.raw_headers = tuple(response.raw_headers)
+
+    def build(self) -> Response:
+        response = Response(self.body, status_code=self.status_code)
+        # Middleware edits raw_headers in place, so every request gets its own list.
+        response.raw_headers = list(self.raw_headers)
+        return response
+
+
+def per_caller(endpoint):
+    """Mark a GET endpoint whose response depends on the staff member calling it."""
+    endpoint.__coalesce_per_caller__ = True
+    return endpoint
+
+
+def coalesced(endpoint, route: str):
+    keyed_on_caller = getattr(endpoint, "__coalesce_per_caller__", False)
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        if not settings.COALESCE_ENABLED or args:
+            return endpoint(*args, **kwargs)
+        arguments = tuple(sorted(
+            (name, freeze(value)) for name, value in kwargs.items() if name not in UNKEYED_ARGUMENTS
+        ))
+        caller = kwargs["current_staff"].id if keyed_on_caller else None
+        key = (route, write_generation, caller, arguments)
+        try:
+            hash(key)
+        except TypeError:
+            return endpoint(*args, **kwargs)
+
+        def run():
+            result = endpoint(**kwargs)
+            if isinstance(result, Response) and not isinstance(result, StreamingResponse):
+                return result, SharedResponse(result)
+            return result, None
+
+        (result, shared), flight, leader = flights.do(key, run)
+        if leader:
+            COALESCED_REQUESTS.inc(1, (route, "leader"))
+            COALESCED_FOLLOWERS.observe(flight.followers, (route,))
+            return result
+        COALESCED_REQUESTS.inc(1, (route, "follower"))
+        return shared.build() if shared is not None else result
+
+    # include_router re-creates each route from its endpoint; this lets that
+    # copy wrap the original function under its full path instead of twice.
+    wrapper.__coalesced__ = endpoint
+    return wrapper
+
+
+def generation_bumping(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                bump_generation()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                bump_generation()
+
+    wrapper.__coalesced__ = endpoint
+    return wrapper
+
+
+class CoalescedRoute(ProfiledRoute):
+    """Profiled route whose GET endpoints coalesce identical concurrent calls."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        endpoint = getattr(endpoint, "__coalesced__", endpoint)
+        if set(kwargs.get("methods") or ()) == {"GET"}:
+            if not inspect.iscoroutinefunction(endpoint):
+                endpoint = coalesced(endpoint, path)
+        else:
+            endpoint = generation_bumping(endpoint)
+        super().__init__(path, endpoint, **kwargs)
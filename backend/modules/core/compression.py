@@ -0,0 +1,191 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it; gzip otherwise. Only content types that start with an entry of
+``COMPRESSION_CONTENT_TYPES`` are compressed, and only when the body reaches
+``COMPRESSION_MINIMUM_SIZE``.
+
+A body sent in one message is compressed in one pass, and large ones are
+compressed in a worker thread so the event loop stays free. A streamed body
+(``more_body``) is compressed chunk by chunk with a flush after each one, so
+clients of export streams receive rows as they are produced.
+"""
+import time
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from modules import settings
+from modules.monitoring.metrics import registry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies above this are compressed off the event loop; zlib and brotli release the GIL.
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSION_BYTES = registry.counter(
+    "hims_http_compression_bytes_total",
+    "Response bytes before (in) and after (out) compression.",
+    ("encoding", "direction"),
+)
+COMPRESSION_RATIO = registry.histogram(
+    "hims_http_compression_ratio",
+    "Compressed size divided by original size per response.",
+    ("encoding",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0),
+)
+COMPRESSION_SECONDS = registry.histogram(
+    "hims_http_compression_cpu_seconds",
+    "CPU time spent compressing each response.",
+    ("encoding",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    encodings = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def negotiate(header: str) -> str | None:
+    """The available encoding with the highest q-value; brotli wins ties."""
+    accepted = accepted_encodings(header)
+    available = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        # An explicit entry, including q=0, overrides the wildcard.
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressible(content_type: str) -> bool:
+    return any(content_type.startswith(prefix) for prefix in settings.COMPRESSION_CONTENT_TYPES)
+
+
+class Compressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_time = 0.0
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, *, flush: bool = False, finish: bool = False) -> bytes:
+        started = time.thread_time()
+        if self.encoding == "br":
+            out = self._compressor.process(data)
+            if finish:
+                out += self._compressor.finish()
+            elif flush:
+                out += self._compressor.flush()
+        else:
+            out = self._compressor.compress(data)
+            if finish:
+                out += self._compressor.flush(zlib.Z_FINISH)
+            elif flush:
+                out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.cpu_time += time.thread_time() - started
+        self.bytes_in += len(data)
+        self.bytes_out += len(out)
+        return out
+
+    def record(self) -> None:
+        COMPRESSION_BYTES.inc(self.bytes_in, (self.encoding, "in"))
+        COMPRESSION_BYTES.inc(self.bytes_out, (self.encoding, "out"))
+        if self.bytes_in:
+            COMPRESSION_RATIO.observe(self.bytes_out / self.bytes_in, (self.encoding,))
+        COMPRESSION_SECONDS.observe(self.cpu_time, (self.encoding,))
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                length = headers.get("content-length")
+                passthrough = (
+                    message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or not compressible(headers.get("content-type", ""))
+                    or (length is not None and int(length) < settings.COMPRESSION_MINIMUM_SIZE)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Hold the start message until the first body chunk decides the outcome.
+                    start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressor = Compressor(encoding)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("accept-encoding")
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    if len(body) >= THREAD_THRESHOLD:
+                        body = await run_in_threadpool(compressor.compress, body, finish=True)
+                    else:
+                        body = compressor.compress(body, finish=True)
+                    headers["content-length"] = str(len(body))
+                    compressor.record()
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            chunk = compressor.compress(body, flush=more_body, finish=not more_body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            if not more_body:
+                compressor.record()
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,99 @@
+"""Sparse fieldsets and embedded relations for list and retrieve routes.
+
+Sparse fieldsets look like ``?fields=id,first_name``. ``field_selection(PublicModel)``
+builds a dependency that checks the requested names against the public model.
+Controllers pass the result to ``load_only_fields`` so unrequested columns are
+never read from the database, and ``json_response(..., fields=...)`` emits only
+those keys.
+
+Embedded relations look like ``?include=patient,notes``.
+``include_selection(INCLUDES)`` maps each requested relationship to the public
+model it is rendered with. ``include_relations`` batch-loads them with one
+``selectinload`` IN-query per relationship, however many rows are returned.
+Collections (an admission's notes) are capped at ``INCLUDE_COLLECTION_LIMIT``
+newest rows per parent; the nested list routes page through the rest.
+"""
+from typing import Annotated, Callable, Iterable
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import aliased, load_only, selectinload
+from sqlmodel import SQLModel
+
+from modules import settings
+from modules.core.responses import public_fields
+
+
+def field_selection(model: type[SQLModel]) -> Callable[..., tuple[str, ...] | None]:
+    allowed = public_fields(model)
+
+    def selected_fields(
+        fields: Annotated[str | None, Query(description=f"Comma-separated subset of: {', '.join(allowed)}")] = None,
+    ) -> tuple[str, ...] | None:
+        if not fields:
+            return None
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+        return names or None
+
+    return selected_fields
+
+
+def include_selection(relations: dict[str, type[SQLModel]]) -> Callable[..., dict[str, type[SQLModel]] | None]:
+    def selected_relations(
+        include: Annotated[str | None, Query(description=f"Comma-separated related resources to embed: {', '.join(relations)}")] = None,
+    ) -> dict[str, type[SQLModel]] | None:
+        if not include:
+            return None
+        names = list(dict.fromkeys(name.strip() for name in include.split(",") if name.strip()))
+        unknown = [name for name in names if name not in relations]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown include: {', '.join(unknown)}",
+            )
+        return {name: relations[name] for name in names} or None
+
+    return selected_relations
+
+
+def load_only_fields(
+        table: type[SQLModel],
+        fields: tuple[str, ...] | None,
+        include: Iterable[str] | None = None,
+    ) -> list:
+    if not fields:
+        return []
+    attributes = [getattr(table, name) for name in fields]
+    # Included relationships are joined on their local foreign keys, so those must be loaded too.
+    for name in include or ():
+        attributes.extend(getattr(table, column.key) for column in getattr(table, name).property.local_columns)
+    return [load_only(*attributes)]
+
+
+def capped(relationship, limit: int):
+    """Restrict a one-to-many relationship to the ``limit`` newest rows of each parent."""
+    target = relationship.property.mapper.class_
+    other = aliased(target)
+    newest = (
+        select(other.id)
+        .where(*(getattr(other, remote.key) == remote for _, remote in relationship.property.local_remote_pairs))
+        .order_by(other.id.desc())
+        .limit(limit)
+    )
+    return relationship.and_(target.id.in_(newest))
+
+
+def include_relations(table: type[SQLModel], include: Iterable[str] | None) -> list:
+    options = []
+    for name in include or ():
+        relationship = getattr(table, name)
+        if relationship.property.uselist:
+            relationship = capped(relationship, settings.INCLUDE_COLLECTION_LIMIT)
+        options.append(selectinload(relationship))
+    return options
@@ -0,0 +1,131 @@
+"""Hard deletion of old tombstones.
+
+Rows soft-deleted more than ``PURGE_RETENTION_DAYS`` ago are deleted for good,
+children before parents. A row is only purged once nothing references it any
+more, so a tombstoned patient stays until their admissions are gone as well.
+Each batch of ``PURGE_BATCH_SIZE`` ids is claimed and deleted in its own
+transaction, with a short pause in between so API writes get the database lock.
+
+The worker only runs between ``PURGE_QUIET_START_HOUR`` and
+``PURGE_QUIET_END_HOUR`` in the server's local time, and stops mid-pass once
+the window closes.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import Column, Engine, Table, delete, exists, select
+
+from modules import settings
+from modules.auth.models.auth_session import AuthSession
+from modules.auth.models.log import Log
+from modules.auth.models.staff import Staff
+from modules.core.worker import PeriodicWorker
+from modules.database.dialect import skip_locked
+from modules.database.engine import engine
+from modules.impatient.models.admission import Admission
+from modules.impatient.models.archive import admission_archive, note_archive
+from modules.impatient.models.note import Note
+from modules.impatient.models.room import Room
+from modules.monitoring.metrics import registry
+from modules.patient.models.archive import patient_archive
+from modules.patient.models.patient import Patient
+
+
+PURGED_ROWS = registry.counter(
+    "hims_purged_rows_total",
+    "Soft-deleted rows removed by the purge worker.",
+    ("table",),
+)
+
+note_table: Table = Note.__table__
+admission_table: Table = Admission.__table__
+
+# Tables in purge order, each with the columns whose rows keep a tombstone alive.
+PURGE_ORDER: list[tuple[Table, list[Column]]] = [
+    (note_table, []),
+    (admission_table, [note_table.c.admission_id]),
+    (Patient.__table__, [admission_table.c.patient_id]),
+    (Room.__table__, [admission_table.c.room_id]),
+    (Staff.__table__, [
+        admission_table.c.staff_id,
+        note_table.c.staff_id,
+        Log.__table__.c.staff_id,
+        AuthSession.__table__.c.staff_id,
+    ]),
+    (note_archive, []),
+    (admission_archive, [note_archive.c.admission_id]),
+    (patient_archive, [admission_archive.c.patient_id]),
+]
+
+
+def in_quiet_hours(moment: datetime) -> bool:
+    start, end = settings.PURGE_QUIET_START_HOUR, settings.PURGE_QUIET_END_HOUR
+    if start == end:
+        return True
+    if start < end:
+        return start <= moment.hour < end
+    return moment.hour >= start or moment.hour < end
+
+
+def purge_batch(bind: Engine, table: Table, references: list[Column], *, older_than: datetime, batch_size: int) -> int:
+    with bind.begin() as connection:
+        ids = connection.execute(skip_locked(
+            select(table.c.id)
+            .where(table.c.deleted_datetime < older_than)
+            .where(*(~exists().where(reference == table.c.id) for reference in references))
+            .order_by(table.c.id)
+            .limit(batch_size)
+        )).scalars().all()
+        if ids:
+            connection.execute(delete(table).where(table.c.id.in_(ids)))
+    PURGED_ROWS.inc(len(ids), (table.name,))
+    return len(ids)
+
+
+def purge_tombstones(
+        bind: Engine = engine,
+        *,
+        older_than: datetime,
+        batch_size: int = settings.PURGE_BATCH_SIZE,
+        keep_going: Callable[[], bool] = lambda: True,
+    ) -> int:
+    """Purge every table in order; ``keep_going`` is asked before each further batch."""
+    purged = 0
+    for table, references in PURGE_ORDER:
+        while True:
+            count = purge_batch(bind, table, references, older_than=older_than, batch_size=batch_size)
+            purged += count
+            if count < batch_size:
+                break
+            if not keep_going():
+                return purged
+    return purged
+
+
+class PurgeWorker(PeriodicWorker):
+    """Background thread that purges old tombstones during quiet hours."""
+
+    name = "hims-purge"
+
+    def __init__(self, bind: Engine = engine):
+        super().__init__()
+        self.bind = bind
+
+    @property
+    def interval(self) -> float:
+        return settings.PURGE_INTERVAL_SECONDS
+
+    def keep_going(self) -> bool:
+        # The pause between batches doubles as the check for stop().
+        if self._stop.wait(settings.PURGE_BATCH_PAUSE_SECONDS):
+            return False
+        return in_quiet_hours(datetime.now().astimezone())
+
+    def run_once(self) -> int:
+        if not in_quiet_hours(datetime.now().astimezone()):
+            return 0
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.PURGE_RETENTION_DAYS)
+        return purge_tombstones(self.bind, older_than=cutoff, keep_going=self.keep_going)
+
+
+purge_worker = PurgeWorker()
@@ -0,0 +1,62 @@
+"""Fast JSON responses for ORM rows.
+
+FastAPI validates a route's return value against ``response_model``, dumps
+the validated copy to Python objects and then encodes those with the stdlib
+``json`` module. Rows loaded through a table model already hold every public
+field with the right type. ``json_response`` therefore copies only the public
+model's fields out of each row and encodes them with ``pydantic_core.to_json``
+in one native pass. The output is byte-for-byte what FastAPI would produce.
+Routes keep ``response_model`` so the OpenAPI schema is unchanged.
+"""
+from functools import cache
+from typing import Any, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlmodel import SQLModel
+
+
+@cache
+def public_fields(model: type[SQLModel]) -> tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def public_dict(row: Any, names: Sequence[str]) -> dict[str, Any]:
+    # Loaded column values sit in the instance __dict__; reading them there skips
+    # the attribute instrumentation. Expired or deferred ones still go through getattr.
+    loaded = row.__dict__
+    return {name: loaded[name] if name in loaded else getattr(row, name) for name in names}
+
+
+def embedded(value: Any, model: type[SQLModel]) -> Any:
+    if value is None:
+        return None
+    names = public_fields(model)
+    if isinstance(value, list):
+        return [public_dict(row, names) for row in value]
+    return public_dict(value, names)
+
+
+def json_response(
+        model: type[SQLModel],
+        content: Any | Sequence[Any],
+        *,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        fields: Sequence[str] | None = None,
+        include: dict[str, type[SQLModel]] | None = None,
+    ) -> Response:
+    names = fields or public_fields(model)
+    if include:
+        def render(row):
+            return public_dict(row, names) | {
+                name: embedded(getattr(row, name), related) for name, related in include.items()
+            }
+    else:
+        def render(row):
+            return public_dict(row, names)
+    if isinstance(content, (list, tuple)):
+        payload = [render(row) for row in content]
+    else:
+        payload = render(content)
+    return Response(to_json(payload), status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,45 @@
+"""Soft deletes.
+
+Models that inherit ``SoftDeleteMixin`` are deleted by setting
+``deleted_datetime``. Every ORM query on every session then leaves tombstoned
+rows out, including ``session.get`` and relationship loads, unless it runs with
+``execution_options(include_deleted=True)``. Migration 6 adds partial indexes
+over live rows, so the extra predicate stays cheap. ``modules.core.purge``
+hard-deletes old tombstones later in small batches.
+
+Core statements on a connection (the archivers, migrations) are not filtered.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import TIMESTAMP, event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+from sqlmodel import Field, SQLModel
+
+
+class SoftDeleteMixin(SQLModel):
+    deleted_datetime: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True))
+
+
+def soft_delete(session: Session, instance: SoftDeleteMixin) -> None:
+    instance.deleted_datetime = datetime.now(timezone.utc)
+    session.add(instance)
+
+
+def soft_delete_models(base: type = SoftDeleteMixin) -> list[type[SoftDeleteMixin]]:
+    models = []
+    for subclass in base.__subclasses__():
+        if hasattr(subclass, "__table__"):
+            models.append(subclass)
+        models.extend(soft_delete_models(subclass))
+    return models
+
+
+@event.listens_for(Session, "do_orm_execute")
+def hide_deleted(state: ORMExecuteState) -> None:
+    if not state.is_select or state.is_column_load or state.execution_options.get("include_deleted", False):
+        return
+    # The mixin itself is not mapped, so each table model gets its own criteria.
+    state.statement = state.statement.options(*(
+        with_loader_criteria(model, model.deleted_datetime.is_(None), include_aliases=True)
+        for model in soft_delete_models()
+    ))
@@ -0,0 +1,104 @@
+"""Hot and cold tiers of the same table.
+
+An archive table mirrors its source's columns and adds ``archived_datetime``.
+It has no foreign keys, so archived rows can outlive what they referenced, and
+it carries its own indexes. ``move_rows`` copies matching rows and deletes them
+from the source on the caller's connection, so the archiver moves them in the
+same transaction. ``restore_rows`` moves rows back the same way.
+
+``read_tiers`` serves list endpoints. Normally only the hot table is read, and
+the archive is consulted only when a filter has no hot matches at all. With
+``include_archived`` both tiers are read and merged in id order. Archived rows
+come back as detached model instances without embedded relations.
+"""
+import heapq
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import TIMESTAMP, Column, Connection, MetaData, Table, delete, func, insert, literal, select
+from sqlmodel import Session, SQLModel
+from sqlmodel.sql.expression import SelectOfScalar
+
+
+archive_metadata = MetaData()
+
+
+def archive_table(source: Table, name: str, *, indexes: tuple[str, ...] = ()) -> Table:
+    return Table(
+        name,
+        archive_metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+                index=column.name in indexes,
+            )
+            for column in source.columns
+        ),
+        Column("archived_datetime", TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+def move_rows(connection: Connection, source: Table, archive: Table, condition, *, archived: datetime) -> int:
+    names = [column.name for column in source.columns]
+    connection.execute(insert(archive).from_select(
+        [*names, "archived_datetime"],
+        select(*source.c, literal(archived, TIMESTAMP(timezone=True))).where(condition),
+    ))
+    return connection.execute(delete(source).where(condition)).rowcount
+
+
+def restore_rows(connection: Connection, archive: Table, source: Table, condition) -> int:
+    names = [column.name for column in source.columns]
+    connection.execute(insert(source).from_select(
+        names,
+        select(*(archive.c[name] for name in names)).where(condition),
+    ))
+    return connection.execute(delete(archive).where(condition)).rowcount
+
+
+def archived_rows(model: type[SQLModel], archive: Table, where: list):
+    names = [column.name for column in model.__table__.columns]
+    if "deleted_datetime" in archive.c:
+        # Soft-deleted rows are archived along with their patient but stay hidden.
+        where = [*where, archive.c.deleted_datetime.is_(None)]
+    return select(*(archive.c[name] for name in names)).where(*where).order_by(archive.c.id)
+
+
+def read_tiers(
+        session: Session,
+        *,
+        model: type[SQLModel],
+        archive: Table,
+        query: SelectOfScalar,
+        where: Callable[[object], list],
+        offset: int | None,
+        limit: int | None,
+        include_archived: bool = False,
+    ) -> list:
+    """Run ``query`` (hot tier, already filtered and paged) and add archived rows as needed.
+
+    ``where(columns)`` returns the filter clauses for either ``model`` or an
+    archive table's ``c``.
+    """
+    if not include_archived:
+        rows = session.exec(query).all()
+        if rows:
+            return rows
+        if offset and session.exec(select(func.count()).select_from(model).where(*where(model))).one():
+            return rows
+        cold = archived_rows(model, archive, where(archive.c)).offset(offset).limit(limit)
+        return [model(**row) for row in session.execute(cold).mappings()]
+
+    # Both tiers: take enough of each to fill the page, then merge by id.
+    window = (offset or 0) + limit if limit is not None else None
+    hot = session.exec(query.order_by(None).order_by(model.id).offset(None).limit(window)).all()
+    cold = [
+        model(**row)
+        for row in session.execute(archived_rows(model, archive, where(archive.c)).limit(window)).mappings()
+    ]
+    merged = list(heapq.merge(hot, cold, key=lambda row: row.id))
+    start = offset or 0
+    return merged[start:start + limit] if limit is not None else merged[start:]
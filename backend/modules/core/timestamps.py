@@ -0,0 +1,28 @@
+"""``updated_datetime`` maintenance.
+
+The models declare ``server_onupdate=CURRENT_TIMESTAMP``, but that only tells
+SQLAlchemy the database sets the column. SQLite has no such trigger, so the
+column kept its insert time. This hook sets ``updated_datetime`` whenever the
+ORM flushes an UPDATE with real column changes, for every model that has the
+column. Soft deletes count as updates, so ``updated_datetime__gt`` polling sees
+them.
+
+Core ``UPDATE`` statements (migration backfills, archivers) bypass the ORM and
+are not stamped.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, object_session
+from sqlmodel import SQLModel
+
+
+@event.listens_for(SQLModel, "before_update", propagate=True)
+def touch_updated_datetime(mapper: Mapper, connection, target: SQLModel) -> None:
+    if "updated_datetime" not in mapper.columns:
+        return
+    # before_update also runs for rows that are dirty without net column changes.
+    session = object_session(target)
+    if session is None or not session.is_modified(target, include_collections=False):
+        return
+    target.updated_datetime = datetime.now(timezone.utc)
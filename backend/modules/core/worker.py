@@ -0,0 +1,58 @@
+"""Background maintenance threads.
+
+A ``PeriodicWorker`` calls ``run_once`` every ``interval`` seconds on a daemon
+thread until stopped. Every worker process runs its own copy, so ``run_once``
+must be safe to run concurrently: the archivers and purgers work in short
+batches claimed with ``SKIP LOCKED``.
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicWorker(ABC):
+    name = "hims-worker"
+
+    def __init__(self):
+        self.last_run_datetime: datetime | None = None
+        self.last_result = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    @abstractmethod
+    def interval(self) -> float:
+        """Seconds between passes; read before each one, so settings can change it."""
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    @abstractmethod
+    def run_once(self) -> int:
+        """Do one pass and return how many rows it handled."""
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.last_result = self.run_once()
+                self.last_run_datetime = datetime.now(timezone.utc)
+            except Exception:
+                logger.exception("%s pass failed", self.name)
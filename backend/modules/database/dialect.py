@@ -0,0 +1,87 @@
+"""Dialect-aware helpers for features only some databases have.
+
+Each helper does the best thing the connected database supports, so
+controllers and scripts do not need to branch on the dialect:
+
+- ``skip_locked`` claims rows with ``FOR UPDATE SKIP LOCKED`` on PostgreSQL,
+  so concurrent workers take disjoint batches. SQLite has a single writer and
+  leaves the clause out.
+- ``bulk_insert`` streams rows with ``COPY ... FROM STDIN`` when the engine
+  runs on psycopg 3, and falls back to an executemany ``INSERT`` elsewhere.
+- ``advisory_lock`` takes a PostgreSQL lock held until the transaction ends,
+  so transactions that take it commit one at a time. SQLite already allows
+  only one writer.
+- ``upsert`` inserts a row or updates it in place on a primary-key conflict,
+  with ``ON CONFLICT DO UPDATE`` on both SQLite and PostgreSQL.
+- ``sync_sequence`` moves a PostgreSQL serial sequence past ids that were
+  inserted explicitly. SQLite derives the next rowid from the table.
+"""
+from sqlalchemy import Connection, Select, Table, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+
+def is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def skip_locked(statement: Select) -> Select:
+    return statement.with_for_update(skip_locked=True)
+
+
+def copy_supported(connection: Connection) -> bool:
+    return (
+        psycopg is not None
+        and is_postgresql(connection)
+        and isinstance(connection.connection.driver_connection, psycopg.Connection)
+    )
+
+
+def bulk_insert(connection: Connection, table: Table, rows: list[dict]) -> None:
+    if not rows:
+        return
+    if not copy_supported(connection):
+        connection.execute(insert(table), rows)
+        return
+    columns = list(rows[0])
+    # COPY skips SQLAlchemy's type processing, e.g. enums stored by name.
+    processors = [table.c[name].type.bind_processor(connection.dialect) for name in columns]
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    with connection.connection.driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row([
+                processor(row[name]) if processor is not None else row[name]
+                for name, processor in zip(columns, processors)
+            ])
+
+
+def sync_sequence(connection: Connection, table: Table, column: str = "id") -> None:
+    if not is_postgresql(connection):
+        return
+    highest = connection.execute(select(func.max(table.c[column]))).scalar()
+    if highest is None:
+        return
+    connection.execute(
+        text("SELECT setval(pg_get_serial_sequence(:table, :column), :value)"),
+        {"table": table.name, "column": column, "value": highest},
+    )
+
+
+def advisory_lock(connection: Connection, key: int) -> None:
+    if not is_postgresql(connection):
+        return
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+
+
+def upsert(connection: Connection, table: Table, values: dict) -> None:
+    dialect_insert = postgresql.insert if is_postgresql(connection) else sqlite.insert
+    keys = [column.name for column in table.primary_key.columns]
+    statement = dialect_insert(table).values(values)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={name: value for name, value in values.items() if name not in keys},
+    ))
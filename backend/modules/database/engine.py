@@ -1,12 +1,46 @@
+import itertools
+
+from sqlalchemy import Engine, make_url
 from sqlmodel import SQLModel, create_engine
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+from modules import settings
+
+
+def engine_options(url: str) -> dict:
+    """Pool settings for server databases; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, echo=settings.SQL_ECHO, **engine_options(settings.DATABASE_URL))
+
+# Engines that serve GET requests, e.g. ``sqlite:///file:database.db?mode=ro&uri=true``
+# or a replica's URL. Without any, reads go to the writer.
+read_engines = [
+    create_engine(url, echo=settings.SQL_ECHO, **engine_options(url))
+    for url in settings.DATABASE_READ_URLS
+]
+_reader_turns = itertools.count()
 
-engine = create_engine(sqlite_url, echo=True)
 
+def read_engine() -> Engine:
+    if not read_engines:
+        return engine
+    return read_engines[next(_reader_turns) % len(read_engines)]
 
-def create_db_and_tables():
+
+def all_engines() -> list[Engine]:
+    return [engine, *read_engines]
+
+
+def create_db_and_tables(bind: Engine = engine):
+    from modules.auth.models.auth_session import AuthSession
     from modules.auth.models.log import Log
     from modules.auth.models.staff import Staff
     from modules.impatient.models.admission import Admission
@@ -14,4 +48,12 @@ def create_db_and_tables():
     from modules.impatient.models.room import Room
     from modules.patient.models.patient import Patient
     
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    SQLModel.metadata.create_all(bind)
+
+
+def warm_up_engine(bind: Engine = engine):
+    with bind.connect() as connection:
+        if bind is engine and read_engines and bind.dialect.name == "sqlite":
+            # WAL lets read-only connections read while the writer commits.
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        connection.exec_driver_sql("SELECT 1")
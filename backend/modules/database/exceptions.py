@@ -0,0 +1,2 @@
+class SchemaOutOfDate(Exception):
+    ...
@@ -0,0 +1,323 @@
+"""Versioned schema migrations.
+
+Run ``python -m modules.database.migrations upgrade`` from the ``backend``
+directory to bring a database up to date. The API itself only calls
+``check_schema_version`` on startup, so workers never race on DDL.
+
+Every helper in this module is idempotent: the baseline migration builds the
+current models with ``create_all``, so later migrations must tolerate finding
+their columns and indexes already in place on a fresh database.
+"""
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import Engine, Column, Integer, String, Table, MetaData, TIMESTAMP, inspect, select, func, insert, text
+
+from modules.database.engine import engine, create_db_and_tables
+from modules.database.exceptions import SchemaOutOfDate
+
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_datetime", TIMESTAMP(timezone=True), nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Engine], None]
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, name: str):
+    def decorator(upgrade: Callable[[Engine], None]):
+        if any(existing.version == version for existing in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append(Migration(version=version, name=name, upgrade=upgrade))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return upgrade
+    return decorator
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current_version(bind: Engine = engine) -> int:
+    if not inspect(bind).has_table(schema_version.name):
+        return 0
+    with bind.connect() as connection:
+        return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def check_schema_version(bind: Engine = engine) -> int:
+    """Fail fast when the database is behind the code; never runs DDL."""
+    version = current_version(bind)
+    if version < latest_version():
+        raise SchemaOutOfDate(
+            f"Database schema is at version {version}, expected {latest_version()}. "
+            "Run `python -m modules.database.migrations upgrade` from the backend directory."
+        )
+    return version
+
+
+def upgrade(bind: Engine = engine, target: int | None = None) -> list[Migration]:
+    schema_metadata.create_all(bind)
+    version = current_version(bind)
+    applied = []
+    for pending in MIGRATIONS:
+        if pending.version <= version or (target is not None and pending.version > target):
+            continue
+        pending.upgrade(bind)
+        with bind.begin() as connection:
+            connection.execute(insert(schema_version).values(
+                version=pending.version,
+                name=pending.name,
+                applied_datetime=datetime.now(timezone.utc),
+            ))
+        applied.append(pending)
+    return applied
+
+
+def add_column(bind: Engine, table: str, column: str, ddl: str) -> None:
+    columns = {existing["name"] for existing in inspect(bind).get_columns(table)}
+    if column in columns:
+        return
+    with bind.begin() as connection:
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def create_index(
+        bind: Engine,
+        name: str,
+        table: str,
+        columns: list[str],
+        *,
+        unique: bool = False,
+        where: str | None = None,
+        using: str | None = None,
+    ) -> None:
+    method = f" USING {using}" if using is not None else ""
+    statement = f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table}{method} ({', '.join(columns)})"
+    if where is not None:
+        statement += f" WHERE {where}"
+    with bind.begin() as connection:
+        connection.execute(text(statement))
+
+
+def backfill(
+        bind: Engine,
+        table: str,
+        assignments: str,
+        *,
+        where: str = "1 = 1",
+        batch_size: int = 1000,
+        **params,
+    ) -> int:
+    """Run ``UPDATE table SET assignments`` in short primary-key ranges.
+
+    Each range commits on its own, so writers are only ever blocked for one
+    batch and a large table can be backfilled while the API is serving.
+    """
+    with bind.connect() as connection:
+        low, high = connection.execute(text(f"SELECT MIN(id), MAX(id) FROM {table}")).one()
+    if low is None:
+        return 0
+
+    updated = 0
+    start = low
+    while start <= high:
+        with bind.begin() as connection:
+            result = connection.execute(
+                text(f"UPDATE {table} SET {assignments} WHERE id >= :_start AND id < :_end AND ({where})"),
+                {"_start": start, "_end": start + batch_size, **params},
+            )
+            updated += result.rowcount
+        start += batch_size
+    return updated
+
+
+@migration(1, "initial schema")
+def initial_schema(bind: Engine) -> None:
+    create_db_and_tables(bind)
+
+
+@migration(2, "server-side auth sessions")
+def auth_sessions(bind: Engine) -> None:
+    from modules.auth.models.auth_session import AuthSession
+
+    AuthSession.__table__.create(bind, checkfirst=True)
+
+
+# Columns searched with ``ILIKE '%...%'``; pg_trgm GIN indexes serve those on PostgreSQL.
+TRIGRAM_COLUMNS = [
+    ("patient", "first_name"),
+    ("patient", "last_name"),
+    ("patient", "email"),
+    ("patient", "phone"),
+    ("staff", "first_name"),
+    ("staff", "last_name"),
+    ("room", "name"),
+    ("note", "text"),
+    ("log", "text"),
+]
+
+
+@migration(3, "partial and trigram indexes")
+def partial_and_trigram_indexes(bind: Engine) -> None:
+    create_index(bind, "ix_auth_session_live_staff", "auth_session", ["staff_id"], where="revoked_datetime IS NULL")
+    create_index(bind, "ix_auth_session_revoked", "auth_session", ["revoked_datetime"], where="revoked_datetime IS NOT NULL")
+    create_index(bind, "ix_patient_admitted", "patient", ["id"], where="status = 'Admitted'")
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table, column in TRIGRAM_COLUMNS:
+        create_index(bind, f"ix_{table}_{column}_trgm", table, [f"{column} gin_trgm_ops"], using="gin")
+
+
+@migration(4, "log archival")
+def log_archival(bind: Engine) -> None:
+    create_index(bind, "ix_log_created_datetime", "log", ["created_datetime"])
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            return
+    # auto_vacuum only changes on a VACUUM, which cannot run inside a transaction.
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.exec_driver_sql("VACUUM")
+
+
+
+@migration(5, "cold patient archive")
+def cold_patient_archive(bind: Engine) -> None:
+    from modules.core.tiers import archive_metadata
+    from modules.impatient.models.archive import admission_archive, note_archive
+    from modules.patient.models.archive import patient_archive
+
+    archive_metadata.create_all(bind, tables=[patient_archive, admission_archive, note_archive])
+    create_index(bind, "ix_patient_discharged_updated", "patient", ["updated_datetime"], where="status = 'Discharged'")
+
+
+SOFT_DELETE_TABLES = ["patient", "room", "admission", "note", "staff"]
+# Referencing columns that had no index, so deletes and the purge's reference checks scanned.
+FOREIGN_KEY_INDEXES = [
+    ("admission", "patient_id"),
+    ("admission", "room_id"),
+    ("admission", "staff_id"),
+    ("note", "admission_id"),
+    ("note", "staff_id"),
+    ("log", "staff_id"),
+]
+
+
+@migration(6, "soft deletes")
+def soft_deletes(bind: Engine) -> None:
+    ddl = "TIMESTAMP WITH TIME ZONE" if bind.dialect.name == "postgresql" else "TIMESTAMP"
+    for table in [*SOFT_DELETE_TABLES, "patient_archive", "admission_archive", "note_archive"]:
+        add_column(bind, table, "deleted_datetime", ddl)
+    for table in SOFT_DELETE_TABLES:
+        create_index(bind, f"ix_{table}_live", table, ["id"], where="deleted_datetime IS NULL")
+        create_index(bind, f"ix_{table}_deleted", table, ["deleted_datetime"], where="deleted_datetime IS NOT NULL")
+    for table, column in FOREIGN_KEY_INDEXES:
+        create_index(bind, f"ix_{table}_{column}", table, [column])
+    # A deleted staff member's username and email can be registered again.
+    for column in ["username", "email"]:
+        with bind.begin() as connection:
+            connection.execute(text(f"DROP INDEX IF EXISTS ix_staff_{column}"))
+        create_index(bind, f"ix_staff_{column}", "staff", [column])
+        create_index(bind, f"ix_staff_{column}_live", "staff", [column], unique=True, where="deleted_datetime IS NULL")
+
+
+@migration(7, "change log")
+def change_log(bind: Engine) -> None:
+    from modules.sync.models.change import Change
+
+    Change.__table__.create(bind, checkfirst=True)
+    create_index(bind, "ix_change_log_table_name_seq", "change_log", ["table_name", "seq"])
+
+
+@migration(8, "updated_datetime indexes")
+def updated_datetime_indexes(bind: Engine) -> None:
+    for table in ["patient", "room", "admission", "note", "staff", "log"]:
+        create_index(bind, f"ix_{table}_updated_datetime", table, ["updated_datetime"])
+
+
+@migration(9, "shared login rate limits")
+def shared_login_rate_limits(bind: Engine) -> None:
+    from modules.auth.models.rate_limit import RateLimitBucket, RateLimitFailure
+
+    RateLimitBucket.__table__.create(bind, checkfirst=True)
+    RateLimitFailure.__table__.create(bind, checkfirst=True)
+
+
+@migration(10, "log archive timestamps")
+def log_archive_timestamps(bind: Engine) -> None:
+    from modules.auth.controllers.log_archive import ARCHIVE_PREFIX
+
+    # Month tables are archive tiers now and record when rows moved in.
+    ddl = "TIMESTAMP WITH TIME ZONE" if bind.dialect.name == "postgresql" else "TIMESTAMP"
+    for table in inspect(bind).get_table_names():
+        if table.startswith(ARCHIVE_PREFIX):
+            add_column(bind, table, "archived_datetime", ddl)
+            backfill(bind, table, "archived_datetime = created_datetime", where="archived_datetime IS NULL")
+
+
+@migration(11, "patient discharge time")
+def patient_discharge_time(bind: Engine) -> None:
+    ddl = "TIMESTAMP WITH TIME ZONE" if bind.dialect.name == "postgresql" else "TIMESTAMP"
+    for table in ["patient", "patient_archive"]:
+        add_column(bind, table, "discharged_datetime", ddl)
+        # The last update is the best record of when existing patients left.
+        backfill(
+            bind, table, "discharged_datetime = updated_datetime",
+            where="status = 'Discharged' AND discharged_datetime IS NULL",
+        )
+    with bind.begin() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS ix_patient_discharged_updated"))
+    create_index(bind, "ix_patient_discharged", "patient", ["discharged_datetime"], where="status = 'Discharged'")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m modules.database.migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = subparsers.add_parser("upgrade", help="apply pending migrations")
+    upgrade_parser.add_argument("--target", type=int, default=None)
+    subparsers.add_parser("current", help="print the database schema version")
+    subparsers.add_parser("check", help="exit non-zero if migrations are pending")
+    subparsers.add_parser("history", help="list known migrations")
+    args = parser.parse_args(argv)
+
+    if args.command == "upgrade":
+        for applied in upgrade(engine, target=args.target):
+            print(f"Applied {applied.version}: {applied.name}")
+        print(f"Schema version {current_version(engine)}")
+    elif args.command == "current":
+        print(current_version(engine))
+    elif args.command == "check":
+        try:
+            print(f"Schema version {check_schema_version(engine)} is up to date")
+        except SchemaOutOfDate as e:
+            raise SystemExit(str(e))
+    elif args.command == "history":
+        version = current_version(engine)
+        for known in MIGRATIONS:
+            marker = "x" if known.version <= version else " "
+            print(f"[{marker}] {known.version}: {known.name}")
+
+
+if __name__ == "__main__":
+    main()
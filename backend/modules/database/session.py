@@ -1,12 +1,89 @@
+import math
+import time
+from contextvars import ContextVar
 from sqlmodel import Session
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy import Engine
 from typing import Annotated
 
-from modules.database.engine import engine
+from modules import settings
+from modules.database.engine import engine, read_engine
+# Registers the ORM hook that stamps updated_datetime on every UPDATE.
+import modules.core.timestamps  # noqa: F401
 
-def get_session():
-    with Session(engine) as session:
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+LAST_WRITE_HEADER = "x-last-write"
+LAST_WRITE_COOKIE = "last_write"
+
+# Set by the batch route while it runs its write sub-requests, so they all use
+# the batch's session instead of opening one each.
+shared_session: ContextVar[Session | None] = ContextVar("shared_session", default=None)
+
+
+def last_write(request: Request) -> float | None:
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client reports a write recent enough that replicas may lag it."""
+    written = last_write(request)
+    return written is not None and time.time() - written < settings.READ_YOUR_WRITES_SECONDS
+
+
+class LastWriteMiddleware:
+    """Tell the client when it last wrote, so its next reads can find the write.
+
+    Every non-GET response carries the write time both as an ``X-Last-Write``
+    header, for API clients to echo back, and as a ``last_write`` cookie. Any
+    worker can then keep that client's reads on the writer for
+    ``READ_YOUR_WRITES_SECONDS``, without sharing state between workers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_last_write(message):
+            if message["type"] == "http.response.start":
+                written = f"{time.time():.3f}".encode()
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (LAST_WRITE_HEADER.encode(), written),
+                    (b"set-cookie", b"%s=%s; Max-Age=%d; Path=/; HttpOnly; SameSite=lax" % (
+                        LAST_WRITE_COOKIE.encode(), written, math.ceil(settings.READ_YOUR_WRITES_SECONDS),
+                    )),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_last_write)
+
+
+def session_engine(request: Request) -> Engine:
+    """The engine a request reads and writes through.
+
+    Reads go to a replica unless the client wrote recently; everything else
+    goes to the writer.
+    """
+    reading = request.method in READ_METHODS
+    return read_engine() if reading and not wrote_recently(request) else engine
+
+
+def get_session(request: Request):
+    session = shared_session.get()
+    if session is not None:
         yield session
-        
+        return
+    with Session(session_engine(request)) as session:
+        yield session
+
 
-SessionDep = Annotated[Session, Depends(get_session)]
\ No newline at end of file
+SessionDep = Annotated[Session, Depends(get_session)]
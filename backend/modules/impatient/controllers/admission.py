@@ -1,12 +1,17 @@
-from sqlmodel import select
+from sqlmodel import select, func
 from datetime import datetime
+from typing import Iterable
 
 from modules.impatient.models.admission import Admission, AdmissionCreate, AdmissionUpdate
 from modules.database.session import SessionDep
+from modules.core.soft_delete import soft_delete
+from modules.core.tiers import read_tiers
+from modules.impatient.models.archive import admission_archive
+from modules.core.fields import load_only_fields, include_relations
 from modules.impatient.models.note import Note
 from modules.impatient.models.room import Room
 from modules.impatient.controllers.room import get_room_by_id
-from modules.patient.controllers.patient import get_patient_by_id, update_patient
+from modules.patient.controllers.patient import get_patient_by_id, restore_archived_patient, update_patient
 from modules.patient.models.patient import Patient, PatientStatus, PatientUpdate
 from modules.impatient.controllers.exceptions import RoomCapacityOverFlow, RoomDoesNotExist, PatientDoesNotExist, PatientAlreadyInRoom
 
@@ -28,34 +33,55 @@ def get_admission_all(
         updated_datetime__lt: datetime | None = None,
         updated_datetime__gte: datetime | None = None,
         updated_datetime__lte: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        include: Iterable[str] | None = None,
+        include_archived: bool = False,
     ) -> list[Admission]:
-    query = select(Admission).offset(offset).limit(limit)
-    filters = [
-        Admission.patient_id == patient_id if patient_id is not None else None,
-        Admission.room_id == room_id if room_id is not None else None,
-        Admission.staff_id == staff_id if staff_id is not None else None,
-        Admission.created_datetime == created_datetime if created_datetime is not None else None,
-        Admission.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
-        Admission.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
-        Admission.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
-        Admission.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
-        Admission.updated_datetime == updated_datetime if updated_datetime is not None else None,
-        Admission.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
-        Admission.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
-        Admission.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
-        Admission.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
-    ]
-    
-    filters = [filter for filter in filters if filter is not None]
-    
-    if filters:
-        query = query.where(*filters)
-    
-    return session.exec(query).all()
+    query = select(Admission).options(
+        *load_only_fields(Admission, fields, include),
+        *include_relations(Admission, include),
+    ).offset(offset).limit(limit)
+    def filters(columns) -> list:
+        clauses = [
+            columns.patient_id == patient_id if patient_id is not None else None,
+            columns.room_id == room_id if room_id is not None else None,
+            columns.staff_id == staff_id if staff_id is not None else None,
+            columns.created_datetime == created_datetime if created_datetime is not None else None,
+            columns.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
+            columns.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
+            columns.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
+            columns.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
+            columns.updated_datetime == updated_datetime if updated_datetime is not None else None,
+            columns.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
+            columns.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
+            columns.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
+            columns.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
+        ]
+        return [clause for clause in clauses if clause is not None]
+
+    return read_tiers(
+        session,
+        model=Admission,
+        archive=admission_archive,
+        query=query.where(*filters(Admission)),
+        where=filters,
+        offset=offset,
+        limit=limit,
+        include_archived=include_archived,
+    )
 
 
-def get_admission_by_id( *, session: SessionDep, id: int) -> Admission | None:
-    return session.get(Admission, id)
+def get_admission_by_id(
+        *,
+        session: SessionDep,
+        id: int,
+        fields: tuple[str, ...] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> Admission | None:
+    return session.get(Admission, id, options=[
+        *load_only_fields(Admission, fields, include),
+        *include_relations(Admission, include),
+    ])
 
 
 def create_admission( *, staff_id: int, admission: AdmissionCreate, session: SessionDep) -> Admission | None:
@@ -63,25 +89,26 @@ def create_admission( *, staff_id: int, admission: AdmissionCreate, session: Ses
     if room is None:
         raise RoomDoesNotExist
     patient = get_patient_by_id(session=session, id=admission.patient_id)
+    if patient is None:
+        patient = restore_archived_patient(session=session, id=admission.patient_id)
     if patient is None:
         raise PatientDoesNotExist
     
-    patient_in_room_query = select(Patient, Admission, Room).where(
-        Patient.id == admission.patient_id, 
-        Room.id == room.id
+    patient_in_room_query = select(Admission.id).where(
+        Admission.patient_id == patient.id, 
+        Admission.room_id == room.id
     )
     
-    patient_is_in_room = session.exec(patient_in_room_query).all()
+    patient_is_in_room = session.exec(patient_in_room_query).first()
     
-    if patient_is_in_room:
+    if patient_is_in_room is not None:
         raise PatientAlreadyInRoom
     
-    patient_count_query = select(Patient, Admission, Room).where(
-        Patient.id == Admission.patient_id, 
-        Room.id == room.id, 
+    patient_count_query = select(func.count(Admission.id)).join(Patient, Patient.id == Admission.patient_id).where(
+        Admission.room_id == room.id, 
         Patient.status == PatientStatus.Admitted
     )
-    patient_count = len(session.exec(patient_count_query).all())
+    patient_count = session.exec(patient_count_query).one()
     if patient_count + 1 > room.maximum_capacity:
         raise RoomCapacityOverFlow
     
@@ -98,12 +125,13 @@ def get_admission_notes(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Note] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None) -> list[Note] | None:
     
     db_admission = session.get(Admission, id)
     if not db_admission:
         return None
-    query = select(Note).where(Note.admission_id == db_admission.id).offset(offset).limit(limit)
+    query = select(Note).options(*load_only_fields(Note, fields)).where(Note.admission_id == db_admission.id).offset(offset).limit(limit)
 
     return session.exec(query).all()
 
@@ -127,6 +155,6 @@ def delete_admission(*, id: int, session: SessionDep) -> bool:
     
     update_patient(id=db_admission.patient_id, session=session, patient=PatientUpdate(status=PatientStatus.Discharged))
     
-    session.delete(db_admission)
+    soft_delete(session, db_admission)
     session.commit()
     return True
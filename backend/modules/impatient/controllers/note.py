@@ -1,8 +1,13 @@
 from sqlmodel import select
 from datetime import datetime
+from typing import Iterable
 
 from modules.impatient.models.note import Note, NoteCreate, NoteUpdate
 from modules.database.session import SessionDep
+from modules.core.soft_delete import soft_delete
+from modules.core.tiers import read_tiers
+from modules.impatient.models.archive import note_archive
+from modules.core.fields import load_only_fields, include_relations
 
 
 def get_note_all(
@@ -23,34 +28,55 @@ def get_note_all(
         updated_datetime__lt: datetime | None = None,
         updated_datetime__gte: datetime | None = None,
         updated_datetime__lte: datetime | None = None,
+        fields: tuple[str, ...] | None = None,
+        include: Iterable[str] | None = None,
+        include_archived: bool = False,
     ) -> list[Note]:
-    query = select(Note).offset(offset).limit(limit)
-    filters = [
-        Note.admission_id == admission_id if admission_id is not None else None,
-        Note.staff_id == staff_id if staff_id is not None else None,
-        Note.text.ilike(f"%{text}%") if text is not None else None,
-        Note.created_datetime == created_datetime if created_datetime is not None else None,
-        Note.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
-        Note.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
-        Note.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
-        Note.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
-        Note.updated_datetime == updated_datetime if updated_datetime is not None else None,
-        Note.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
-        Note.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
-        Note.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
-        Note.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
-    ]
-    
-    filters = [filter for filter in filters if filter is not None]
-    
-    if filters:
-        query = query.where(*filters)
-    
-    return session.exec(query).all()
+    query = select(Note).options(
+        *load_only_fields(Note, fields, include),
+        *include_relations(Note, include),
+    ).offset(offset).limit(limit)
+    def filters(columns) -> list:
+        clauses = [
+            columns.admission_id == admission_id if admission_id is not None else None,
+            columns.staff_id == staff_id if staff_id is not None else None,
+            columns.text.ilike(f"%{text}%") if text is not None else None,
+            columns.created_datetime == created_datetime if created_datetime is not None else None,
+            columns.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
+            columns.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
+            columns.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
+            columns.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
+            columns.updated_datetime == updated_datetime if updated_datetime is not None else None,
+            columns.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
+            columns.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
+            columns.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
+            columns.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
+        ]
+        return [clause for clause in clauses if clause is not None]
 
+    return read_tiers(
+        session,
+        model=Note,
+        archive=note_archive,
+        query=query.where(*filters(Note)),
+        where=filters,
+        offset=offset,
+        limit=limit,
+        include_archived=include_archived,
+    )
 
-def get_note_by_id( *, session: SessionDep, id: int) -> Note | None:
-    return session.get(Note, id)
+
+def get_note_by_id(
+        *,
+        session: SessionDep,
+        id: int,
+        fields: tuple[str, ...] | None = None,
+        include: Iterable[str] | None = None,
+    ) -> Note | None:
+    return session.get(Note, id, options=[
+        *load_only_fields(Note, fields, include),
+        *include_relations(Note, include),
+    ])
 
 
 def create_note( *, staff_id: int, note: NoteCreate, session: SessionDep) -> Note | None:
@@ -77,6 +103,6 @@ def delete_note(*, id: int, session: SessionDep) -> bool:
     db_note = session.get(Note, id)
     if db_note is None:
         return False
-    session.delete(db_note)
+    soft_delete(session, db_note)
     session.commit()
     return True
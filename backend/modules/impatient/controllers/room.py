@@ -3,6 +3,8 @@ from datetime import datetime
 
 from modules.impatient.models.room import Room, RoomCreate, RoomUpdate
 from modules.database.session import SessionDep
+from modules.core.soft_delete import soft_delete
+from modules.core.fields import load_only_fields
 from modules.impatient.models.admission import Admission
 
 def get_room_all(
@@ -26,8 +28,9 @@ def get_room_all(
         updated_datetime__lte: datetime | None = None,
         offset: int | None = None,
         limit: int | None = None,
+        fields: tuple[str, ...] | None = None,
     ) -> list[Room]:
-    query = select(Room).offset(offset).limit(limit)
+    query = select(Room).options(*load_only_fields(Room, fields)).offset(offset).limit(limit)
     filters = [
         Room.name.ilike(f"%{name}%") if name is not None else None,
         Room.maximum_capacity == maximum_capacity if maximum_capacity is not None else None,
@@ -55,20 +58,21 @@ def get_room_all(
     return session.exec(query).all()
 
 
-def get_room_by_id( *, session: SessionDep, id: int) -> Room | None:
-    return session.get(Room, id)
+def get_room_by_id( *, session: SessionDep, id: int, fields: tuple[str, ...] | None = None) -> Room | None:
+    return session.get(Room, id, options=load_only_fields(Room, fields))
 
 
 def get_room_admissions(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Admission] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None) -> list[Admission] | None:
     
     db_room = session.get(Room, id)
     if not db_room:
         return None
-    query = select(Admission).where(Admission.room_id == db_room.id).offset(offset).limit(limit)
+    query = select(Admission).options(*load_only_fields(Admission, fields)).where(Admission.room_id == db_room.id).offset(offset).limit(limit)
 
     return session.exec(query).all()
 
@@ -97,6 +101,6 @@ def delete_room(*, id: int, session: SessionDep) -> bool:
     db_room = session.get(Room, id)
     if db_room is None:
         return False
-    session.delete(db_room)
+    soft_delete(session, db_room)
     session.commit()
     return True
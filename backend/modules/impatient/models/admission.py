@@ -1,14 +1,22 @@
 from datetime import datetime, timezone
-from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
+from typing import TYPE_CHECKING
+from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text, Relationship
+from modules.core.soft_delete import SoftDeleteMixin
+
+if TYPE_CHECKING:
+    from modules.auth.models.staff import Staff
+    from modules.impatient.models.note import Note
+    from modules.impatient.models.room import Room
+    from modules.patient.models.patient import Patient
 
 
 class AdmissionBase(SQLModel):
-    patient_id: int = Field(foreign_key="patient.id")
-    room_id: int = Field(foreign_key="room.id")
+    patient_id: int = Field(foreign_key="patient.id", index=True)
+    room_id: int = Field(foreign_key="room.id", index=True)
 
-class Admission(AdmissionBase, table=True):
+class Admission(AdmissionBase, SoftDeleteMixin, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    staff_id: int = Field(foreign_key="staff.id")
+    staff_id: int = Field(foreign_key="staff.id", index=True)
     
     created_datetime: datetime = Field(sa_column=Column(
         TIMESTAMP(timezone=True),
@@ -22,10 +30,17 @@ class Admission(AdmissionBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
 
+    patient: "Patient" = Relationship()
+    room: "Room" = Relationship()
+    staff: "Staff" = Relationship()
+    # Deleting an admission has never touched its notes; keep SQLAlchemy from nulling their admission_id.
+    notes: list["Note"] = Relationship(back_populates="admission", sa_relationship_kwargs={"passive_deletes": "all"})
+
 
 class AdmissionCreate(AdmissionBase):
     ...
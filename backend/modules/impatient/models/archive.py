@@ -0,0 +1,15 @@
+from modules.core.tiers import archive_table
+from modules.impatient.models.admission import Admission
+from modules.impatient.models.note import Note
+
+
+admission_archive = archive_table(
+    Admission.__table__,
+    "admission_archive",
+    indexes=("patient_id", "room_id", "staff_id"),
+)
+note_archive = archive_table(
+    Note.__table__,
+    "note_archive",
+    indexes=("admission_id", "staff_id"),
+)
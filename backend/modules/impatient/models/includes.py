@@ -0,0 +1,32 @@
+from sqlmodel import SQLModel
+
+from modules.auth.models.staff import StaffPublic
+from modules.impatient.models.admission import AdmissionPublic
+from modules.impatient.models.note import NotePublic
+from modules.impatient.models.room import RoomPublic
+from modules.patient.models.patient import PatientPublic
+
+
+ADMISSION_INCLUDES: dict[str, type[SQLModel]] = {
+    "patient": PatientPublic,
+    "room": RoomPublic,
+    "staff": StaffPublic,
+    "notes": NotePublic,
+}
+
+NOTE_INCLUDES: dict[str, type[SQLModel]] = {
+    "admission": AdmissionPublic,
+    "staff": StaffPublic,
+}
+
+
+class AdmissionPublicWithIncludes(AdmissionPublic):
+    patient: PatientPublic | None = None
+    room: RoomPublic | None = None
+    staff: StaffPublic | None = None
+    notes: list[NotePublic] | None = None
+
+
+class NotePublicWithIncludes(NotePublic):
+    admission: AdmissionPublic | None = None
+    staff: StaffPublic | None = None
@@ -1,15 +1,21 @@
 from datetime import datetime, timezone
-from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
+from typing import TYPE_CHECKING
+from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text, Relationship
+from modules.core.soft_delete import SoftDeleteMixin
+
+if TYPE_CHECKING:
+    from modules.auth.models.staff import Staff
+    from modules.impatient.models.admission import Admission
 
 class NoteBase(SQLModel):
     text: str = Field()
     
-    admission_id: int = Field(foreign_key="admission.id")
+    admission_id: int = Field(foreign_key="admission.id", index=True)
 
 
-class Note(NoteBase, table=True):
+class Note(NoteBase, SoftDeleteMixin, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    staff_id: int = Field(foreign_key="staff.id")
+    staff_id: int = Field(foreign_key="staff.id", index=True)
 
     created_datetime: datetime = Field(sa_column=Column(
         TIMESTAMP(timezone=True),
@@ -23,9 +29,13 @@ class Note(NoteBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
+
+    admission: "Admission" = Relationship(back_populates="notes")
+    staff: "Staff" = Relationship()
     
 
 class NoteCreate(NoteBase):
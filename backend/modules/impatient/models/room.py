@@ -1,12 +1,13 @@
 from datetime import datetime, timezone
 from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
+from modules.core.soft_delete import SoftDeleteMixin
 
 class RoomBase(SQLModel):
     name: str = Field(index=True)
     maximum_capacity: int = Field(default=0)
 
 
-class Room(RoomBase, table=True):
+class Room(RoomBase, SoftDeleteMixin, table=True):
     id: int | None = Field(default=None, primary_key=True)
     created_datetime: datetime = Field(sa_column=Column(
         TIMESTAMP(timezone=True),
@@ -20,6 +21,7 @@ class Room(RoomBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
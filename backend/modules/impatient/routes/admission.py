@@ -5,15 +5,19 @@ from modules.auth.controllers.staff import get_current_staff
 from modules.auth.models.staff import Staff
 from modules.impatient.controllers.admission import get_admission_all, get_admission_by_id, create_admission, update_admission, delete_admission, get_admission_notes
 from modules.impatient.models.admission import AdmissionCreate, AdmissionUpdate, AdmissionPublic
+from modules.impatient.models.includes import ADMISSION_INCLUDES, AdmissionPublicWithIncludes
 from modules.database.session import SessionDep
 from modules.impatient.models.note import NotePublic
 from modules.impatient.controllers.exceptions import RoomCapacityOverFlow, RoomDoesNotExist, PatientDoesNotExist, PatientAlreadyInRoom
 from modules.auth.controllers.log import log, LogType
+from modules.core.fields import field_selection, include_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
 
-@router.get("/", response_model=list[AdmissionPublic])
+@router.get("/", response_model=list[AdmissionPublicWithIncludes])
 def list_admissions(
     session: SessionDep,
     patient_id: int | None = None,
@@ -31,9 +35,12 @@ def list_admissions(
     updated_datetime__lte: datetime | None = None,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(AdmissionPublic)),
+    include: dict[str, type] | None = Depends(include_selection(ADMISSION_INCLUDES)),
+    include_archived: bool = False,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_admission_all(
+    return json_response(AdmissionPublic, get_admission_all(
         session=session,
         patient_id=patient_id,
         room_id=room_id,
@@ -50,7 +57,10 @@ def list_admissions(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+        include=include,
+        include_archived=include_archived,
+    ), fields=fields, include=include)
 
 
 @router.get("/{id}/notes/", response_model=list[NotePublic])
@@ -59,27 +69,31 @@ def list_admission_notes(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(NotePublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_admission_notes(
+    return json_response(NotePublic, get_admission_notes(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+    ), fields=fields)
 
 
 
-@router.get("/{id}/", response_model=AdmissionPublic)
+@router.get("/{id}/", response_model=AdmissionPublicWithIncludes)
 def retrieve_admission(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(AdmissionPublic)),
+    include: dict[str, type] | None = Depends(include_selection(ADMISSION_INCLUDES)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    admission = get_admission_by_id(session=session, id=id)
+    admission = get_admission_by_id(session=session, id=id, fields=fields, include=include)
     if not admission:
         raise HTTPException(status_code=404, detail="Admission not found")
-    return admission
+    return json_response(AdmissionPublic, admission, fields=fields, include=include)
 
 
 @router.post("/", response_model=AdmissionPublic)
@@ -5,13 +5,17 @@ from modules.auth.controllers.staff import get_current_staff
 from modules.auth.models.staff import Staff
 from modules.impatient.controllers.note import get_note_all, get_note_by_id, create_note, update_note, delete_note
 from modules.impatient.models.note import NoteCreate, NoteUpdate, NotePublic
+from modules.impatient.models.includes import NOTE_INCLUDES, NotePublicWithIncludes
 from modules.database.session import SessionDep
 from modules.auth.controllers.log import log, LogType
+from modules.core.fields import field_selection, include_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
 
-@router.get("/", response_model=list[NotePublic])
+@router.get("/", response_model=list[NotePublicWithIncludes])
 def list_notes(
     session: SessionDep,
     text: str | None = None,
@@ -29,9 +33,12 @@ def list_notes(
     updated_datetime__lte: datetime | None = None,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(NotePublic)),
+    include: dict[str, type] | None = Depends(include_selection(NOTE_INCLUDES)),
+    include_archived: bool = False,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_note_all(
+    return json_response(NotePublic, get_note_all(
         session=session,
         text=text,
         admission_id=admission_id,
@@ -48,19 +55,24 @@ def list_notes(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+        include=include,
+        include_archived=include_archived,
+    ), fields=fields, include=include)
 
 
-@router.get("/{id}/", response_model=NotePublic)
+@router.get("/{id}/", response_model=NotePublicWithIncludes)
 def retrieve_note(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(NotePublic)),
+    include: dict[str, type] | None = Depends(include_selection(NOTE_INCLUDES)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    note = get_note_by_id(session=session, id=id)
+    note = get_note_by_id(session=session, id=id, fields=fields, include=include)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
-    return note
+    return json_response(NotePublic, note, fields=fields, include=include)
 
 
 @router.post("/", response_model=NotePublic)
@@ -9,9 +9,12 @@ from modules.impatient.models.room import RoomCreate, RoomUpdate, RoomPublic
 from modules.database.session import SessionDep
 from modules.impatient.models.admission import AdmissionPublic
 from modules.auth.controllers.log import log, LogType
+from modules.core.fields import field_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
 
 @router.get("/", response_model=list[RoomPublic])
 def list_rooms(
@@ -34,9 +37,10 @@ def list_rooms(
     updated_datetime__lte: datetime | None = None,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(RoomPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_room_all(
+    return json_response(RoomPublic, get_room_all(
         session=session,
         name=name,
         maximum_capacity=maximum_capacity,
@@ -56,7 +60,8 @@ def list_rooms(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+    ), fields=fields)
 
 
 @router.get("/{id}/admissions/", response_model=list[AdmissionPublic])
@@ -65,14 +70,16 @@ def list_room_admissions(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(AdmissionPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_room_admissions(
+    return json_response(AdmissionPublic, get_room_admissions(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+    ), fields=fields)
 
 
 
@@ -80,12 +87,13 @@ def list_room_admissions(
 def retrieve_room(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(RoomPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    room = get_room_by_id(session=session, id=id)
+    room = get_room_by_id(session=session, id=id, fields=fields)
     if not room:
         raise HTTPException(status_code=404, detail="Staff not found")
-    return room
+    return json_response(RoomPublic, room, fields=fields)
 
 
 @router.post("/", response_model=RoomPublic)
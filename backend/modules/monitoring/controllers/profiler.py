@@ -0,0 +1,229 @@
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from fastapi.routing import APIRoute
+
+from modules import settings
+from modules.monitoring.models.profiler import RequestProfilePublic, SamplerStatus
+
+
+# Set by ProfilerMiddleware for requests that asked to be profiled. A sync
+# endpoint runs in a worker thread with a copy of the request context, so it
+# sees the same list and appends the profile it collected there.
+active_profiles: ContextVar[list[cProfile.Profile] | None] = ContextVar("active_profiles", default=None)
+
+request_profiles: deque[RequestProfilePublic] = deque(maxlen=settings.PROFILER_BUFFER_SIZE)
+request_profiles_lock = threading.Lock()
+request_profile_ids = itertools.count(1)
+
+
+# Only one request is profiled at a time: from Python 3.12 cProfile runs on
+# sys.monitoring, which allows a single profiler per process, and before that
+# a second profile on the same thread would take over the first one's hook.
+profile_lock = threading.Lock()
+
+
+def start_profile() -> cProfile.Profile | None:
+    if not profile_lock.acquire(blocking=False):
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiling tool holds sys.monitoring.
+        profile_lock.release()
+        return None
+    return profile
+
+
+def stop_profile(profile: cProfile.Profile, profiles: list[cProfile.Profile]) -> None:
+    profile.disable()
+    profile_lock.release()
+    profiles.append(profile)
+
+
+def profiled(endpoint):
+    # Each request is profiled in one place only: a sync endpoint in its worker
+    # thread, an async one on the event-loop thread, where the profile also
+    # catches whatever other requests run between its awaits.
+    if getattr(endpoint, "__profiled__", False):
+        # include_router rebuilds routes from their already wrapped endpoints.
+        return endpoint
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            profiles = active_profiles.get()
+            profile = start_profile() if profiles is not None else None
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                stop_profile(profile, profiles)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            profiles = active_profiles.get()
+            profile = start_profile() if profiles is not None else None
+            if profile is None:
+                return endpoint(*args, **kwargs)
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                stop_profile(profile, profiles)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route whose endpoint is profiled on request."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+def render_profile(profiles: list[cProfile.Profile], *, limit: int = 60) -> str:
+    if not profiles:
+        return (
+            "No profile was collected: the route is not profiled, or another request "
+            "was being profiled at the same time. The stack sampler covers both.\n"
+        )
+    stream = io.StringIO()
+    stats = pstats.Stats(profiles[0], stream=stream)
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def record_request_profile(
+        *,
+        id: int,
+        method: str,
+        path: str,
+        staff_id: int,
+        duration_ms: float,
+        profiles: list[cProfile.Profile],
+    ) -> RequestProfilePublic:
+    entry = RequestProfilePublic(
+        id=id,
+        recorded_datetime=datetime.now(timezone.utc),
+        method=method,
+        path=path,
+        staff_id=staff_id,
+        duration_ms=round(duration_ms, 3),
+        stats=render_profile(profiles),
+    )
+    with request_profiles_lock:
+        request_profiles.append(entry)
+    return entry
+
+
+def get_request_profile_all() -> list[RequestProfilePublic]:
+    with request_profiles_lock:
+        entries = list(request_profiles)
+    entries.reverse()
+    return entries
+
+
+def get_request_profile_by_id(*, id: int) -> RequestProfilePublic | None:
+    with request_profiles_lock:
+        return next((entry for entry in request_profiles if entry.id == id), None)
+
+
+IDLE_MODULES = {"threading", "selectors"}
+
+
+def frame_label(frame) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    # co_qualname is new in Python 3.11.
+    name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+    return f"{module}:{name}".replace(";", ":").replace(" ", "_")
+
+
+class StackSampler:
+    """Low-rate sampler that folds every thread's stack into collapsed-stack counts."""
+
+    def __init__(self):
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.interval = settings.PROFILER_SAMPLER_INTERVAL_MS / 1000
+        self.started_datetime: datetime | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval_ms: float | None = None) -> None:
+        if self.running:
+            return
+        if interval_ms is not None:
+            self.interval = interval_ms / 1000
+        self._stop.clear()
+        self.started_datetime = datetime.now(timezone.utc)
+        self._thread = threading.Thread(target=self._run, name="hims-stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            folded = []
+            for ident, frame in frames.items():
+                # Threads parked on a lock or in the event loop's poll are idle, not slow.
+                if ident == own_ident or frame.f_globals.get("__name__") in IDLE_MODULES:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(frame_label(frame))
+                    frame = frame.f_back
+                labels.reverse()
+                folded.append(";".join(labels))
+            with self._lock:
+                self.stacks.update(folded)
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def status(self) -> SamplerStatus:
+        with self._lock:
+            return SamplerStatus(
+                running=self.running,
+                interval_ms=self.interval * 1000,
+                samples=self.samples,
+                distinct_stacks=len(self.stacks),
+                started_datetime=self.started_datetime,
+                pid=os.getpid(),
+            )
+
+
+sampler = StackSampler()
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import Engine, event
+
+from modules import settings
+from modules.monitoring.models.slow_query import SlowQueryPublic
+
+
+slow_queries: deque[SlowQueryPublic] = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+slow_queries_lock = threading.Lock()
+
+slow_query_logger = logging.getLogger("hims.slow_query")
+slow_query_logger.propagate = False
+
+
+def configure_slow_query_file(path: str) -> None:
+    if any(getattr(handler, "baseFilename", None) == os.path.abspath(path) for handler in slow_query_logger.handlers):
+        return
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.setLevel(logging.INFO)
+
+
+def parameter_shape(parameters, executemany: bool) -> list[str]:
+    # Types only: bound values can carry patient data and must not be logged.
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        return [f"{key}:{type(value).__name__}" for key, value in parameters.items()]
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def calling_controller() -> str | None:
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        if "/modules/" in filename and "/controllers/" in filename and "/monitoring/" not in filename:
+            return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def explain(cursor, dialect_name: str, statement: str, parameters) -> list[str] | None:
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+    try:
+        explain_cursor = cursor.connection.cursor()
+        try:
+            explain_cursor.execute(prefix + statement, parameters)
+            rows = explain_cursor.fetchall()
+        finally:
+            explain_cursor.close()
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+    return [" | ".join(str(column) for column in row) for row in rows]
+
+
+def record_slow_query(entry: SlowQueryPublic) -> None:
+    with slow_queries_lock:
+        slow_queries.append(entry)
+    if slow_query_logger.handlers:
+        slow_query_logger.info(json.dumps(entry.model_dump(mode="json")))
+
+
+def get_slow_queries(*, limit: int | None = None) -> list[SlowQueryPublic]:
+    with slow_queries_lock:
+        entries = list(slow_queries)
+    entries.reverse()
+    return entries[:limit] if limit is not None else entries
+
+
+def clear_slow_queries() -> int:
+    with slow_queries_lock:
+        count = len(slow_queries)
+        slow_queries.clear()
+    return count
+
+
+def install_slow_query_log(engine: Engine, *, threshold_ms: float = settings.SLOW_QUERY_THRESHOLD_MS) -> None:
+    threshold = threshold_ms / 1000
+    dialect_name = engine.dialect.name
+    if settings.SLOW_QUERY_LOG_PATH:
+        configure_slow_query_file(settings.SLOW_QUERY_LOG_PATH)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start_time"].pop()
+        if elapsed < threshold:
+            return
+        record_slow_query(SlowQueryPublic(
+            recorded_datetime=datetime.now(timezone.utc),
+            duration_ms=round(elapsed * 1000, 3),
+            statement=statement,
+            parameter_shape=parameter_shape(parameters, executemany),
+            executemany=executemany,
+            caller=calling_controller(),
+            plan=explain(cursor, dialect_name, statement, parameters)
+                if settings.SLOW_QUERY_EXPLAIN and not executemany else None,
+        ))
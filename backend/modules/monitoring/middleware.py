@@ -0,0 +1,151 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from modules.auth.controllers.staff import get_staff_by_token, is_admin_staff
+from modules.database.engine import engine
+from modules.monitoring.controllers.profiler import active_profiles, request_profile_ids, record_request_profile
+from modules.monitoring.metrics import (
+    REQUEST_DURATION, REQUESTS_IN_FLIGHT, REQUEST_DB_QUERIES, REQUEST_DB_DURATION, DB_QUERIES,
+)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    query_time: float = 0.0
+
+
+# Set per request by MetricsMiddleware. Sync route handlers run in a copied
+# context, so they share the same RequestStats instance.
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERIES.inc()
+        stats = request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.query_time += elapsed
+
+
+def route_template(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched") if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+            request_stats.reset(token)
+            method = scope["method"]
+            template = route_template(scope)
+            REQUEST_DURATION.observe(elapsed, (method, template, status))
+            REQUEST_DB_QUERIES.observe(stats.queries, (method, template))
+            REQUEST_DB_DURATION.observe(stats.query_time, (method, template))
+
+
+def profile_requested(scope: dict) -> bool:
+    if (b"x-profile", b"1") in scope["headers"]:
+        return True
+    return b"_profile=1" in scope.get("query_string", b"").split(b"&")
+
+
+def request_token(scope: dict) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token
+        elif name == b"cookie":
+            for part in value.decode("latin-1").split(";"):
+                key, _, cookie = part.strip().partition("=")
+                if key == "access_token" and cookie:
+                    return cookie
+    return None
+
+
+def profiling_staff_id(token: str) -> int | None:
+    with Session(engine) as session:
+        staff = get_staff_by_token(session=session, token=token)
+        if staff is None or not is_admin_staff(staff):
+            return None
+        return staff.id
+
+
+class ProfilerMiddleware:
+    """Profile a single request when an admin sends ``X-Profile: 1`` or ``?_profile=1``.
+
+    The profile itself is taken around the endpoint by ``ProfiledRoute``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = request_token(scope)
+        staff_id = await run_in_threadpool(profiling_staff_id, token) if token else None
+        if staff_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = next(request_profile_ids)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", str(profile_id).encode())]
+            await send(message)
+
+        profiles = []
+        context_token = active_profiles.set(profiles)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            active_profiles.reset(context_token)
+            record_request_profile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                staff_id=staff_id,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                profiles=profiles,
+            )
@@ -0,0 +1,30 @@
+from datetime import datetime
+from sqlmodel import SQLModel
+
+
+class RequestProfilePublic(SQLModel):
+    id: int
+    recorded_datetime: datetime
+    method: str
+    path: str
+    staff_id: int
+    duration_ms: float
+    stats: str
+
+
+class RequestProfileSummary(SQLModel):
+    id: int
+    recorded_datetime: datetime
+    method: str
+    path: str
+    staff_id: int
+    duration_ms: float
+
+
+class SamplerStatus(SQLModel):
+    running: bool
+    interval_ms: float
+    samples: int
+    distinct_stacks: int
+    started_datetime: datetime | None = None
+    pid: int
@@ -0,0 +1,12 @@
+from datetime import datetime
+from sqlmodel import SQLModel
+
+
+class SlowQueryPublic(SQLModel):
+    recorded_datetime: datetime
+    duration_ms: float
+    statement: str
+    parameter_shape: list[str]
+    executemany: bool
+    caller: str | None = None
+    plan: list[str] | None = None
@@ -0,0 +1,22 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from modules import settings
+from modules.monitoring.metrics import registry
+
+router = APIRouter()
+
+
+def require_metrics_token(request: Request) -> None:
+    if not settings.METRICS_TOKEN:
+        return
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not secrets.compare_digest(request.headers.get("authorization", ""), expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
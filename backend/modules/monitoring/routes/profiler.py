@@ -0,0 +1,71 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from modules.auth.controllers.staff import get_admin_staff
+from modules.auth.models.staff import Staff
+from modules.monitoring.controllers.profiler import get_request_profile_all, get_request_profile_by_id, sampler
+from modules.monitoring.models.profiler import RequestProfileSummary, SamplerStatus
+
+router = APIRouter()
+
+
+@router.get("/requests/", response_model=list[RequestProfileSummary])
+def list_request_profiles(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    return get_request_profile_all()
+
+
+@router.get("/requests/{id}/", response_class=PlainTextResponse)
+def retrieve_request_profile(
+    id: int,
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    profile = get_request_profile_by_id(id=id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(profile.stats)
+
+
+@router.get("/sampler/", response_model=SamplerStatus)
+def retrieve_sampler(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    return sampler.status()
+
+
+@router.post("/sampler/start", response_model=SamplerStatus)
+def start_sampler(
+    interval_ms: float | None = None,
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    sampler.start(interval_ms=interval_ms)
+    return sampler.status()
+
+
+@router.post("/sampler/stop", response_model=SamplerStatus)
+def stop_sampler(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    sampler.stop()
+    return sampler.status()
+
+
+@router.get("/sampler/collapsed", response_class=PlainTextResponse)
+def retrieve_collapsed_stacks(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="hims-{os.getpid()}.collapsed"'},
+    )
+
+
+@router.delete("/sampler/", response_model=SamplerStatus)
+def reset_sampler(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    sampler.reset()
+    return sampler.status()
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from modules.auth.controllers.staff import get_admin_staff
+from modules.auth.models.staff import Staff
+from modules.monitoring.controllers.slow_query import get_slow_queries, clear_slow_queries
+from modules.monitoring.models.slow_query import SlowQueryPublic
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[SlowQueryPublic])
+def list_slow_queries(
+    limit: int = 100,
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    return get_slow_queries(limit=limit)
+
+
+@router.delete("/", response_model=dict)
+def delete(
+    current_staff: Staff = Depends(get_admin_staff),
+):
+    cleared = clear_slow_queries()
+    return {"detail": f"Cleared {cleared} slow queries"}
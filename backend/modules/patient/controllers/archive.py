@@ -0,0 +1,127 @@
+"""Cold storage for discharged patients.
+
+A patient who has been discharged for ``PATIENT_ARCHIVE_AFTER_DAYS`` moves,
+with all of their admissions and those admissions' notes, from the hot tables
+into ``patient_archive``, ``admission_archive`` and ``note_archive``. Rows keep
+their ids. Each batch of patients moves in one transaction, claimed with
+``SKIP LOCKED`` where the database supports it.
+
+A patient who needs the hot tables again, e.g. to be readmitted, is moved
+back by ``restore_patient`` together with everything that was archived with
+them, inside the caller's transaction.
+
+Time since discharge is measured by the patient's ``discharged_datetime``,
+which ``update_patient`` sets when the status changes to Discharged, e.g. when
+their admission is deleted.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Connection, Engine, Table, select
+
+from modules import settings
+from modules.core.tiers import move_rows, restore_rows
+from modules.core.worker import PeriodicWorker
+from modules.database.dialect import skip_locked
+from modules.database.engine import engine
+from modules.impatient.models.admission import Admission
+from modules.impatient.models.archive import admission_archive, note_archive
+from modules.impatient.models.note import Note
+from modules.monitoring.metrics import registry
+from modules.patient.models.archive import patient_archive
+from modules.patient.models.patient import Patient, PatientStatus
+
+
+PATIENTS_ARCHIVED = registry.counter(
+    "hims_patient_archived_rows_total",
+    "Rows moved into the cold patient archive.",
+    ("table",),
+)
+PATIENTS_RESTORED = registry.counter(
+    "hims_patient_restored_rows_total",
+    "Rows moved back from the cold patient archive.",
+    ("table",),
+)
+
+patient_table: Table = Patient.__table__
+admission_table: Table = Admission.__table__
+note_table: Table = Note.__table__
+
+
+def archive_discharged_patients(
+        bind: Engine = engine,
+        *,
+        older_than: datetime,
+        batch_size: int = settings.PATIENT_ARCHIVE_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        now = datetime.now(timezone.utc)
+        with bind.begin() as connection:
+            ids = connection.execute(skip_locked(
+                select(patient_table.c.id)
+                .where(patient_table.c.status == PatientStatus.Discharged)
+                .where(patient_table.c.discharged_datetime < older_than)
+                .order_by(patient_table.c.id)
+                .limit(batch_size)
+            )).scalars().all()
+            if not ids:
+                break
+            admissions = select(admission_table.c.id).where(admission_table.c.patient_id.in_(ids))
+            moved = {
+                "note": move_rows(connection, note_table, note_archive, note_table.c.admission_id.in_(admissions), archived=now),
+                "admission": move_rows(connection, admission_table, admission_archive, admission_table.c.patient_id.in_(ids), archived=now),
+                "patient": move_rows(connection, patient_table, patient_archive, patient_table.c.id.in_(ids), archived=now),
+            }
+        for table, count in moved.items():
+            PATIENTS_ARCHIVED.inc(count, (table,))
+        archived += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+    return archived
+
+
+def restore_patient(connection: Connection, id: int) -> bool:
+    """Move an archived patient and their admissions and notes back to the hot tables."""
+    # Locks the archived row, so a concurrent restore waits and then finds nothing.
+    found = connection.execute(
+        select(patient_archive.c.id)
+        .where(patient_archive.c.id == id, patient_archive.c.deleted_datetime.is_(None))
+        .with_for_update()
+    ).first()
+    if found is None:
+        return False
+    admission_ids = connection.execute(
+        select(admission_archive.c.id).where(admission_archive.c.patient_id == id)
+    ).scalars().all()
+    restored = {
+        "patient": restore_rows(connection, patient_archive, patient_table, patient_archive.c.id == id),
+        "admission": restore_rows(connection, admission_archive, admission_table, admission_archive.c.patient_id == id),
+        "note": restore_rows(connection, note_archive, note_table, note_archive.c.admission_id.in_(admission_ids)),
+    }
+    for table, count in restored.items():
+        PATIENTS_RESTORED.inc(count, (table,))
+    return True
+
+
+class PatientArchiver(PeriodicWorker):
+    """Background thread that moves long-discharged patients to the archive."""
+
+    name = "hims-patient-archiver"
+
+    def __init__(self, bind: Engine = engine):
+        super().__init__()
+        self.bind = bind
+
+    @property
+    def interval(self) -> float:
+        return settings.PATIENT_ARCHIVE_INTERVAL_SECONDS
+
+    def run_once(self) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.PATIENT_ARCHIVE_AFTER_DAYS)
+        return archive_discharged_patients(self.bind, older_than=cutoff, max_batches=settings.PATIENT_ARCHIVE_MAX_BATCHES)
+
+
+patient_archiver = PatientArchiver()
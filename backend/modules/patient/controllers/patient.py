@@ -1,8 +1,13 @@
 from sqlmodel import select
-from datetime import datetime
+from datetime import datetime, timezone
 
 from modules.patient.models.patient import Patient, PatientCreate, PatientUpdate, PatientStatus
 from modules.database.session import SessionDep
+from modules.core.soft_delete import soft_delete
+from modules.core.tiers import read_tiers, archived_rows
+from modules.patient.models.archive import patient_archive
+from modules.patient.controllers.archive import restore_patient
+from modules.core.fields import load_only_fields
 from modules.impatient.models.admission import Admission
 import requests
 
@@ -29,36 +34,56 @@ def get_patient_all(
         updated_datetime__lte: datetime | None = None,
         offset: int | None = None,
         limit: int | None = None,
+        fields: tuple[str, ...] | None = None,
+        include_archived: bool = False,
     ) -> list[Patient]:
-    query = select(Patient).offset(offset).limit(limit)
-    filters = [
-        Patient.first_name.ilike(f"%{first_name}%") if first_name is not None else None,
-        Patient.last_name.ilike(f"%{last_name}%") if last_name is not None else None,
-        Patient.email.ilike(f"%{email}%") if email is not None else None,
-        Patient.gender.ilike(f"%{gender}%") if gender is not None else None,
-        Patient.phone.ilike(f"%{phone}%") if phone is not None else None,
-        Patient.status == status if status is not None else None,
-        Patient.created_datetime == created_datetime if created_datetime is not None else None,
-        Patient.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
-        Patient.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
-        Patient.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
-        Patient.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
-        Patient.updated_datetime == updated_datetime if updated_datetime is not None else None,
-        Patient.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
-        Patient.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
-        Patient.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
-        Patient.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
-    ]
-    
-    filters = [filter for filter in filters if filter is not None]
-    
-    if filters:
-        query = query.where(*filters)
-    
-    return session.exec(query).all()
-
-
-def get_patient_by_id( *, session: SessionDep, id: int) -> Patient | None:
+    query = select(Patient).options(*load_only_fields(Patient, fields)).offset(offset).limit(limit)
+    def filters(columns) -> list:
+        clauses = [
+            columns.first_name.ilike(f"%{first_name}%") if first_name is not None else None,
+            columns.last_name.ilike(f"%{last_name}%") if last_name is not None else None,
+            columns.email.ilike(f"%{email}%") if email is not None else None,
+            columns.gender.ilike(f"%{gender}%") if gender is not None else None,
+            columns.phone.ilike(f"%{phone}%") if phone is not None else None,
+            columns.status == status if status is not None else None,
+            columns.created_datetime == created_datetime if created_datetime is not None else None,
+            columns.created_datetime > created_datetime__gt if created_datetime__gt is not None else None,
+            columns.created_datetime < created_datetime__lt if created_datetime__lt is not None else None,
+            columns.created_datetime >= created_datetime__gte if created_datetime__gte is not None else None,
+            columns.created_datetime <= created_datetime__lte if created_datetime__lte is not None else None,
+            columns.updated_datetime == updated_datetime if updated_datetime is not None else None,
+            columns.updated_datetime > updated_datetime__gt if updated_datetime__gt is not None else None,
+            columns.updated_datetime < updated_datetime__lt if updated_datetime__lt is not None else None,
+            columns.updated_datetime >= updated_datetime__gte if updated_datetime__gte is not None else None,
+            columns.updated_datetime <= updated_datetime__lte if updated_datetime__lte is not None else None,
+        ]
+        return [clause for clause in clauses if clause is not None]
+
+    return read_tiers(
+        session,
+        model=Patient,
+        archive=patient_archive,
+        query=query.where(*filters(Patient)),
+        where=filters,
+        offset=offset,
+        limit=limit,
+        include_archived=include_archived,
+    )
+
+
+def get_patient_by_id( *, session: SessionDep, id: int, fields: tuple[str, ...] | None = None) -> Patient | None:
+    return session.get(Patient, id, options=load_only_fields(Patient, fields))
+
+
+def get_archived_patient_by_id(*, session: SessionDep, id: int) -> Patient | None:
+    row = session.execute(archived_rows(Patient, patient_archive, [patient_archive.c.id == id])).mappings().first()
+    return Patient(**row) if row is not None else None
+
+
+def restore_archived_patient(*, session: SessionDep, id: int) -> Patient | None:
+    """Bring an archived patient back into the hot tables, in the session's transaction."""
+    if not restore_patient(session.connection(), id):
+        return None
     return session.get(Patient, id)
 
 
@@ -74,21 +99,25 @@ def get_patient_admissions(
         *, id: int, 
         session: SessionDep,
         offset: int | None = None,
-        limit: int | None = None) -> list[Admission] | None:
+        limit: int | None = None,
+        fields: tuple[str, ...] | None = None) -> list[Admission] | None:
     
     db_patient = session.get(Patient, id)
     if not db_patient:
         return None
-    query = select(Admission).where(Admission.patient_id == db_patient.id).offset(offset).limit(limit)
+    query = select(Admission).options(*load_only_fields(Admission, fields)).where(Admission.patient_id == db_patient.id).offset(offset).limit(limit)
 
     return session.exec(query).all()
 
 
 def update_patient(*, id: int, patient: PatientUpdate, session: SessionDep) -> Patient | None:
-    db_patient = session.get(Patient, id)
+    db_patient = session.get(Patient, id) or restore_archived_patient(session=session, id=id)
     if not db_patient:
         return None
     staff_data = patient.model_dump(exclude_unset=True)
+    if "status" in staff_data and staff_data["status"] != db_patient.status:
+        discharged = staff_data["status"] == PatientStatus.Discharged
+        staff_data["discharged_datetime"] = datetime.now(timezone.utc) if discharged else None
     db_patient.sqlmodel_update(staff_data)
     session.add(db_patient)
     session.commit()
@@ -102,6 +131,6 @@ def delete_patient(*, patient_id: int, session: SessionDep) -> bool:
     if not db_patient:
         return False  # Patient not found, cannot delete
 
-    session.delete(db_patient)
+    soft_delete(session, db_patient)
     session.commit()
     return True  # Successfully deleted the patient
\ No newline at end of file
@@ -0,0 +1,9 @@
+from modules.core.tiers import archive_table
+from modules.patient.models.patient import Patient
+
+
+patient_archive = archive_table(
+    Patient.__table__,
+    "patient_archive",
+    indexes=("first_name", "last_name", "email", "phone", "updated_datetime"),
+)
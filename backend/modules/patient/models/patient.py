@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from sqlmodel import Field, SQLModel, Column, TIMESTAMP, text
 from enum import Enum
+from modules.core.soft_delete import SoftDeleteMixin
 
 
 class PatientStatus(Enum):
@@ -18,7 +19,7 @@ class PatientBase(SQLModel):
     status: PatientStatus = Field(default=PatientStatus.Registered)
     
 
-class Patient(PatientBase, table=True):
+class Patient(PatientBase, SoftDeleteMixin, table=True):
     id: int | None = Field(default=None, primary_key=True)
     created_datetime: datetime = Field(sa_column=Column(
         TIMESTAMP(timezone=True),
@@ -32,9 +33,12 @@ class Patient(PatientBase, table=True):
         nullable=False,
         server_default=text("CURRENT_TIMESTAMP"),
         server_onupdate=text("CURRENT_TIMESTAMP"),
+        index=True,
     ),
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    # Set when the status becomes Discharged; the archiver ages patients by it.
+    discharged_datetime: datetime | None = Field(default=None, sa_type=TIMESTAMP(timezone=True))
     
 
 class PatientCreate(PatientBase):
@@ -45,6 +49,7 @@ class PatientPublic(PatientBase):
     id: int
     created_datetime: datetime
     updated_datetime: datetime
+    discharged_datetime: datetime | None = None
 
 
 class PatientUpdate(SQLModel):
@@ -5,14 +5,17 @@ from datetime import datetime
 
 from modules.auth.controllers.staff import get_current_staff
 from modules.auth.models.staff import Staff
-from modules.patient.controllers.patient import get_patient_all, get_patient_by_id, create_patient, update_patient, delete_patient, get_patient_admissions
+from modules.patient.controllers.patient import get_patient_all, get_patient_by_id, get_archived_patient_by_id, create_patient, update_patient, delete_patient, get_patient_admissions
 from modules.patient.models.patient import PatientCreate, PatientUpdate, PatientPublic, PatientStatus
 from modules.database.session import SessionDep
 from modules.auth.controllers.log import log, LogType
 from modules.impatient.models.admission import AdmissionPublic
+from modules.core.fields import field_selection
+from modules.core.responses import json_response
+from modules.core.coalesce import CoalescedRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=CoalescedRoute)
 
 @router.get("/", response_model=list[PatientPublic])
 def list_patients(
@@ -34,9 +37,11 @@ def list_patients(
     updated_datetime__lte: datetime | None = None,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(PatientPublic)),
+    include_archived: bool = False,
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_patient_all(
+    return json_response(PatientPublic, get_patient_all(
         session=session,
         first_name=first_name,
         last_name=last_name,
@@ -55,7 +60,9 @@ def list_patients(
         updated_datetime__lt=updated_datetime__lt,
         updated_datetime__gte=updated_datetime__gte,
         updated_datetime__lte=updated_datetime__lte,
-    )
+        fields=fields,
+        include_archived=include_archived,
+    ), fields=fields)
 
 
 @router.get("/{id}/admissions/", response_model=list[AdmissionPublic])
@@ -64,26 +71,31 @@ def list_patients(
     id: int,
     offset: int = 0,
     limit: int = 10,
+    fields: tuple[str, ...] | None = Depends(field_selection(AdmissionPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    return get_patient_admissions(
+    return json_response(AdmissionPublic, get_patient_admissions(
         id=id,
         session=session,
         offset=offset,
-        limit=limit
-    )
+        limit=limit,
+        fields=fields,
+    ), fields=fields)
 
 
 @router.get("/{id}/", response_model=PatientPublic)
 def retrieve_patient(
     id: int,
     session: SessionDep,
+    fields: tuple[str, ...] | None = Depends(field_selection(PatientPublic)),
     current_staff: Staff = Depends(get_current_staff),
 ):
-    patient = get_patient_by_id(session=session, id=id)
+    patient = get_patient_by_id(session=session, id=id, fields=fields)
+    if not patient:
+        patient = get_archived_patient_by_id(session=session, id=id)
     if not patient:
         raise HTTPException(status_code=404, detail="Staff not found")
-    return patient
+    return json_response(PatientPublic, patient, fields=fields)
 
 
 
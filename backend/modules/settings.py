@@ -0,0 +1,127 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_list(name: str, default: list[str] | None = None) -> list[str]:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return list(default or [])
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+SERVER_HOST = env_str("HIMS_HOST", "0.0.0.0")
+SERVER_PORT = env_int("HIMS_PORT", 8000)
+SERVER_WORKERS = env_int("HIMS_WORKERS", os.cpu_count() or 1)
+SERVER_MAX_REQUESTS = env_int("HIMS_MAX_REQUESTS", 10000)
+SERVER_GRACEFUL_TIMEOUT = env_int("HIMS_GRACEFUL_TIMEOUT", 30)
+SERVER_KEEP_ALIVE = env_int("HIMS_KEEP_ALIVE", 5)
+SERVER_BACKLOG = env_int("HIMS_BACKLOG", 2048)
+SERVER_MIGRATE_ON_START = env_bool("HIMS_MIGRATE_ON_START", False)
+
+SQL_ECHO = env_bool("HIMS_SQL_ECHO", False)
+ADMIN_USERNAMES = env_list("HIMS_ADMIN_USERNAMES")
+
+SLOW_QUERY_THRESHOLD_MS = env_float("HIMS_SLOW_QUERY_THRESHOLD_MS", 100.0)
+SLOW_QUERY_BUFFER_SIZE = env_int("HIMS_SLOW_QUERY_BUFFER_SIZE", 500)
+SLOW_QUERY_EXPLAIN = env_bool("HIMS_SLOW_QUERY_EXPLAIN", True)
+SLOW_QUERY_LOG_PATH = env_str("HIMS_SLOW_QUERY_LOG_PATH", "")
+SLOW_QUERY_LOG_MAX_BYTES = env_int("HIMS_SLOW_QUERY_LOG_MAX_BYTES", 10 * 1024 * 1024)
+SLOW_QUERY_LOG_BACKUPS = env_int("HIMS_SLOW_QUERY_LOG_BACKUPS", 5)
+
+PROFILER_ENABLED = env_bool("HIMS_PROFILER_ENABLED", False)
+PROFILER_BUFFER_SIZE = env_int("HIMS_PROFILER_BUFFER_SIZE", 50)
+PROFILER_SAMPLER_AUTOSTART = env_bool("HIMS_PROFILER_SAMPLER_AUTOSTART", False)
+PROFILER_SAMPLER_INTERVAL_MS = env_float("HIMS_PROFILER_SAMPLER_INTERVAL_MS", 20.0)
+
+PASSWORD_HASH_ROUNDS = env_int("HIMS_PASSWORD_HASH_ROUNDS", 29000)
+PASSWORD_HASH_WORKERS = env_int("HIMS_PASSWORD_HASH_WORKERS", 2)
+PASSWORD_HASH_MAX_PENDING = env_int("HIMS_PASSWORD_HASH_MAX_PENDING", 32)
+PASSWORD_HASH_TIMEOUT = env_float("HIMS_PASSWORD_HASH_TIMEOUT", 5.0)
+
+LOGIN_USERNAME_BURST = env_int("HIMS_LOGIN_USERNAME_BURST", 5)
+LOGIN_USERNAME_PER_MINUTE = env_float("HIMS_LOGIN_USERNAME_PER_MINUTE", 5.0)
+LOGIN_USERNAME_TOTAL_BURST = env_int("HIMS_LOGIN_USERNAME_TOTAL_BURST", 30)
+LOGIN_USERNAME_TOTAL_PER_MINUTE = env_float("HIMS_LOGIN_USERNAME_TOTAL_PER_MINUTE", 30.0)
+LOGIN_IP_BURST = env_int("HIMS_LOGIN_IP_BURST", 30)
+LOGIN_IP_PER_MINUTE = env_float("HIMS_LOGIN_IP_PER_MINUTE", 60.0)
+LOGIN_FAILURE_CACHE_SECONDS = env_float("HIMS_LOGIN_FAILURE_CACHE_SECONDS", 30.0)
+LOGIN_RATE_LIMIT_STORE = env_str("HIMS_LOGIN_RATE_LIMIT_STORE", "memory")
+LOGIN_FAILURE_KEY = env_str("HIMS_LOGIN_FAILURE_KEY", "")
+LOGIN_RATE_LIMIT_MAX_KEYS = env_int("HIMS_LOGIN_RATE_LIMIT_MAX_KEYS", 100_000)
+
+AUTH_SESSION_IDLE_SECONDS = env_int("HIMS_AUTH_SESSION_IDLE_SECONDS", 8 * 60 * 60)
+AUTH_SESSION_MAX_AGE_SECONDS = env_int("HIMS_AUTH_SESSION_MAX_AGE_SECONDS", 7 * 24 * 60 * 60)
+AUTH_SESSION_TOUCH_SECONDS = env_int("HIMS_AUTH_SESSION_TOUCH_SECONDS", 60)
+AUTH_SESSION_REVOCATION_REFRESH_SECONDS = env_float("HIMS_AUTH_SESSION_REVOCATION_REFRESH_SECONDS", 2.0)
+AUTH_SESSION_CACHE_SIZE = env_int("HIMS_AUTH_SESSION_CACHE_SIZE", 10_000)
+
+COMPRESSION_ENABLED = env_bool("HIMS_COMPRESSION_ENABLED", True)
+COMPRESSION_MINIMUM_SIZE = env_int("HIMS_COMPRESSION_MINIMUM_SIZE", 1024)
+COMPRESSION_GZIP_LEVEL = env_int("HIMS_COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_BROTLI_QUALITY = env_int("HIMS_COMPRESSION_BROTLI_QUALITY", 4)
+COMPRESSION_CONTENT_TYPES = env_list("HIMS_COMPRESSION_CONTENT_TYPES", [
+    "application/json", "application/x-ndjson", "text/",
+])
+
+BATCH_MAX_REQUESTS = env_int("HIMS_BATCH_MAX_REQUESTS", 25)
+
+COALESCE_ENABLED = env_bool("HIMS_COALESCE_ENABLED", True)
+
+DATABASE_URL = env_str("HIMS_DATABASE_URL", "sqlite:///database.db")
+DATABASE_POOL_SIZE = env_int("HIMS_DATABASE_POOL_SIZE", 10)
+DATABASE_MAX_OVERFLOW = env_int("HIMS_DATABASE_MAX_OVERFLOW", 20)
+DATABASE_POOL_RECYCLE_SECONDS = env_int("HIMS_DATABASE_POOL_RECYCLE_SECONDS", 1800)
+DATABASE_READ_URLS = env_list("HIMS_DATABASE_READ_URLS", [])
+READ_YOUR_WRITES_SECONDS = env_float("HIMS_READ_YOUR_WRITES_SECONDS", 5.0)
+
+LOG_ARCHIVE_ENABLED = env_bool("HIMS_LOG_ARCHIVE_ENABLED", True)
+LOG_RETENTION_DAYS = env_int("HIMS_LOG_RETENTION_DAYS", 90)
+LOG_ARCHIVE_INTERVAL_SECONDS = env_float("HIMS_LOG_ARCHIVE_INTERVAL_SECONDS", 3600.0)
+LOG_ARCHIVE_BATCH_SIZE = env_int("HIMS_LOG_ARCHIVE_BATCH_SIZE", 1000)
+LOG_ARCHIVE_MAX_BATCHES = env_int("HIMS_LOG_ARCHIVE_MAX_BATCHES", 50)
+LOG_VACUUM_PAGES = env_int("HIMS_LOG_VACUUM_PAGES", 2000)
+
+PATIENT_ARCHIVE_ENABLED = env_bool("HIMS_PATIENT_ARCHIVE_ENABLED", True)
+PATIENT_ARCHIVE_AFTER_DAYS = env_int("HIMS_PATIENT_ARCHIVE_AFTER_DAYS", 365)
+PATIENT_ARCHIVE_INTERVAL_SECONDS = env_float("HIMS_PATIENT_ARCHIVE_INTERVAL_SECONDS", 3600.0)
+PATIENT_ARCHIVE_BATCH_SIZE = env_int("HIMS_PATIENT_ARCHIVE_BATCH_SIZE", 500)
+PATIENT_ARCHIVE_MAX_BATCHES = env_int("HIMS_PATIENT_ARCHIVE_MAX_BATCHES", 20)
+
+PURGE_ENABLED = env_bool("HIMS_PURGE_ENABLED", True)
+PURGE_RETENTION_DAYS = env_int("HIMS_PURGE_RETENTION_DAYS", 30)
+PURGE_INTERVAL_SECONDS = env_float("HIMS_PURGE_INTERVAL_SECONDS", 600.0)
+PURGE_BATCH_SIZE = env_int("HIMS_PURGE_BATCH_SIZE", 200)
+PURGE_BATCH_PAUSE_SECONDS = env_float("HIMS_PURGE_BATCH_PAUSE_SECONDS", 0.1)
+PURGE_QUIET_START_HOUR = env_int("HIMS_PURGE_QUIET_START_HOUR", 1)
+PURGE_QUIET_END_HOUR = env_int("HIMS_PURGE_QUIET_END_HOUR", 5)
+
+CHANGES_PAGE_SIZE = env_int("HIMS_CHANGES_PAGE_SIZE", 500)
+CHANGES_MAX_LIMIT = env_int("HIMS_CHANGES_MAX_LIMIT", 10_000)
+
+METRICS_TOKEN = env_str("HIMS_METRICS_TOKEN", "")
+
+INCLUDE_COLLECTION_LIMIT = env_int("HIMS_INCLUDE_COLLECTION_LIMIT", 20)
@@ -0,0 +1,140 @@
+"""Change data capture for downstream mirrors.
+
+Every flush that inserts, updates or soft-deletes a patient, admission or note
+appends one ``change_log`` row per affected record, on the flush's own
+connection, so a change commits or rolls back with the mutation that caused
+it. ``seq`` numbers increase in commit order. On SQLite there is only one writer.
+On PostgreSQL, recording changes takes an advisory lock that is held until
+commit. Without it, a transaction that drew a lower ``seq`` could commit after
+one that a consumer has already read past.
+
+``stream_changes`` pages through ``seq > since`` on the primary key and yields
+NDJSON lines, so a consumer keeps the last ``seq`` it saw and asks for the rest.
+The route passes the engine ``get_session`` would pick, so a client that just
+wrote reads its own changes from the writer.
+Rows that the archiver moves or the purge worker removes are not changes: the
+move keeps them readable, and the purge follows a delete that was already
+recorded.
+"""
+from datetime import datetime, timezone
+from typing import Iterator
+
+from pydantic_core import to_json
+from sqlalchemy import Engine, event, inspect, insert, select
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from modules import settings
+from modules.core.responses import public_dict, public_fields
+from modules.database.dialect import advisory_lock
+from modules.impatient.models.admission import Admission, AdmissionPublic
+from modules.impatient.models.note import Note, NotePublic
+from modules.patient.models.patient import Patient, PatientPublic
+from modules.sync.models.change import Change, ChangeOperation
+
+
+# Table model -> the public model its changes are encoded with.
+TRACKED: dict[type[SQLModel], type[SQLModel]] = {
+    Patient: PatientPublic,
+    Admission: AdmissionPublic,
+    Note: NotePublic,
+}
+CHANGE_LOG_LOCK = 0x48494D53
+
+change_table = Change.__table__
+
+
+def as_utc(value):
+    # New instances hold aware datetimes, while rows loaded back from SQLite are
+    # naive UTC; both must encode the same way.
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def change_row(instance: SQLModel, operation: ChangeOperation, now: datetime) -> dict:
+    data = None
+    if operation is not ChangeOperation.Delete:
+        public = TRACKED[type(instance)]
+        values = public_dict(instance, public_fields(public))
+        data = to_json({name: as_utc(value) for name, value in values.items()}).decode()
+    return {
+        "table_name": instance.__tablename__,
+        "row_id": instance.id,
+        "operation": operation,
+        "data": data,
+        # The Core insert skips the model's default, and the server's is only
+        # precise to the second on SQLite.
+        "created_datetime": now,
+    }
+
+
+def update_operation(instance: SQLModel) -> ChangeOperation:
+    state = inspect(instance)
+    if "deleted_datetime" in state.attrs:
+        if any(value is not None for value in state.attrs.deleted_datetime.history.added):
+            return ChangeOperation.Delete
+    return ChangeOperation.Update
+
+
+@event.listens_for(Session, "after_flush")
+def record_changes(session: Session, flush_context) -> None:
+    # new, dirty and deleted still describe what this flush wrote.
+    now = datetime.now(timezone.utc)
+    rows = [
+        change_row(instance, ChangeOperation.Insert, now)
+        for instance in session.new if type(instance) in TRACKED
+    ]
+    rows += [
+        change_row(instance, update_operation(instance), now)
+        for instance in session.dirty
+        if type(instance) in TRACKED and session.is_modified(instance, include_collections=False)
+    ]
+    rows += [
+        change_row(instance, ChangeOperation.Delete, now)
+        for instance in session.deleted if type(instance) in TRACKED
+    ]
+    if not rows:
+        return
+    connection = session.connection()
+    advisory_lock(connection, CHANGE_LOG_LOCK)
+    connection.execute(insert(change_table), sorted(rows, key=lambda row: (row["table_name"], row["row_id"])))
+
+
+def encode_change(row) -> bytes:
+    head = to_json({
+        "seq": row.seq,
+        "table_name": row.table_name,
+        "row_id": row.row_id,
+        "operation": row.operation.value,
+        "created_datetime": as_utc(row.created_datetime),
+    })
+    # data is stored encoded; splice it in rather than decoding and re-encoding.
+    data = row.data.encode() if row.data is not None else b"null"
+    return head[:-1] + b',"data":' + data + b"}\n"
+
+
+def stream_changes(
+        *,
+        since: int = 0,
+        limit: int = settings.CHANGES_MAX_LIMIT,
+        table_name: str | None = None,
+        bind: Engine,
+    ) -> Iterator[bytes]:
+    sent = 0
+    while sent < limit:
+        page = min(settings.CHANGES_PAGE_SIZE, limit - sent)
+        query = select(change_table).where(change_table.c.seq > since)
+        if table_name is not None:
+            query = query.where(change_table.c.table_name == table_name)
+        # One short read per page, so a long stream never pins a connection.
+        with bind.connect() as connection:
+            rows = connection.execute(query.order_by(change_table.c.seq).limit(page)).all()
+        for row in rows:
+            yield encode_change(row)
+        sent += len(rows)
+        if len(rows) < page:
+            return
+        since = rows[-1].seq
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from enum import Enum
+from sqlmodel import Field, SQLModel, Column, TIMESTAMP, Text, text
+
+
+class ChangeOperation(Enum):
+    Insert = "insert"
+    Update = "update"
+    Delete = "delete"
+
+
+class Change(SQLModel, table=True):
+    __tablename__ = "change_log"
+
+    seq: int | None = Field(default=None, primary_key=True)
+    table_name: str = Field()
+    row_id: int = Field()
+    operation: ChangeOperation = Field()
+    # The row as its public model, already encoded; null for deletes.
+    data: str | None = Field(default=None, sa_type=Text)
+    created_datetime: datetime = Field(sa_column=Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP"),
+    ),
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
+class ChangePublic(SQLModel):
+    seq: int
+    table_name: str
+    row_id: int
+    operation: ChangeOperation
+    data: dict | None
+    created_datetime: datetime
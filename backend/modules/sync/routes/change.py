@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from modules import settings
+from modules.auth.controllers.staff import get_current_staff
+from modules.auth.models.staff import Staff
+from modules.database.session import session_engine
+from modules.sync.controllers.change import stream_changes
+from modules.sync.models.change import ChangePublic
+
+
+router = APIRouter()
+
+
+class NDJSONResponse(StreamingResponse):
+    # Names the media type for the OpenAPI schema, which files the response
+    # model under the route's response class media type.
+    media_type = "application/x-ndjson"
+
+
+@router.get(
+    "/",
+    response_class=NDJSONResponse,
+    responses={200: {"model": ChangePublic, "description": "One change per line, in `seq` order."}},
+)
+def list_changes(
+    request: Request,
+    since: int = 0,
+    limit: int = settings.CHANGES_MAX_LIMIT,
+    table_name: str | None = None,
+    current_staff: Staff = Depends(get_current_staff),
+):
+    return NDJSONResponse(stream_changes(
+        since=since,
+        limit=min(limit, settings.CHANGES_MAX_LIMIT),
+        table_name=table_name,
+        bind=session_engine(request),
+    ))
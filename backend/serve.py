@@ -0,0 +1,63 @@
+"""Production entry point.
+
+Run ``python serve.py`` from the ``backend`` directory. The supervisor process
+checks (or applies) migrations exactly once, then forks uvicorn workers on
+uvloop/httptools. Each worker warms its connection pool in the app lifespan
+before it starts accepting connections, exits after ``--max-requests`` and is
+replaced by the supervisor. With a single worker there is no supervisor to
+replace it, so ``--max-requests`` only applies when ``--workers`` is above one.
+"""
+import argparse
+
+import uvicorn
+
+from modules import settings
+from modules.database.engine import engine
+from modules.database.migrations import check_schema_version, upgrade
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python serve.py")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--max-requests", type=int, default=settings.SERVER_MAX_REQUESTS,
+                        help="recycle a worker after this many requests (0 disables)")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT,
+                        help="seconds to drain in-flight requests on shutdown")
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE)
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--migrate", action="store_true", default=settings.SERVER_MIGRATE_ON_START,
+                        help="apply pending migrations before starting workers")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    if args.migrate:
+        upgrade(engine)
+    check_schema_version(engine)
+    # Workers must not inherit the supervisor's pooled connections.
+    engine.dispose()
+    # A lone worker runs in this process; recycling it would stop the server.
+    max_requests = args.max_requests if args.workers > 1 else 0
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        limit_max_requests=max_requests or None,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
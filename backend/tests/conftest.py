@@ -0,0 +1,92 @@
+"""Fixtures shared by the test suite.
+
+``bind`` runs each test that asks for it once per database: an SQLite file
+always, and PostgreSQL when ``HIMS_TEST_POSTGRES_URL`` points at a server the
+suite may create schemas on (each test gets its own, dropped afterwards).
+
+``client`` drives the whole app against ``HIMS_DATABASE_URL``, which defaults
+to an SQLite file in a temporary directory. Set it to a PostgreSQL URL to run
+the API tests against a server.
+"""
+import os
+import tempfile
+import uuid
+
+# Settings are read on import, so the environment is fixed before any module loads.
+os.environ.setdefault("HIMS_DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='hims-test-')}/database.db")
+os.environ.setdefault("HIMS_PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("HIMS_PASSWORD_HASH_ROUNDS", "1000")
+os.environ.setdefault("HIMS_LOG_ARCHIVE_ENABLED", "false")
+os.environ.setdefault("HIMS_PATIENT_ARCHIVE_ENABLED", "false")
+os.environ.setdefault("HIMS_PURGE_ENABLED", "false")
+# Every test logs in afresh, more often than the login rate limits allow.
+for bucket in ("USERNAME", "USERNAME_TOTAL", "IP"):
+    os.environ.setdefault(f"HIMS_LOGIN_{bucket}_BURST", "10000")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, inspect, text
+from sqlmodel import SQLModel, create_engine
+
+from modules.core.tiers import archive_metadata
+from modules.database.engine import engine
+from modules.database.migrations import upgrade
+
+
+POSTGRES_URL = os.environ.get("HIMS_TEST_POSTGRES_URL")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def bind(request, tmp_path):
+    if request.param == "sqlite":
+        test_engine = create_engine(f"sqlite:///{tmp_path}/database.db")
+        upgrade(test_engine)
+        yield test_engine
+        test_engine.dispose()
+        return
+
+    if not POSTGRES_URL:
+        pytest.skip("HIMS_TEST_POSTGRES_URL is not set")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    # public stays on the path so an already installed pg_trgm is found.
+    test_engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema},public"})
+    try:
+        upgrade(test_engine)
+        yield test_engine
+    finally:
+        test_engine.dispose()
+        with admin.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+@pytest.fixture(scope="session")
+def app():
+    upgrade(engine)
+    import main
+
+    return main.app
+
+
+@pytest.fixture
+def client(app):
+    with TestClient(app) as test_client:
+        yield test_client
+    with engine.begin() as connection:
+        existing = set(inspect(connection).get_table_names())
+        for table in [*reversed(SQLModel.metadata.sorted_tables), *reversed(archive_metadata.sorted_tables)]:
+            if table.name in existing:
+                connection.execute(delete(table))
+
+
+@pytest.fixture
+def register(client):
+    """Register and log in a staff member, returning their auth headers."""
+    def register(username: str) -> dict:
+        client.post("/auth/register", json={"email": f"{username}@hims.test", "username": username, "password": "secret"})
+        response = client.post("/auth/login", data={"username": username, "password": "secret"})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return register
@@ -0,0 +1,103 @@
+import json
+import sqlite3
+import time
+
+import pytest
+from sqlmodel import create_engine
+
+from modules.database import engine as engines
+
+
+def test_me_answers_for_each_staff_member(client, register):
+    alice, bob = register("alice"), register("bob")
+    assert client.get("/auth/me/", headers=alice).json()["username"] == "alice"
+    assert client.get("/auth/me/", headers=bob).json()["username"] == "bob"
+
+
+def test_requests_need_a_token(client):
+    assert client.get("/patient/").status_code == 401
+
+
+def test_patient_crud_and_soft_delete(client, register):
+    headers = register("alice")
+    created = client.post("/patient/", headers=headers, json={"first_name": "Ada", "last_name": "Lovelace", "gender": "F"})
+    assert created.status_code == 200
+    id = created.json()["id"]
+
+    updated = client.put(f"/patient/{id}/", headers=headers, json={"first_name": "Augusta"})
+    assert updated.json()["first_name"] == "Augusta"
+    assert [patient["id"] for patient in client.get("/patient/", headers=headers).json()] == [id]
+
+    assert client.delete(f"/patient/{id}/", headers=headers).status_code == 200
+    assert client.get("/patient/", headers=headers).json() == []
+    assert client.get(f"/patient/{id}/", headers=headers).status_code == 404
+
+
+def test_change_feed_follows_writes(client, register):
+    headers = register("alice")
+    id = client.post("/patient/", headers=headers, json={"first_name": "Ada", "last_name": "Lovelace", "gender": "F"}).json()["id"]
+    client.delete(f"/patient/{id}/", headers=headers)
+
+    lines = client.get("/changes/", headers=headers).text.splitlines()
+    changes = [change for change in map(json.loads, lines) if change["table_name"] == "patient"]
+    assert [(change["row_id"], change["operation"]) for change in changes] == [(id, "insert"), (id, "delete")]
+    assert changes[0]["data"]["first_name"] == "Ada"
+    assert changes[1]["data"] is None
+
+
+def test_batch_runs_reads_and_writes_in_order(client, register):
+    headers = register("alice")
+    response = client.post("/batch/", headers=headers, json={"requests": [
+        {"method": "POST", "path": "/room/", "body": {"name": "Ward A", "maximum_capacity": 2}},
+        {"path": "/room/"},
+        {"path": "/nope"},
+    ]})
+    assert response.status_code == 200
+    created, listed, missing = response.json()
+    assert created["status"] == 200
+    assert [room["name"] for room in listed["body"]] == ["Ward A"]
+    assert missing["status"] == 404
+
+
+def test_deleted_staff_username_can_be_registered_again(client, register):
+    headers = register("alice")
+    duplicate = {"email": "alice@hims.test", "username": "alice", "password": "secret"}
+    assert client.post("/auth/register", json=duplicate).status_code == 400
+
+    assert client.delete("/auth/", headers=headers).status_code == 200
+    assert client.post("/auth/register", json=duplicate).status_code == 200
+    assert client.post("/auth/register", json=duplicate).status_code == 400
+
+
+def test_change_feed_encodes_datetimes_alike(client, register):
+    headers = register("alice")
+    id = client.post("/patient/", headers=headers, json={"first_name": "Ada", "last_name": "Lovelace", "gender": "F"}).json()["id"]
+    client.put(f"/patient/{id}/", headers=headers, json={"first_name": "Augusta"})
+
+    lines = client.get("/changes/", headers=headers, params={"table_name": "patient"}).text.splitlines()
+    inserted, updated = map(json.loads, lines)
+    assert inserted["data"]["created_datetime"] == updated["data"]["created_datetime"]
+    for change in (inserted, updated):
+        assert change["data"]["updated_datetime"].endswith("Z")
+        assert change["created_datetime"].endswith("Z")
+        # Sub-second precision, from the application rather than the server default.
+        assert "." in change["created_datetime"]
+
+
+def test_change_feed_reads_own_writes_from_the_writer(client, register, tmp_path, monkeypatch):
+    if engines.engine.dialect.name != "sqlite":
+        pytest.skip("copies the database file to stand in for a replica")
+    headers = register("alice")
+    # A replica that stopped before the write below.
+    replica_path = tmp_path / "replica.db"
+    with sqlite3.connect(engines.engine.url.database) as source, sqlite3.connect(replica_path) as target:
+        source.backup(target)
+    replica = create_engine(f"sqlite:///{replica_path}")
+    monkeypatch.setattr(engines, "read_engines", [replica])
+    client.post("/patient/", headers=headers, json={"first_name": "Ada", "last_name": "Lovelace", "gender": "F"})
+
+    params = {"table_name": "patient"}
+    assert client.get("/changes/", headers=headers, params=params).text == ""
+    wrote = {**headers, "X-Last-Write": f"{time.time():.3f}"}
+    assert len(client.get("/changes/", headers=wrote, params=params).text.splitlines()) == 1
+    replica.dispose()
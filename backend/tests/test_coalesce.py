@@ -0,0 +1,102 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from modules.core.coalesce import coalesced, flights, per_caller
+
+
+def run_concurrently(wrapper, *calls: dict) -> list:
+    results = [None] * len(calls)
+
+    def call(index):
+        results[index] = wrapper(**calls[index])
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_different_staff_do_not_share_a_per_caller_flight():
+    # Both calls must be inside the endpoint at once, which only happens if
+    # neither joined the other's flight.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def retrieve_me(current_staff):
+        barrier.wait()
+        return current_staff.id
+
+    wrapper = coalesced(per_caller(retrieve_me), "/me/")
+    alice, bob = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    assert run_concurrently(wrapper, {"current_staff": alice}, {"current_staff": bob}) == [1, 2]
+
+
+def test_same_staff_share_a_flight():
+    entered, release = threading.Event(), threading.Event()
+    calls = []
+
+    def retrieve_me(current_staff):
+        calls.append(current_staff.id)
+        entered.set()
+        release.wait(5)
+        return current_staff.id
+
+    wrapper = coalesced(per_caller(retrieve_me), "/me/")
+    staff = SimpleNamespace(id=1)
+    leader = threading.Thread(target=wrapper, kwargs={"current_staff": staff})
+    leader.start()
+    entered.wait(5)
+    follower = []
+    thread = threading.Thread(target=lambda: follower.append(wrapper(current_staff=staff)))
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not any(flight.followers for flight in flights._flights.values()) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    thread.join()
+    assert calls == [1]
+    assert follower == [1]
+
+
+def test_different_staff_share_a_patient_list_flight(client, register):
+    from sqlalchemy import event
+
+    from modules.database.engine import engine
+
+    alice, bob = register("alice"), register("bob")
+    entered, release = threading.Event(), threading.Event()
+    patient_queries = []
+
+    def hold_first_patient_query(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM patient" in statement and "patient_archive" not in statement:
+            patient_queries.append(statement)
+            if len(patient_queries) == 1:
+                entered.set()
+                release.wait(5)
+
+    event.listen(engine, "before_cursor_execute", hold_first_patient_query)
+    try:
+        responses = {}
+        threads = [
+            threading.Thread(target=lambda name=name, headers=headers: responses.update(
+                {name: client.get("/patient/", headers=headers)}
+            ))
+            for name, headers in (("alice", alice), ("bob", bob))
+        ]
+        threads[0].start()
+        assert entered.wait(5)
+        threads[1].start()
+        deadline = time.monotonic() + 2
+        while not any(flight.followers for flight in flights._flights.values()) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        event.remove(engine, "before_cursor_execute", hold_first_patient_query)
+
+    assert len(patient_queries) == 1
+    assert responses["alice"].json() == responses["bob"].json() == []
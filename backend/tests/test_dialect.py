@@ -0,0 +1,113 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+from sqlmodel import Session
+
+from modules.core.purge import purge_tombstones
+from modules.database.dialect import advisory_lock, bulk_insert, is_postgresql, skip_locked, sync_sequence, upsert
+from modules.patient.models.patient import Patient, PatientStatus
+from modules.sync.models.change import Change
+
+
+patient_table = Patient.__table__
+
+
+def patient_rows(count: int, **values) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": id,
+            "first_name": f"First {id}",
+            "last_name": f"Last {id}",
+            "gender": "F",
+            "status": PatientStatus.Admitted,
+            "created_datetime": now,
+            "updated_datetime": now,
+            **values,
+        }
+        for id in range(1, count + 1)
+    ]
+
+
+def test_bulk_insert_keeps_types_and_sequence(bind):
+    with bind.begin() as connection:
+        bulk_insert(connection, patient_table, patient_rows(3))
+        sync_sequence(connection, patient_table)
+    with Session(bind) as session:
+        assert session.execute(select(Patient.status).order_by(Patient.id)).scalars().all() == [PatientStatus.Admitted] * 3
+        patient = Patient(first_name="New", last_name="Patient", gender="M")
+        session.add(patient)
+        session.commit()
+        assert patient.id == 4
+
+
+def test_skip_locked_claims_disjoint_rows(bind):
+    with bind.begin() as connection:
+        bulk_insert(connection, patient_table, patient_rows(2))
+    claim = skip_locked(select(patient_table.c.id).order_by(patient_table.c.id).limit(1))
+    with bind.connect() as first:
+        first.begin()
+        claimed = first.execute(claim).scalar()
+        if not is_postgresql(first):
+            # SQLite has one writer and ignores the clause; the query still runs.
+            assert claimed == 1
+            return
+        with bind.connect() as second:
+            second.begin()
+            assert second.execute(claim).scalar() != claimed
+
+
+def test_advisory_lock_is_held_until_commit(bind):
+    key = 0x7E57
+    with bind.connect() as holder:
+        holder.begin()
+        advisory_lock(holder, key)
+        if not is_postgresql(holder):
+            return
+        acquired = []
+
+        def contend():
+            with bind.connect() as other:
+                acquired.append(other.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar())
+
+        thread = threading.Thread(target=contend)
+        thread.start()
+        thread.join()
+        assert acquired == [False]
+        holder.commit()
+    with bind.connect() as other:
+        assert other.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar()
+
+
+def test_upsert_updates_on_conflict(bind):
+    from modules.auth.models.rate_limit import RateLimitBucket
+
+    table = RateLimitBucket.__table__
+    now = datetime.now(timezone.utc)
+    with bind.begin() as connection:
+        upsert(connection, table, {"key": "ip:1", "tokens": 5.0, "updated": now.timestamp()})
+        upsert(connection, table, {"key": "ip:1", "tokens": 2.0, "updated": now.timestamp()})
+        assert connection.execute(select(table.c.tokens)).scalars().all() == [2.0]
+
+
+def test_purge_removes_only_old_tombstones(bind):
+    long_ago = datetime.now(timezone.utc) - timedelta(days=400)
+    with bind.begin() as connection:
+        bulk_insert(connection, patient_table, patient_rows(1, deleted_datetime=long_ago))
+        bulk_insert(connection, patient_table, [{**patient_rows(2)[1], "deleted_datetime": None}])
+    assert purge_tombstones(bind, older_than=datetime.now(timezone.utc) - timedelta(days=30)) == 1
+    with bind.connect() as connection:
+        assert connection.execute(select(patient_table.c.id)).scalars().all() == [2]
+
+
+def test_changes_are_recorded_with_the_flush(bind):
+    with Session(bind) as session:
+        patient = Patient(first_name="Ada", last_name="Lovelace", gender="F")
+        session.add(patient)
+        session.commit()
+        patient.first_name = "Augusta"
+        session.add(patient)
+        session.commit()
+        operations = session.execute(select(Change.operation).order_by(Change.seq)).scalars().all()
+    assert [operation.value for operation in operations] == ["insert", "update"]
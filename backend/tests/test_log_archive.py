@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, inspect, select
+from sqlmodel import Session
+
+from modules.auth.controllers.log import get_log_all
+from modules.auth.controllers.log_archive import archive_logs, log_sources, month_key
+from modules.auth.models.log import Log
+from modules.auth.models.staff import Staff
+
+
+def test_old_logs_move_into_month_tables(bind):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=400)
+    with Session(bind) as session:
+        staff = Staff(email="alice@hims.test", username="alice", hashed_password="x")
+        session.add(staff)
+        session.commit()
+        session.add_all([
+            Log(text="old", staff_id=staff.id, created_datetime=old),
+            Log(text="new", staff_id=staff.id, created_datetime=now),
+        ])
+        session.commit()
+
+    assert archive_logs(bind, older_than=now - timedelta(days=90)) == 1
+    # A second pass finds the month's table already there.
+    assert archive_logs(bind, older_than=now - timedelta(days=90)) == 0
+
+    table_name = f"log_archive_{month_key(old)}"
+    assert inspect(bind).has_table(table_name)
+    [archive] = [table for table in log_sources(bind) if table.name == table_name]
+    with bind.connect() as connection:
+        row = connection.execute(select(archive)).one()
+        assert row.text == "old"
+        assert row.archived_datetime is not None
+        assert connection.execute(select(Log.text)).scalars().all() == ["new"]
+
+
+def test_log_listing_reads_archives_only_when_asked(bind):
+    now = datetime.now(timezone.utc)
+    old = now - timedelta(days=400)
+    with Session(bind) as session:
+        staff = Staff(email="alice@hims.test", username="alice", hashed_password="x")
+        session.add(staff)
+        session.commit()
+        session.add_all([
+            Log(text="old", staff_id=staff.id, created_datetime=old),
+            Log(text="new", staff_id=staff.id, created_datetime=now),
+        ])
+        session.commit()
+    archive_logs(bind, older_than=now - timedelta(days=90))
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        with Session(bind) as session:
+            assert [log.text for log in get_log_all(session=session)] == ["new"]
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    assert statements
+    assert not any("log_archive" in statement for statement in statements)
+
+    with Session(bind) as session:
+        assert [log.text for log in get_log_all(session=session, include_archived=True)] == ["old", "new"]
+        assert [log.text for log in get_log_all(session=session, created_datetime__lt=now - timedelta(days=90))] == ["old"]
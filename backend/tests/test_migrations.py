@@ -0,0 +1,33 @@
+from sqlalchemy import inspect
+
+from modules.database.migrations import TRIGRAM_COLUMNS, check_schema_version, latest_version, upgrade
+
+
+def test_upgrade_is_idempotent(bind):
+    assert upgrade(bind) == []
+    assert check_schema_version(bind) == latest_version()
+
+
+def test_partial_indexes(bind):
+    indexes = {index["name"] for index in inspect(bind).get_indexes("patient")}
+    assert {"ix_patient_admitted", "ix_patient_live", "ix_patient_deleted"} <= indexes
+
+
+def test_staff_identity_is_unique_among_live_rows(bind):
+    indexes = {index["name"]: index for index in inspect(bind).get_indexes("staff")}
+    assert not indexes["ix_staff_username"]["unique"]
+    assert indexes["ix_staff_username_live"]["unique"]
+    assert indexes["ix_staff_email_live"]["unique"]
+
+
+def test_trigram_indexes_only_on_postgresql(bind):
+    names = {
+        index["name"]
+        for table in {table for table, _ in TRIGRAM_COLUMNS}
+        for index in inspect(bind).get_indexes(table)
+    }
+    trigram = {f"ix_{table}_{column}_trgm" for table, column in TRIGRAM_COLUMNS}
+    if bind.dialect.name == "postgresql":
+        assert trigram <= names
+    else:
+        assert not trigram & names
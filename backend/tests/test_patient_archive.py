@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+from modules.database.engine import engine
+from modules.patient.controllers.archive import archive_discharged_patients
+
+
+def admit(client, headers, first_name: str = "Ada") -> tuple[int, int]:
+    room = client.post("/room/", headers=headers, json={"name": f"Room {first_name}", "maximum_capacity": 2}).json()
+    patient = client.post("/patient/", headers=headers, json={"first_name": first_name, "last_name": "L", "gender": "F"}).json()
+    admission = client.post("/admission/", headers=headers, json={"patient_id": patient["id"], "room_id": room["id"]}).json()
+    client.post("/note/", headers=headers, json={"text": "Stable", "admission_id": admission["id"]})
+    return patient["id"], room["id"]
+
+
+def test_discharge_sets_discharged_datetime(client, register):
+    headers = register("alice")
+    patient_id, _ = admit(client, headers)
+    assert client.get(f"/patient/{patient_id}/", headers=headers).json()["discharged_datetime"] is None
+
+    [admission] = client.get("/admission/", headers=headers, params={"patient_id": patient_id}).json()
+    client.delete(f"/admission/{admission['id']}/", headers=headers)
+    patient = client.get(f"/patient/{patient_id}/", headers=headers).json()
+    assert patient["status"] == "D"
+    assert patient["discharged_datetime"] is not None
+
+
+def test_archiver_ages_patients_by_discharge(client, register):
+    headers = register("alice")
+    discharged_id, _ = admit(client, headers, "Ada")
+    admitted_id, _ = admit(client, headers, "Grace")
+    [admission] = client.get("/admission/", headers=headers, params={"patient_id": discharged_id}).json()
+    client.delete(f"/admission/{admission['id']}/", headers=headers)
+    # Editing an admitted patient must not make them look discharged.
+    client.put(f"/patient/{admitted_id}/", headers=headers, json={"phone": "555"})
+
+    soon = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert archive_discharged_patients(engine, older_than=soon) == 1
+    assert [patient["id"] for patient in client.get("/patient/", headers=headers).json()] == [admitted_id]
+
+
+def archive_after_discharge(client, headers, first_name: str = "Ada") -> tuple[int, int]:
+    patient_id, room_id = admit(client, headers, first_name)
+    [admission] = client.get("/admission/", headers=headers, params={"patient_id": patient_id}).json()
+    client.delete(f"/admission/{admission['id']}/", headers=headers)
+    assert archive_discharged_patients(engine, older_than=datetime.now(timezone.utc) + timedelta(seconds=1)) == 1
+    return patient_id, room_id
+
+
+def test_readmission_restores_an_archived_patient(client, register):
+    headers = register("alice")
+    patient_id, room_id = archive_after_discharge(client, headers)
+
+    response = client.post("/admission/", headers=headers, json={"patient_id": patient_id, "room_id": room_id})
+    assert response.status_code == 200
+    assert client.get("/patient/", headers=headers, params={"status": "A"}).json()[0]["id"] == patient_id
+    # Their earlier notes came back with them.
+    assert [note["text"] for note in client.get("/note/", headers=headers).json()] == ["Stable"]
+    archived = client.get("/admission/", headers=headers, params={"include_archived": True, "patient_id": patient_id}).json()
+    assert archived == [response.json()]
+
+
+def test_update_restores_an_archived_patient(client, register):
+    headers = register("alice")
+    patient_id, _ = archive_after_discharge(client, headers)
+
+    response = client.put(f"/patient/{patient_id}/", headers=headers, json={"phone": "555"})
+    assert response.status_code == 200
+    assert [patient["id"] for patient in client.get("/patient/", headers=headers).json()] == [patient_id]
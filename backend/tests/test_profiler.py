@@ -0,0 +1,38 @@
+import asyncio
+
+from modules.monitoring.controllers.profiler import active_profiles, profiled, render_profile, start_profile, stop_profile
+
+
+def test_sync_and_async_endpoints_are_profiled_once():
+    def add(a, b):
+        return a + b
+
+    async def add_async(a, b):
+        return a + b
+
+    profiles = []
+    token = active_profiles.set(profiles)
+    try:
+        # Wrapping twice, as include_router does, must not start a second profile.
+        assert profiled(profiled(add))(1, 2) == 3
+        assert asyncio.run(profiled(profiled(add_async))(3, 4)) == 7
+    finally:
+        active_profiles.reset(token)
+    assert len(profiles) == 2
+
+
+def test_overlapping_request_runs_unprofiled():
+    def add(a, b):
+        return a + b
+
+    held = start_profile()
+    assert held is not None
+    profiles = []
+    token = active_profiles.set(profiles)
+    try:
+        assert profiled(add)(1, 2) == 3
+    finally:
+        active_profiles.reset(token)
+        stop_profile(held, [])
+    assert profiles == []
+    assert render_profile(profiles).startswith("No profile was collected")
@@ -1,12 +1,21 @@
 import streamlit as st
-from utils import BackendClient
+import os
+from utils import BackendClient, Transport
 
 st.set_page_config(page_title="Hospital Management System", layout="wide")
 
-client = BackendClient(base_url="http://localhost:8000")
+
+@st.cache_resource
+def get_transport() -> Transport:
+    """One pooled transport for the whole Streamlit process."""
+    return Transport(
+        base_url=os.environ.get("HIMS_BACKEND_URL", "http://localhost:8000"),
+        pool_size=int(os.environ.get("HIMS_FRONTEND_POOL_SIZE", "32")),
+    )
+
 
 if "client" not in st.session_state:
-    st.session_state["client"] = client
+    st.session_state["client"] = BackendClient(transport=get_transport())
 
 st.title("Hospital Management System")
 st.write("Use the sidebar to navigate through different sections.")
\ No newline at end of file
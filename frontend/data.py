@@ -0,0 +1,130 @@
+"""Cached, paged list data for the Streamlit pages.
+
+Pages of list results are fetched through ``st.cache_data``. The cache key is
+the resource, its filters, the page, the caller's token and a per-resource
+version. A create, update or delete made through ``mutate`` bumps that version.
+Every session then refetches the resource on its next rerun rather than
+serving rows from before the change.
+
+Results are kept as Arrow tables and rendered with ``st.dataframe``, which
+draws only the rows in view. ``paged_table`` fetches one more page each time
+the user asks for more rows.
+"""
+import threading
+from typing import Callable
+
+import pyarrow as pa
+import streamlit as st
+
+from utils import BackendClient
+
+
+CACHE_TTL_SECONDS = 60
+DEFAULT_PAGE_SIZE = 50
+
+LIST_METHODS = {
+    "patient": "list_patients",
+    "room": "list_rooms",
+    "admission": "list_admissions",
+    "note": "list_notes",
+    "log": "list_logs",
+}
+
+# Mutations that change other resources too: admissions set patient status, and
+# deletes cascade from patients and rooms to admissions and their notes.
+DEPENDENTS = {
+    "patient": ("admission", "note"),
+    "room": ("admission", "note"),
+    "admission": ("patient", "note"),
+}
+
+_versions: dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def version(resource: str) -> int:
+    return _versions.get(resource, 0)
+
+
+def invalidate(resource: str):
+    """Make cached pages of ``resource`` and its dependents stale for every session."""
+    with _versions_lock:
+        for name in (resource, *DEPENDENTS.get(resource, ())):
+            _versions[name] = _versions.get(name, 0) + 1
+
+
+def mutate(resource: str, call, *args, **kwargs):
+    """Run a create/update/delete client call, then invalidate ``resource``."""
+    response = call(*args, **kwargs)
+    invalidate(resource)
+    return response
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=1000, show_spinner=False)
+def fetch_page(
+    _client: BackendClient,
+    resource: str,
+    token: str | None,
+    version: int,
+    filters: tuple,
+    offset: int,
+    limit: int,
+    fields: tuple[str, ...] | None = None,
+    include: tuple[str, ...] = (),
+    _shape: Callable[[dict], dict] | None = None,
+) -> pa.Table:
+    """Fetch one page as an Arrow table. ``token`` and ``version`` only key the cache.
+
+    ``_shape`` flattens rows with embedded ``include`` relations into table
+    columns. It is left out of the cache key, so a resource fetched with the
+    same includes must always be shaped the same way.
+    """
+    options = {"include": list(include)} if include else {}
+    if fields:
+        options["fields"] = list(fields)
+    rows = getattr(_client, LIST_METHODS[resource])(**dict(filters), offset=offset, limit=limit, **options)
+    if _shape is not None:
+        rows = [_shape(row) for row in rows]
+    return pa.Table.from_pylist(rows)
+
+
+def paged_table(
+    client: BackendClient,
+    resource: str,
+    filters: dict,
+    *,
+    key: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    fields: tuple[str, ...] | None = None,
+    include: tuple[str, ...] = (),
+    shape: Callable[[dict], dict] | None = None,
+) -> int:
+    """Render the filtered list of ``resource`` with a "Load more" button.
+
+    ``fields`` names the columns to fetch and show, in order; the backend then
+    reads only those. The number of loaded pages lives in
+    ``st.session_state[key]`` and resets when the filters change. Returns the
+    number of rows shown.
+    """
+    filters_key = tuple(sorted((name, value) for name, value in filters.items() if value is not None))
+    state = st.session_state.setdefault(key, {"filters": filters_key, "pages": 1})
+    if state["filters"] != filters_key:
+        state.update(filters=filters_key, pages=1)
+
+    tables = [
+        fetch_page(client, resource, client.token, version(resource), filters_key, page * page_size, page_size, fields, include, shape)
+        for page in range(state["pages"])
+    ]
+    loaded = [table for table in tables if table.num_rows]
+    if not loaded:
+        st.info(f"No {resource}s found with the given filters.")
+        return 0
+
+    # Columns that were all null on one page are typed null; promotion unifies them.
+    table = pa.concat_tables(loaded, promote_options="default")
+    st.dataframe(table, use_container_width=True, hide_index=True)
+    st.caption(f"{table.num_rows} {resource}s loaded")
+    if tables[-1].num_rows == page_size and st.button("Load more", key=f"{key}_more"):
+        state["pages"] += 1
+        st.rerun()
+    return table.num_rows
@@ -1,5 +1,16 @@
 import streamlit as st
 from utils import BackendClient
+from data import DEFAULT_PAGE_SIZE, mutate, paged_table
+
+ADMISSION_COLUMNS = ("id", "patient_id", "room_id", "staff_id", "created_datetime")
+
+def admission_row(admission: dict) -> dict:
+    return {
+        **{key: value for key, value in admission.items() if key not in ("patient", "room", "staff")},
+        "patient_name": f"{admission['patient']['first_name']} {admission['patient']['last_name']}" if admission.get("patient") else None,
+        "room_name": admission["room"]["name"] if admission.get("room") else None,
+        "staff_username": admission["staff"]["username"] if admission.get("staff") else None,
+    }
 
 def admissions_view():
     st.title("Admissions Management")
@@ -20,13 +31,9 @@ def admissions_view():
     with col3:
         staff_id_filter = st.number_input("Staff ID (optional)", min_value=0, value=0)
     with col4:
-        offset = st.number_input("Offset", min_value=0, value=0)
-        limit = st.number_input("Limit", min_value=1, value=10)
+        page_size = st.number_input("Rows per page", min_value=1, value=DEFAULT_PAGE_SIZE)
 
-    query_params = {
-        "offset": offset,
-        "limit": limit,
-    }
+    query_params = {}
     if patient_id_filter > 0:
         query_params["patient_id"] = patient_id_filter
     if room_id_filter > 0:
@@ -34,20 +41,23 @@ def admissions_view():
     if staff_id_filter > 0:
         query_params["staff_id"] = staff_id_filter
 
-    search_button = st.button("Search Admissions")
-
-    if search_button:
-        with st.spinner("Fetching admissions..."):
-            try:
-                admissions_data = client.list_admissions(**query_params)
-                st.success("Admissions fetched successfully!")
-                results = admissions_data
-                if results:
-                    st.table(results)
-                else:
-                    st.info("No admissions found with the given filters.")
-            except Exception as e:
-                st.error(f"Error fetching admissions: {e}")
+    if st.button("Search Admissions"):
+        st.session_state["admission_search"] = query_params
+
+    if "admission_search" in st.session_state:
+        try:
+            paged_table(
+                client,
+                "admission",
+                st.session_state["admission_search"],
+                key="admission_table",
+                page_size=page_size,
+                fields=ADMISSION_COLUMNS,
+                include=("patient", "room", "staff"),
+                shape=admission_row,
+            )
+        except Exception as e:
+            st.error(f"Error fetching admissions: {e}")
 
     st.write("---")
     st.write("### Create a New Admission")
@@ -71,7 +81,7 @@ def admissions_view():
                 with st.spinner("Creating new admission..."):
                     try:
                         print(admission_data)
-                        response = client.create_admission(admission_data=admission_data)
+                        response = mutate("admission", client.create_admission, admission_data=admission_data)
                         st.success(f"Admission created successfully! ID: {response.get('id')}")
                     except Exception as e:
                         if "Room Does not exist" in str(e):
@@ -107,7 +117,7 @@ def admissions_view():
 
                 with st.spinner("Updating admission..."):
                     try:
-                        response = client.update_admission(admission_id, admission_update_data)
+                        response = mutate("admission", client.update_admission, admission_id, admission_update_data)
                         st.success(f"Admission updated successfully! ID: {response.get('id')}")
                     except Exception as e:
                         st.error(f"Error updating admission: {e}")
@@ -122,7 +132,7 @@ def admissions_view():
         if submitted_delete:
             with st.spinner("Deleting admission..."):
                 try:
-                    response = client.delete_admission(delete_admission_id)
+                    response = mutate("admission", client.delete_admission, delete_admission_id)
                     st.success(f"Admission deleted successfully! ID: {delete_admission_id}")
                 except Exception as e:
                     st.error(f"Error deleting admission: {e}")
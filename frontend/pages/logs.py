@@ -1,7 +1,10 @@
 import streamlit as st
 from utils import BackendClient
+from data import DEFAULT_PAGE_SIZE, mutate, paged_table
 from datetime import datetime, time
 
+LOG_COLUMNS = ("id", "staff_id", "text", "created_datetime")
+
 def logs_view():
     st.title("Logs Management")
 
@@ -19,33 +22,23 @@ def logs_view():
     with col2:
         staff_id_filter = st.number_input("Staff ID (optional)", min_value=0, value=0)
     with col3:
-        offset = st.number_input("Offset", min_value=0, value=0)
-        limit = st.number_input("Limit", min_value=1, value=10)
+        page_size = st.number_input("Rows per page", min_value=1, value=DEFAULT_PAGE_SIZE)
 
-    query_params = {
-        "offset": offset,
-        "limit": limit
-    }
+    query_params = {}
 
     if text_filter.strip():
         query_params["text"] = text_filter.strip()
     if staff_id_filter > 0:
         query_params["staff_id"] = staff_id_filter
 
-    search_button = st.button("Search Logs")
+    if st.button("Search Logs"):
+        st.session_state["log_search"] = query_params
 
-    if search_button:
-        with st.spinner("Fetching logs..."):
-            try:
-                logs_data = client.list_logs(**query_params)
-                st.success("Logs fetched successfully!")
-                results = logs_data
-                if results:
-                    st.table(results)
-                else:
-                    st.info("No logs found with the given filters.")
-            except Exception as e:
-                st.error(f"Error fetching logs: {e}")
+    if "log_search" in st.session_state:
+        try:
+            paged_table(client, "log", st.session_state["log_search"], key="log_table", page_size=page_size, fields=LOG_COLUMNS)
+        except Exception as e:
+            st.error(f"Error fetching logs: {e}")
 
     st.write("---")
     st.write("### Create a New Log Entry")
@@ -66,7 +59,7 @@ def logs_view():
                 }
                 with st.spinner("Creating new log entry..."):
                     try:
-                        response = client.create_log(log_data=log_data)
+                        response = mutate("log", client.create_log, log_data=log_data)
                         st.success(f"Log created successfully! ID: {response.get('id')}")
                     except Exception as e:
                         st.error(f"Error creating log entry: {e}")
@@ -79,7 +72,7 @@ def logs_view():
     if delete_button:
         with st.spinner("Deleting log entry..."):
             try:
-                response = client.delete_log(log_id=delete_log_id)
+                response = mutate("log", client.delete_log, log_id=delete_log_id)
                 if response:
                     st.success(f"Log with ID {delete_log_id} deleted successfully!")
                 else:
@@ -1,7 +1,10 @@
 import streamlit as st
 from utils import BackendClient
+from data import DEFAULT_PAGE_SIZE, mutate, paged_table
 from datetime import datetime, time
 
+NOTE_COLUMNS = ("id", "admission_id", "staff_id", "text", "created_datetime")
+
 def notes_view():
     st.title("Notes Management")
 
@@ -21,13 +24,9 @@ def notes_view():
     with col3:
         staff_id_filter = st.number_input("Staff ID (optional)", min_value=0, value=0)
     with col4:
-        offset = st.number_input("Offset", min_value=0, value=0)
-        limit = st.number_input("Limit", min_value=1, value=10)
+        page_size = st.number_input("Rows per page", min_value=1, value=DEFAULT_PAGE_SIZE)
 
-    query_params = {
-        "offset": offset,
-        "limit": limit
-    }
+    query_params = {}
 
     if text_filter.strip():
         query_params["text"] = text_filter.strip()
@@ -36,20 +35,14 @@ def notes_view():
     if staff_id_filter > 0:
         query_params["staff_id"] = staff_id_filter
 
-    search_button = st.button("Search Notes")
+    if st.button("Search Notes"):
+        st.session_state["note_search"] = query_params
 
-    if search_button:
-        with st.spinner("Fetching notes..."):
-            try:
-                notes_data = client.list_notes(**query_params)
-                st.success("Notes fetched successfully!")
-                results = notes_data
-                if results:
-                    st.table(results)
-                else:
-                    st.info("No notes found with the given filters.")
-            except Exception as e:
-                st.error(f"Error fetching notes: {e}")
+    if "note_search" in st.session_state:
+        try:
+            paged_table(client, "note", st.session_state["note_search"], key="note_table", page_size=page_size, fields=NOTE_COLUMNS)
+        except Exception as e:
+            st.error(f"Error fetching notes: {e}")
 
     st.write("---")
 
@@ -72,7 +65,7 @@ def notes_view():
                 }
                 with st.spinner("Creating new note..."):
                     try:
-                        response = client.create_note(note_data=note_data)
+                        response = mutate("note", client.create_note, note_data=note_data)
                         st.success(f"Note created successfully! ID: {response.get('id')}")
                     except Exception as e:
                         st.error(f"Error creating note: {e}")
@@ -86,7 +79,7 @@ def notes_view():
     if delete_button:
         with st.spinner("Deleting note..."):
             try:
-                response = client.delete_note(note_id=delete_note_id)
+                response = mutate("note", client.delete_note, note_id=delete_note_id)
                 if response:
                     st.success(f"Note with ID {delete_note_id} deleted successfully!")
                 else:
@@ -117,7 +110,7 @@ def notes_view():
                 }
                 with st.spinner("Updating note..."):
                     try:
-                        response = client.update_note(note_id=update_note_id, note_data=note_data)
+                        response = mutate("note", client.update_note, note_id=update_note_id, note_data=note_data)
                         if response:
                             st.success(f"Note with ID {update_note_id} updated successfully!")
                         else:
@@ -1,5 +1,8 @@
 import streamlit as st
 from utils import BackendClient, PatientStatus
+from data import DEFAULT_PAGE_SIZE, mutate, paged_table
+
+PATIENT_COLUMNS = ("id", "first_name", "last_name", "gender", "email", "phone", "status", "created_datetime")
 
 def patients_view():
     st.title("Patients Management")
@@ -25,16 +28,13 @@ def patients_view():
         status_filter = st.selectbox("Status", options=["", "Registered", "Admitted", "Discharged"], index=0)
         gender_filter = st.selectbox("Gender", options=["", "Male", "Female", "Other"], index=0)
 
-    offset = st.number_input("Offset", min_value=0, value=0)
-    limit = st.number_input("Limit", min_value=1, value=10)
+    page_size = st.number_input("Rows per page", min_value=1, value=DEFAULT_PAGE_SIZE)
 
     query_params = {
         "first_name": first_name_filter.strip() if first_name_filter.strip() else None,
         "last_name": last_name_filter.strip() if last_name_filter.strip() else None,
         "email": email_filter.strip() if email_filter.strip() else None,
         "phone": phone_filter.strip() if phone_filter.strip() else None,
-        "offset": offset,
-        "limit": limit
     }
 
     if status_filter:
@@ -48,20 +48,14 @@ def patients_view():
     if gender_filter:
         query_params["gender"] = gender_filter
 
-    search_button = st.button("Search")
+    if st.button("Search"):
+        st.session_state["patient_search"] = query_params
 
-    if search_button:
-        with st.spinner("Fetching patients..."):
-            try:
-                patients_data = client.list_patients(**query_params)
-                st.success("Patients fetched successfully!")
-                results = patients_data
-                if results:
-                    st.table(results)
-                else:
-                    st.info("No patients found with the given filters.")
-            except Exception as e:
-                st.error(f"Error fetching patients: {e}")
+    if "patient_search" in st.session_state:
+        try:
+            paged_table(client, "patient", st.session_state["patient_search"], key="patient_table", page_size=page_size, fields=PATIENT_COLUMNS)
+        except Exception as e:
+            st.error(f"Error fetching patients: {e}")
 
     st.write("---")
 
@@ -104,7 +98,7 @@ def patients_view():
                                     "gender": updated_gender
                                 }
 
-                                response = client.update_patient(patient_id=update_patient_id, patient_data=update_data)
+                                response = mutate("patient", client.update_patient, patient_id=update_patient_id, patient_data=update_data)
                                 if response:
                                     st.success(f"Patient ID {update_patient_id} updated successfully!")
                                 else:
@@ -124,7 +118,7 @@ def patients_view():
         if st.button("Delete Patient"):
             with st.spinner(f"Deleting Patient ID {delete_patient_id}..."):
                 try:
-                    response = client.delete_patient(patient_id=delete_patient_id)
+                    response = mutate("patient", client.delete_patient, patient_id=delete_patient_id)
                     if response:
                         st.success(f"Patient ID {delete_patient_id} deleted successfully!")
                     else:
@@ -167,7 +161,7 @@ def patients_view():
                 }
                 with st.spinner("Creating new patient..."):
                     try:
-                        response = client.create_patient(patient_data=patient_data)
+                        response = mutate("patient", client.create_patient, patient_data=patient_data)
                         st.success(f"Patient created successfully! ID: {response.get('id')}")
                     except Exception as e:
                         st.error(f"Error creating patient: {e}")
@@ -1,5 +1,8 @@
 import streamlit as st
 from utils import BackendClient
+from data import DEFAULT_PAGE_SIZE, mutate, paged_table
+
+ROOM_COLUMNS = ("id", "name", "maximum_capacity", "created_datetime")
 
 def rooms_view():
     st.title("Rooms Management")
@@ -24,22 +27,16 @@ def rooms_view():
         if max_capacity_lte > 0:
             query_params["maximum_capacity__lte"] = max_capacity_lte
 
-    st.write("Adjust offset and limit for pagination if needed:")
-    offset = st.number_input("Offset", min_value=0, value=0)
-    limit = st.number_input("Limit", min_value=1, value=10)
-    query_params["offset"] = offset
-    query_params["limit"] = limit
+    page_size = st.number_input("Rows per page", min_value=1, value=DEFAULT_PAGE_SIZE)
 
     if st.button("Search"):
-        with st.spinner("Fetching rooms..."):
-            rooms_data = client.list_rooms(**query_params)
-            st.success("Rooms fetched successfully!")
+        st.session_state["room_search"] = query_params
 
-            results = rooms_data.get("results", []) if "results" in rooms_data else rooms_data
-            if results:
-                st.table(results)
-            else:
-                st.info("No rooms found for the given filters.")
+    if "room_search" in st.session_state:
+        try:
+            paged_table(client, "room", st.session_state["room_search"], key="room_table", page_size=page_size, fields=ROOM_COLUMNS)
+        except Exception as e:
+            st.error(f"Error fetching rooms: {e}")
 
     st.write("---")
     st.write("### Create a New Room")
@@ -58,7 +55,7 @@ def rooms_view():
                 }
                 
                 try:
-                    response = client.create_room(room_data)  # Assuming this function is available in BackendClient
+                    response = mutate("room", client.create_room, room_data)
                     st.success(f"Room '{room_name}' created successfully!")
                 except Exception as e:
                     st.error(f"Error creating room: {e}")
@@ -82,7 +79,7 @@ def rooms_view():
                     room_data["maximum_capacity"] = new_room_capacity
                 
                 try:
-                    response = client.update_room(room_id, room_data)
+                    response = mutate("room", client.update_room, room_id, room_data)
                     st.success(f"Room ID {room_id} updated successfully!")
                 except Exception as e:
                     st.error(f"Error updating room: {e}")
@@ -98,7 +95,7 @@ def rooms_view():
         if submitted_delete and room_id_to_delete:
             with st.spinner("Deleting room..."):
                 try:
-                    response = client.delete_room(room_id_to_delete)
+                    response = mutate("room", client.delete_room, room_id_to_delete)
                     st.success(f"Room ID {room_id_to_delete} deleted successfully!")
                 except Exception as e:
                     st.error(f"Error deleting room: {e}")
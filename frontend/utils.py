@@ -1,18 +1,67 @@
 import requests
 from datetime import datetime
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from enum import Enum
 
+try:
+    import brotli  # noqa: F401  (lets urllib3 decode br responses)
+    ACCEPT_ENCODING = "br, gzip"
+except ImportError:
+    ACCEPT_ENCODING = "gzip"
+
 class PatientStatus(str, Enum):
     Registered = "R"
     Admitted = "A"
     Discharged = "D"
 
 
-class BackendClient:
-    def __init__(self, base_url: str):
+class Transport:
+    """Process-wide HTTP transport shared by every Streamlit session.
+
+    Wraps one ``requests.Session`` whose adapter keeps a bounded pool of
+    keep-alive connections per host. It holds no credentials: cookies are
+    refused so one user's login cookie can never be replayed for another, and
+    each call carries the caller's headers. urllib3's pool is thread-safe, so
+    script threads of different sessions can share it.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = 32):
         self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        response = self.session.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def close(self):
+        self.session.close()
+
+
+class BackendClient:
+    """Per-session API handle: a token layered over a shared ``Transport``.
+
+    ``BackendClient(base_url)`` still works and builds a private transport.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, transport: Optional[Transport] = None):
+        if transport is None:
+            transport = Transport(base_url)
+        self.transport = transport
         self.token = None
+        # Echoed back so reads right after a write go to the primary database.
+        self.last_write = None
+
+    @property
+    def base_url(self) -> str:
+        return self.transport.base_url
 
     def set_token(self, token: str):
         """Set the authentication token for subsequent requests."""
@@ -20,38 +69,34 @@ class BackendClient:
 
     def _headers(self):
         """Construct headers including authorization token if available."""
-        headers = {"Content-Type": "application/json"}
+        headers = {"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
+        if self.last_write:
+            headers["X-Last-Write"] = self.last_write
         return headers
 
+    def _request(self, method: str, endpoint: str, **kwargs):
+        """Send a request and remember when the backend last saw us write."""
+        response = self.transport.request(method, endpoint, headers=self._headers(), **kwargs)
+        self.last_write = response.headers.get("X-Last-Write", self.last_write)
+        return response.json()
+
     def _get(self, endpoint: str, params: dict = None):
         """Send a GET request."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.get(url, headers=self._headers(), params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._request("GET", endpoint, params=params)
 
     def _post(self, endpoint: str, data: dict = None):
         """Send a POST request."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.post(url, headers=self._headers(), json=data)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", endpoint, json=data)
 
     def _put(self, endpoint: str, data: dict = None):
         """Send a PUT request."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.put(url, headers=self._headers(), json=data)
-        response.raise_for_status()
-        return response.json()
+        return self._request("PUT", endpoint, json=data)
 
     def _delete(self, endpoint: str, params: dict = None):
         """Send a DELETE request."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        response = requests.delete(url, headers=self._headers(), params=params)
-        response.raise_for_status()
-        return response.json()
+        return self._request("DELETE", endpoint, params=params)
 
     # ------------------------------
     # Authentication/Staff Endpoints
@@ -61,11 +106,8 @@ class BackendClient:
         Login and retrieve an access token.
         """
         data = {"username": username, "password": password}
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        url = f"{self.base_url}/auth/login"
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        json_resp = response.json()
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept-Encoding": ACCEPT_ENCODING}
+        json_resp = self.transport.request("POST", "/auth/login", headers=headers, data=data).json()
 
         token = json_resp.get("access_token")
         if token:
@@ -73,9 +115,22 @@ class BackendClient:
         return json_resp
 
     def logout(self):
-        """Logout by clearing the token locally."""
+        """Revoke the session on the server, then clear the token locally."""
+        if self.token:
+            try:
+                self._post("/auth/logout")
+            except requests.RequestException:
+                pass
         self.set_token(None)
 
+    def batch(self, requests_: list[dict]):
+        """Send several API calls in one round trip.
+
+        Each item is ``{"method", "path", "params", "body"}`` (method defaults to GET).
+        Returns one ``{"status", "body"}`` per item, in order.
+        """
+        return self._post("/batch/", data={"requests": requests_})
+
     def register_staff(self, staff_data: dict):
         """Register a new staff member."""
         return self._post("/auth/register", data=staff_data)
@@ -115,6 +170,7 @@ class BackendClient:
         updated_datetime__lt: Optional[datetime] = None,
         updated_datetime__gte: Optional[datetime] = None,
         updated_datetime__lte: Optional[datetime] = None,
+        fields: Optional[list[str]] = None,
     ):
         """List staff with extensive filtering options."""
         params = {
@@ -136,6 +192,8 @@ class BackendClient:
             "updated_datetime__gte": updated_datetime__gte.isoformat() if updated_datetime__gte else None,
             "updated_datetime__lte": updated_datetime__lte.isoformat() if updated_datetime__lte else None,
         }
+        if fields:
+            params["fields"] = ",".join(fields)
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/auth/", params=params)
 
@@ -190,6 +248,7 @@ class BackendClient:
         updated_datetime__lte: Optional[datetime] = None,
         offset: int = 0,
         limit: int = 10,
+        fields: Optional[list[str]] = None,
     ):
         """List patients with extensive filtering options."""
         params = {
@@ -212,6 +271,8 @@ class BackendClient:
             "updated_datetime__gte": updated_datetime__gte.isoformat() if updated_datetime__gte else None,
             "updated_datetime__lte": updated_datetime__lte.isoformat() if updated_datetime__lte else None,
         }
+        if fields:
+            params["fields"] = ",".join(fields)
         # Remove keys with None values
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/patient/", params=params)
@@ -259,6 +320,7 @@ class BackendClient:
         updated_datetime__lte: Optional[datetime] = None,
         offset: int = 0,
         limit: int = 10,
+        fields: Optional[list[str]] = None,
     ):
         """List rooms with extensive filtering options."""
         params = {
@@ -281,6 +343,8 @@ class BackendClient:
             "offset": offset,
             "limit": limit,
         }
+        if fields:
+            params["fields"] = ",".join(fields)
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/room/", params=params)
 
@@ -295,9 +359,10 @@ class BackendClient:
         """Create a new admission."""
         return self._post("/admission", data=admission_data)
 
-    def get_admission(self, admission_id: int):
+    def get_admission(self, admission_id: int, include: Optional[list[str]] = None):
         """Retrieve an admission record."""
-        return self._get(f"/admission/{admission_id}/")
+        params = {"include": ",".join(include)} if include else None
+        return self._get(f"/admission/{admission_id}/", params=params)
 
     def update_admission(self, admission_id: int, admission_data: dict):
         """Update an admission record."""
@@ -324,6 +389,8 @@ class BackendClient:
         updated_datetime__lte: Optional[datetime] = None,
         offset: int = 0,
         limit: int = 10,
+        fields: Optional[list[str]] = None,
+        include: Optional[list[str]] = None,
     ):
         """List admissions with extensive filtering options."""
         params = {
@@ -343,7 +410,10 @@ class BackendClient:
             "updated_datetime__gte": updated_datetime__gte.isoformat() if updated_datetime__gte else None,
             "updated_datetime__lte": updated_datetime__lte.isoformat() if updated_datetime__lte else None,
         }
-
+        if fields:
+            params["fields"] = ",".join(fields)
+        if include:
+            params["include"] = ",".join(include)
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/admission/", params=params)
 
@@ -358,9 +428,10 @@ class BackendClient:
         """Create a new note."""
         return self._post("/note/", data=note_data)
 
-    def get_note(self, note_id: int):
+    def get_note(self, note_id: int, include: Optional[list[str]] = None):
         """Retrieve a note."""
-        return self._get(f"/note/{note_id}/")
+        params = {"include": ",".join(include)} if include else None
+        return self._get(f"/note/{note_id}/", params=params)
 
     def update_note(self, note_id: int, note_data: dict):
         """Update a note."""
@@ -387,6 +458,8 @@ class BackendClient:
         updated_datetime__lte: Optional[datetime] = None,
         offset: int = 0,
         limit: int = 10,
+        fields: Optional[list[str]] = None,
+        include: Optional[list[str]] = None,
     ):
         """List notes with extensive filtering options."""
         params = {
@@ -406,7 +479,10 @@ class BackendClient:
             "offset": offset,
             "limit": limit,
         }
-
+        if fields:
+            params["fields"] = ",".join(fields)
+        if include:
+            params["include"] = ",".join(include)
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/note/", params=params)
 
@@ -429,6 +505,7 @@ class BackendClient:
         updated_datetime__lte: Optional[datetime] = None,
         offset: int = 0,
         limit: int = 10,
+        fields: Optional[list[str]] = None,
     ):
         """List logs with extensive filtering options."""
         params = {
@@ -447,7 +524,8 @@ class BackendClient:
             "offset": offset,
             "limit": limit,
         }
-
+        if fields:
+            params["fields"] = ",".join(fields)
         params = {k: v for k, v in params.items() if v is not None}
         return self._get("/log/", params=params)
 